@@ -2,14 +2,10 @@ from datetime import datetime
 
 import google.generativeai as genai
 from django.conf import settings
-from django.utils.timezone import make_aware
-
-from cognitive_statistics.models import (
-    CognitiveResultPattern,
-    CognitiveResultSRT,
-    CognitiveResultSymbol,
-    CognitiveSession,
-)
+
+from cognitive_statistics.models import CognitiveSession
+from cognitive_statistics.services import get_session_results
+from config.cache import get_or_compute, register_cache
 from sleep_record.models import SleepRecord
 
 
@@ -19,34 +15,50 @@ def get_sleep_and_cognitive_data(user, date_str):
     if not sleep:
         return None, None, "수면 기록이 없습니다."
 
-    start_of_day = make_aware(datetime.combine(date, datetime.min.time()))
-    end_of_day = make_aware(datetime.combine(date, datetime.max.time()))
-
     session = (
-        CognitiveSession.objects.filter(
-            user=user, started_at__range=(start_of_day, end_of_day)
-        )
+        CognitiveSession.objects.filter(user=user, local_date=date)
         .order_by("started_at")
         .first()
     )
 
     test_scores = {}
     if session:
-        if srt := CognitiveResultSRT.objects.filter(cognitive_session=session).first():
-            test_scores["srt"] = {"score": srt.score}
-        if pattern := CognitiveResultPattern.objects.filter(
-            cognitive_session=session
-        ).first():
-            test_scores["pattern"] = {"score": pattern.score}
-        if symbol := CognitiveResultSymbol.objects.filter(
-            cognitive_session=session
-        ).first():
-            test_scores["symbol"] = {"score": symbol.score}
+        # 세션의 종류별 결과를 통합 테이블에서 한 번에 조회
+        for kind, result in get_session_results(session).items():
+            test_scores[kind] = {"score": result.score, "anomalies": result.anomalies}
 
     return sleep, test_scores, None
 
 
-def generate_sleep_ai_prompt(sleep_data, test_scores, date):
+# 작성 시점에 판정해 둔 이상 징후 모음 [{metric, z_score}, ...] (과거 기록 조회 없음)
+def collect_anomalies(sleep, test_scores):
+    anomalies = dict(sleep.anomalies or {})
+    for scores in test_scores.values():
+        anomalies.update(scores.get("anomalies") or {})
+    return [{"metric": metric, "z_score": z} for metric, z in anomalies.items()]
+
+
+ANOMALY_LABELS = {
+    "sleep_score": "수면 점수",
+    "sleep_duration": "수면 시간",
+    "srt_reaction_ms": "단순 반응 시간(ms)",
+    "srt_score": "단순 반응 시간 점수 (SRT)",
+    "pattern_score": "패턴 기억 점수",
+    "symbol_score": "기호 매칭 점수",
+}
+
+
+def _anomaly_lines(alerts):
+    if not alerts:
+        return "- 없음"
+    return "\n".join(
+        f"- {ANOMALY_LABELS.get(a['metric'], a['metric'])}: "
+        f"평소 대비 z 점수 {a['z_score']}"
+        for a in alerts
+    )
+
+
+def generate_sleep_ai_prompt(sleep_data, test_scores, date, alerts=()):
     return f"""
 너는 건강 전문 AI 추천 시스템이야.
 다음은 {date}의 수면 기록과 인지 테스트 결과야.
@@ -66,18 +78,25 @@ def generate_sleep_ai_prompt(sleep_data, test_scores, date):
 - 패턴 기억 점수: {test_scores.get('pattern', {}).get('score', '미실시')}
 - 기호 매칭 점수: {test_scores.get('symbol', {}).get('score', '미실시')}
 
+[이상 징후] (개인 평소 값과 크게 다른 항목, 있으면 원인과 대처를 우선 추천)
+{_anomaly_lines(alerts)}
+
 [형식]
 1. 추천 항목 제목
    - 설명
 """
 
 
-# views에서 실제로 호출하는 api
-def generate_ai_recommendation(user, date_str):
+# AI 추천 응답 캐시 이름 (유저 데이터 버전이 바뀌면 새로 생성)
+AI_RECOMMENDATION_CACHE = register_cache("ai_recommendation")
+
+
+def _build_ai_recommendation(user, date_str):
     sleep, test_scores, error = get_sleep_and_cognitive_data(user, date_str)
     if error:
         return {"error": error}
 
+    alerts = collect_anomalies(sleep, test_scores)
     prompt = generate_sleep_ai_prompt(
         sleep_data={
             "score": sleep.score,
@@ -89,10 +108,22 @@ def generate_ai_recommendation(user, date_str):
         },
         test_scores=test_scores,
         date=str(sleep.date),
+        alerts=alerts,
     )
 
     genai.configure(api_key=settings.GOOGLE_GENAI_API_KEY)
     model = genai.GenerativeModel(model_name="models/gemini-1.5-flash")
     response = model.generate_content(prompt)
 
-    return {"recommendation": response.text}
+    return {"recommendation": response.text, "alerts": alerts}
+
+
+# views에서 실제로 호출하는 api
+# Gemini 호출 비용이 커서 동시 요청 중 한 워커만 생성 (나머지는 대기 또는 기존 값 응답)
+def generate_ai_recommendation(user, date_str):
+    return get_or_compute(
+        AI_RECOMMENDATION_CACHE,
+        user.pk,
+        [date_str],
+        lambda: _build_ai_recommendation(user, date_str),
+    )
@@ -20,4 +20,10 @@ class AIRecommendContentView(APIView):
             return Response({"detail": result["error"]}, status=404)
 
         # result["recommendation"]가 문자열이라면
-        return Response({"recommendation": result["recommendation"]}, status=200)
+        return Response(
+            {
+                "recommendation": result["recommendation"],
+                "alerts": result.get("alerts", []),
+            },
+            status=200,
+        )
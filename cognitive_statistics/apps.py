@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class CognitiveStatisticsConfig(AppConfig):
     name = "cognitive_statistics"
     verbose_name = "Cognitive Statistics"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cognitive_statistics.norms import build_norm_tables, save_norm_tables
+
+
+# 인지 테스트 모집단 규준표 생성 (주기적으로 실행, 워커 재시작 불필요)
+class Command(BaseCommand):
+    help = (
+        "전체 인지 테스트 결과로 테스트/연령대별 점수 분위수 규준표(.npy)를 만듭니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=5000, help="서버 측 커서 fetch 크기"
+        )
+
+    def handle(self, *args, **options):
+        tables = build_norm_tables(chunk_size=options["chunk_size"])
+        save_norm_tables(tables)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"규준표 {len(tables)}개 저장 완료: {settings.NORM_TABLE_DIR}"
+            )
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0003_cognitiveresultsymbol_reaction_avg_ms_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cognitiveresultpattern",
+            name="local_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cognitiveresultsrt",
+            name="local_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cognitiveresultsymbol",
+            name="local_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cognitivesession",
+            name="local_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cognitivetestresult",
+            name="local_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultpattern",
+            index=models.Index(
+                fields=["local_date", "cognitive_session"],
+                name="cognitive_s_local_d_9060c1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultsrt",
+            index=models.Index(
+                fields=["local_date", "cognitive_session"],
+                name="cognitive_s_local_d_dff127_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultsymbol",
+            index=models.Index(
+                fields=["local_date", "cognitive_session"],
+                name="cognitive_s_local_d_6e7d38_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitivesession",
+            index=models.Index(
+                fields=["user", "local_date"], name="cognitive_s_user_id_6801b8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitivetestresult",
+            index=models.Index(
+                fields=["user", "local_date"], name="cognitive_s_user_id_edb6dc_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+# 유저 타임존/하루 기준 시각으로 날짜 계산 (users.utils.to_local_date와 동일)
+def to_local_date(user, dt):
+    local_dt = dt.astimezone(ZoneInfo(user.time_zone))
+    return (local_dt - timedelta(hours=user.day_cutover_hour)).date()
+
+
+# 기존 행의 local_date를 배치 단위로 채움
+def backfill(queryset, model, datetime_field, get_user):
+    batch = []
+    for obj in queryset.filter(local_date__isnull=True).iterator(chunk_size=BATCH_SIZE):
+        obj.local_date = to_local_date(get_user(obj), getattr(obj, datetime_field))
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_update(batch, ["local_date"])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ["local_date"])
+
+
+def backfill_local_date(apps, schema_editor):
+    CognitiveSession = apps.get_model("cognitive_statistics", "CognitiveSession")
+    CognitiveTestResult = apps.get_model("cognitive_statistics", "CognitiveTestResult")
+
+    backfill(
+        CognitiveSession.objects.select_related("user"),
+        CognitiveSession,
+        "started_at",
+        lambda obj: obj.user,
+    )
+    backfill(
+        CognitiveTestResult.objects.select_related("user"),
+        CognitiveTestResult,
+        "timestamp",
+        lambda obj: obj.user,
+    )
+    for model_name in (
+        "CognitiveResultSRT",
+        "CognitiveResultPattern",
+        "CognitiveResultSymbol",
+    ):
+        model = apps.get_model("cognitive_statistics", model_name)
+        backfill(
+            model.objects.select_related("cognitive_session__user"),
+            model,
+            "created_at",
+            lambda obj: obj.cognitive_session.user,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0004_local_date"),
+        ("users", "0004_user_time_zone"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_local_date, migrations.RunPython.noop),
+    ]
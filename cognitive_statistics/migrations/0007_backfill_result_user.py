@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+# 결과 테이블 user_id를 세션의 user_id로 id 구간 단위 배치 갱신
+def backfill_result_user(apps, schema_editor):
+    CognitiveSession = apps.get_model("cognitive_statistics", "CognitiveSession")
+    session_user = CognitiveSession.objects.filter(
+        id=OuterRef("cognitive_session_id")
+    ).values("user_id")[:1]
+
+    for model_name in (
+        "CognitiveResultSRT",
+        "CognitiveResultPattern",
+        "CognitiveResultSymbol",
+    ):
+        model = apps.get_model("cognitive_statistics", model_name)
+        max_id = model.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        for start in range(0, max_id + 1, BATCH_SIZE):
+            model.objects.filter(
+                id__gte=start, id__lt=start + BATCH_SIZE, user__isnull=True
+            ).update(user_id=Subquery(session_user))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0006_result_user"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_result_user, migrations.RunPython.noop),
+    ]
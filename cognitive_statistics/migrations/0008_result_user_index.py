@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0007_backfill_result_user"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="cognitiveresultpattern",
+            name="cognitive_s_local_d_9060c1_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="cognitiveresultsrt",
+            name="cognitive_s_local_d_dff127_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="cognitiveresultsymbol",
+            name="cognitive_s_local_d_6e7d38_idx",
+        ),
+        migrations.AlterField(
+            model_name="cognitiveresultpattern",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="pattern_results",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cognitiveresultsrt",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="srt_results",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cognitiveresultsymbol",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="symbol_results",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultpattern",
+            index=models.Index(
+                fields=["user", "local_date"],
+                include=("score",),
+                name="pattern_user_local_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultsrt",
+            index=models.Index(
+                fields=["user", "local_date"],
+                include=("score",),
+                name="srt_user_local_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cognitiveresultsymbol",
+            index=models.Index(
+                fields=["user", "local_date"],
+                include=("score",),
+                name="symbol_user_local_date_idx",
+            ),
+        ),
+    ]
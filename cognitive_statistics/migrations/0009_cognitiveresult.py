@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0008_result_user_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CognitiveResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "test_kind",
+                    models.CharField(
+                        choices=[
+                            ("srt", "Srt"),
+                            ("pattern", "Pattern"),
+                            ("symbol", "Symbol"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("source_id", models.BigIntegerField()),
+                ("score", models.IntegerField()),
+                ("reaction_avg_ms", models.FloatField(blank=True, null=True)),
+                ("correct", models.IntegerField(blank=True, null=True)),
+                ("accuracy", models.FloatField(blank=True, null=True)),
+                ("time_sec", models.FloatField(blank=True, null=True)),
+                ("local_date", models.DateField()),
+                ("created_at", models.DateTimeField()),
+                (
+                    "cognitive_session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unified_results",
+                        to="cognitive_statistics.cognitivesession",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unified_cognitive_results",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "local_date", "test_kind"],
+                        include=("score",),
+                        name="result_user_date_kind_idx",
+                    ),
+                    models.Index(
+                        fields=["cognitive_session", "test_kind"],
+                        name="result_session_kind_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("test_kind", "source_id"),
+                        name="unique_cognitive_result_source",
+                    )
+                ],
+            },
+        ),
+    ]
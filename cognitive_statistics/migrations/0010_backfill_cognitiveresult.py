@@ -0,0 +1,59 @@
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+# 모델명 -> (test_kind, {통합 컬럼: 원본 컬럼})
+SOURCES = {
+    "CognitiveResultSRT": ("srt", {"reaction_avg_ms": "reaction_avg_ms"}),
+    "CognitiveResultPattern": (
+        "pattern",
+        {"correct": "pattern_correct", "time_sec": "pattern_time_sec"},
+    ),
+    "CognitiveResultSymbol": (
+        "symbol",
+        {
+            "reaction_avg_ms": "reaction_avg_ms",
+            "correct": "symbol_correct",
+            "accuracy": "symbol_accuracy",
+        },
+    ),
+}
+
+
+# 종류별 결과 테이블을 통합 테이블로 배치 복사 (재실행 시 중복 무시)
+def backfill_cognitive_result(apps, schema_editor):
+    CognitiveResult = apps.get_model("cognitive_statistics", "CognitiveResult")
+
+    for model_name, (kind, columns) in SOURCES.items():
+        model = apps.get_model("cognitive_statistics", model_name)
+        batch = []
+        for r in model.objects.order_by("id").iterator(chunk_size=BATCH_SIZE):
+            batch.append(
+                CognitiveResult(
+                    user_id=r.user_id,
+                    cognitive_session_id=r.cognitive_session_id,
+                    test_kind=kind,
+                    source_id=r.id,
+                    score=int(r.score or 0),
+                    local_date=r.local_date or r.created_at.date(),
+                    created_at=r.created_at,
+                    **{
+                        column: getattr(r, source) for column, source in columns.items()
+                    },
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                CognitiveResult.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        CognitiveResult.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0009_cognitiveresult"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_cognitive_result, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cognitive_statistics", "0010_backfill_cognitiveresult"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cognitiveresult",
+            name="anomalies",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -61,6 +61,8 @@ class CognitiveTestResult(models.Model):
         blank=True,
     )
     timestamp = models.DateTimeField(auto_now_add=True)
+    # 유저 타임존/하루 기준 시각으로 계산한 날짜 (날짜 조회는 이 컬럼 사용)
+    local_date = models.DateField(null=True, blank=True)
     raw_scores = models.JSONField()
     normalized_scores = models.JSONField()
     average_score = models.FloatField()
@@ -68,6 +70,7 @@ class CognitiveTestResult(models.Model):
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [models.Index(fields=["user", "local_date"])]
 
 
 class CognitiveSession(models.Model):
@@ -78,6 +81,8 @@ class CognitiveSession(models.Model):
     )
     started_at = models.DateTimeField(auto_now_add=True)
     ended_at = models.DateTimeField(null=True, blank=True)
+    # 유저 타임존/하루 기준 시각으로 계산한 날짜 (날짜 조회는 이 컬럼 사용)
+    local_date = models.DateField(null=True, blank=True)
     summary = models.JSONField(null=True, blank=True)
 
     test_format = models.ForeignKey(
@@ -88,6 +93,9 @@ class CognitiveSession(models.Model):
         related_name="sessions",
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "local_date"])]
+
     def __str__(self):
         return f"{self.user} - Session from {self.started_at.strftime('%Y-%m-%d %H:%M:%S')}"
 
@@ -107,24 +115,122 @@ class CognitiveSessionProblem(models.Model):
 
 class CognitiveResultSRT(models.Model):
     cognitive_session = models.ForeignKey("CognitiveSession", on_delete=models.CASCADE)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="srt_results",
+    )
     score = models.IntegerField()
     reaction_avg_ms = models.FloatField()
     reaction_list = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    local_date = models.DateField(null=True, blank=True)
+
+    # 유저별 기간 점수 조회를 인덱스만으로 처리 (세션 조인 없음)
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "local_date"],
+                include=["score"],
+                name="srt_user_local_date_idx",
+            )
+        ]
 
 
 class CognitiveResultPattern(models.Model):
     cognitive_session = models.ForeignKey("CognitiveSession", on_delete=models.CASCADE)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="pattern_results",
+    )
     score = models.IntegerField()
     pattern_correct = models.IntegerField()
     pattern_time_sec = models.FloatField()
     created_at = models.DateTimeField(auto_now_add=True)
+    local_date = models.DateField(null=True, blank=True)
+
+    # 유저별 기간 점수 조회를 인덱스만으로 처리 (세션 조인 없음)
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "local_date"],
+                include=["score"],
+                name="pattern_user_local_date_idx",
+            )
+        ]
 
 
 class CognitiveResultSymbol(models.Model):
     cognitive_session = models.ForeignKey("CognitiveSession", on_delete=models.CASCADE)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="symbol_results",
+    )
     score = models.IntegerField()
     symbol_correct = models.IntegerField()
     symbol_accuracy = models.FloatField()
     reaction_avg_ms = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    local_date = models.DateField(null=True, blank=True)
+
+    # 유저별 기간 점수 조회를 인덱스만으로 처리 (세션 조인 없음)
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "local_date"],
+                include=["score"],
+                name="symbol_user_local_date_idx",
+            )
+        ]
+
+
+# 인지 테스트 종류 (통합 결과 테이블 구분값)
+class CognitiveTestKind(models.TextChoices):
+    SRT = "srt"
+    PATTERN = "pattern"
+    SYMBOL = "symbol"
+
+
+# 인지 테스트 결과 통합 테이블 (종류별 결과 저장 시 함께 기록, 조회/집계 전용)
+class CognitiveResult(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="unified_cognitive_results",
+    )
+    cognitive_session = models.ForeignKey(
+        "CognitiveSession", on_delete=models.CASCADE, related_name="unified_results"
+    )
+    test_kind = models.CharField(max_length=10, choices=CognitiveTestKind.choices)
+    # 종류별 원본 결과 테이블의 id
+    source_id = models.BigIntegerField()
+    score = models.IntegerField()
+    # 종류별 측정값 (해당 없는 종류는 null)
+    reaction_avg_ms = models.FloatField(null=True, blank=True)  # srt, symbol
+    correct = models.IntegerField(null=True, blank=True)  # pattern, symbol
+    accuracy = models.FloatField(null=True, blank=True)  # symbol
+    time_sec = models.FloatField(null=True, blank=True)  # pattern
+    local_date = models.DateField()
+    # 저장 시점 이상 탐지 결과 {지표: z 점수} (이상 없으면 빈 dict)
+    anomalies = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["test_kind", "source_id"], name="unique_cognitive_result_source"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "local_date", "test_kind"],
+                include=["score"],
+                name="result_user_date_kind_idx",
+            ),
+            models.Index(
+                fields=["cognitive_session", "test_kind"],
+                name="result_session_kind_idx",
+            ),
+        ]
@@ -0,0 +1,127 @@
+# 인지 테스트 모집단 규준표 (테스트 종류 x 연령대별 점수 분위수)
+# 관리 명령어(build_norm_tables)가 전체 결과로 {종류}.npy 파일을 만들고,
+# 각 워커는 mmap_mode="r"로 읽기 전용 매핑 → 여러 프로세스가 같은 페이지 캐시를 공유
+# 결과 생성 시 DB 조회 없이 이진 탐색(searchsorted)으로 백분위 계산
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from users.cohorts import age_band
+
+from .models import CognitiveResult, CognitiveTestKind
+
+# 분위수 지점 (0, 1, ..., 100 백분위)
+NORM_QUANTILES = np.linspace(0.0, 1.0, 101)
+# 규준표 행 순서 (all: 전체 연령, 연령대 행이 비어 있으면 all 사용)
+NORM_AGE_BANDS = ("all", "10s", "20s", "30s", "40s", "50s", "60s", "70s")
+# 행을 만들 최소 결과 수 (부족하면 nan 행)
+NORM_MIN_SAMPLES = 30
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def norm_table_path(kind):
+    return Path(settings.NORM_TABLE_DIR) / f"{kind}.npy"
+
+
+# 전체 결과를 스트리밍해 종류별 (연령대 수 x 101) 분위수 배열 생성
+def build_norm_tables(chunk_size=5000):
+    year = timezone.localdate().year
+    scores = defaultdict(lambda: defaultdict(list))
+    for kind, score, birth_year in (
+        CognitiveResult.objects.filter(score__isnull=False)
+        .values_list("test_kind", "score", "user__birth_year")
+        .iterator(chunk_size=chunk_size)
+    ):
+        scores[kind]["all"].append(score)
+        band = age_band(birth_year, year)
+        if band in NORM_AGE_BANDS:
+            scores[kind][band].append(score)
+
+    tables = {}
+    for kind in CognitiveTestKind.values:
+        table = np.full((len(NORM_AGE_BANDS), len(NORM_QUANTILES)), np.nan)
+        for row, band in enumerate(NORM_AGE_BANDS):
+            values = scores[kind][band]
+            if len(values) >= NORM_MIN_SAMPLES:
+                table[row] = np.quantile(np.array(values, dtype=float), NORM_QUANTILES)
+        tables[kind] = table
+    return tables
+
+
+# 규준표 저장 (임시 파일에 쓴 뒤 교체 → 기존 매핑을 읽는 워커는 이전 파일을 계속 사용)
+def save_norm_tables(tables):
+    directory = Path(settings.NORM_TABLE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    for kind, table in tables.items():
+        path = norm_table_path(kind)
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, table)
+        os.replace(tmp, path)
+
+
+# 종류별 규준표 (읽기 전용 메모리 매핑, 파일이 교체되면 다시 매핑, 없으면 None)
+def load_norm_table(kind):
+    path = norm_table_path(kind)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _tables.get(kind)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _tables_lock:
+        table = np.load(path, mmap_mode="r")
+        _tables[kind] = (mtime, table)
+    return table
+
+
+# 분위수 배열에서 value의 백분위 (이진 탐색 + 분위수 사이 선형 보간, 같은 값 구간은 가운데)
+def percentile_of(quantiles, value):
+    last = len(quantiles) - 1
+    left = int(np.searchsorted(quantiles, value, side="left"))
+    right = int(np.searchsorted(quantiles, value, side="right"))
+    if left < right:
+        position = (left + right - 1) / 2
+    elif left == 0:
+        position = 0.0
+    elif left > last:
+        position = float(last)
+    else:
+        low, high = quantiles[left - 1], quantiles[left]
+        position = left - 1 + (value - low) / (high - low)
+    return position / last * 100
+
+
+# 유저 연령대 규준 기준 테스트별 백분위/T 점수 (규준표가 없으면 빈 dict)
+# scores: {종류: 점수}
+def normalize_scores(user, scores):
+    band = age_band(user.birth_year, timezone.localdate().year)
+    row = NORM_AGE_BANDS.index(band) if band in NORM_AGE_BANDS else 0
+
+    normalized = {}
+    for kind, score in scores.items():
+        table = load_norm_table(kind)
+        if table is None:
+            continue
+        # 연령대 표본이 부족하면 전체 연령 행 사용
+        group = row if not np.isnan(table[row, 0]) else 0
+        if np.isnan(table[group, 0]):
+            continue
+        percentile = percentile_of(table[group], score)
+        # T 점수 (양 끝 백분위는 0.5~99.5로 제한 → 무한대 방지)
+        z = NormalDist().inv_cdf(min(max(percentile, 0.5), 99.5) / 100)
+        normalized[kind] = {
+            "norm_group": NORM_AGE_BANDS[group],
+            "percentile": round(percentile, 1),
+            "t_score": round(50 + 10 * z, 1),
+        }
+    return normalized
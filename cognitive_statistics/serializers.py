@@ -6,6 +6,7 @@ from .models import (
     CognitiveResultSymbol,
     CognitiveSession,
     CognitiveTestFormat,
+    CognitiveTestKind,
 )
 
 
@@ -62,10 +63,15 @@ class CognitiveTestResultDetailedSerializer(serializers.Serializer):
     total_duration_sec = serializers.IntegerField()
 
     def get_detailed_raw_scores(self, obj):
-        session = obj.cognitive_session
-        srt = CognitiveResultSRT.objects.filter(cognitive_session=session).first()
-        sym = CognitiveResultSymbol.objects.filter(cognitive_session=session).first()
-        pat = CognitiveResultPattern.objects.filter(cognitive_session=session).first()
+        # 뷰에서 prefetch한 통합 결과 사용 (종류별 가장 먼저 저장된 결과)
+        results = {}
+        for row in sorted(
+            obj.cognitive_session.unified_results.all(), key=lambda r: r.id
+        ):
+            results.setdefault(row.test_kind, row)
+        srt = results.get(CognitiveTestKind.SRT)
+        sym = results.get(CognitiveTestKind.SYMBOL)
+        pat = results.get(CognitiveTestKind.PATTERN)
 
         return {
             "srt": {
@@ -74,15 +80,15 @@ class CognitiveTestResultDetailedSerializer(serializers.Serializer):
                 "average_score": srt.score if srt else 0,
             },
             "symbol": {
-                "correct": sym.symbol_correct if sym else 0,
+                "correct": sym.correct if sym else 0,
                 "avg_ms": sym.reaction_avg_ms if sym else 0,  # ✅ 수정된 방식
-                "symbol_accuracy": sym.symbol_accuracy if sym else 0,
-                "total_duration_sec": sym.symbol_correct if sym else 0,
+                "symbol_accuracy": sym.accuracy if sym else 0,
+                "total_duration_sec": sym.correct if sym else 0,
                 "average_score": sym.score if sym else 0,
             },
             "pattern": {
-                "correct": pat.pattern_correct if pat else 0,
-                "total_duration_sec": int(pat.pattern_time_sec) if pat else 0,
+                "correct": pat.correct if pat else 0,
+                "total_duration_sec": int(pat.time_sec) if pat else 0,
                 "average_score": pat.score if pat else 0,
             },
         }
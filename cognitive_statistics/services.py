@@ -0,0 +1,128 @@
+from datetime import timezone
+
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from config.tiered_cache import TieredCache
+
+from .models import CognitiveResult, CognitiveTestFormat, CognitiveTestKind
+
+# 테스트 포맷 2단 캐시 (id/이름 조회, 변경 시 signals에서 무효화)
+test_format_cache = TieredCache("test_format")
+
+# 종류별 원본 결과 컬럼 -> 통합 테이블 컬럼 매핑
+UNIFIED_METRIC_FIELDS = {
+    CognitiveTestKind.SRT: {"reaction_avg_ms": "reaction_avg_ms"},
+    CognitiveTestKind.PATTERN: {
+        "correct": "pattern_correct",
+        "time_sec": "pattern_time_sec",
+    },
+    CognitiveTestKind.SYMBOL: {
+        "reaction_avg_ms": "reaction_avg_ms",
+        "correct": "symbol_correct",
+        "accuracy": "symbol_accuracy",
+    },
+}
+
+
+# 종류별 원본 결과로 통합 테이블 행 생성 (저장하지 않음, 백필에서도 재사용)
+def build_unified_result(kind, result):
+    return CognitiveResult(
+        user_id=result.user_id,
+        cognitive_session_id=result.cognitive_session_id,
+        test_kind=kind,
+        source_id=result.id,
+        score=int(result.score or 0),
+        local_date=result.local_date,
+        created_at=result.created_at,
+        **{
+            column: getattr(result, source)
+            for column, source in UNIFIED_METRIC_FIELDS[kind].items()
+        },
+    )
+
+
+# 결과 저장 API에서 원본과 같은 트랜잭션 안에서 호출 (dual-write)
+def save_unified_result(kind, result):
+    unified = build_unified_result(kind, result)
+    unified.save()
+    return unified
+
+
+# 세션별 종류마다 가장 먼저 저장된 결과 1건씩 (쿼리 1회)
+def get_session_results(session):
+    results = {}
+    for row in CognitiveResult.objects.filter(cognitive_session=session).order_by("id"):
+        results.setdefault(row.test_kind, row)
+    return results
+
+
+# 날짜 x 종류 단위 집계 (GROUP BY 1회)
+# 패턴 테스트는 세션별 최신 결과만 반영 (DISTINCT ON 서브쿼리)
+def summarize_by_date_and_kind(user, **date_filter):
+    base = CognitiveResult.objects.filter(user=user, **date_filter)
+    latest_patterns = (
+        base.filter(test_kind=CognitiveTestKind.PATTERN)
+        .order_by("cognitive_session_id", "-created_at")
+        .distinct("cognitive_session_id")
+        .values("id")
+    )
+    rows = (
+        base.filter(~Q(test_kind=CognitiveTestKind.PATTERN) | Q(id__in=latest_patterns))
+        .values("local_date", "test_kind")
+        .annotate(
+            score_avg=Avg("score"),
+            reaction_avg_ms=Avg("reaction_avg_ms"),
+            correct_sum=Sum("correct"),
+            accuracy_avg=Avg("accuracy"),
+            time_sec_avg=Avg("time_sec"),
+            count=Count("id"),
+        )
+        .order_by("local_date", "test_kind")
+    )
+    return {(row["local_date"], row["test_kind"]): row for row in rows}
+
+
+# 세션 날짜 x 종류 단위 집계 (GROUP BY 1회, 일별 요약 API 기준)
+# 세션별 종류마다 가장 먼저 저장된 결과만 반영 (DISTINCT ON 서브쿼리, 재시도 결과 제외)
+# 세션 날짜: 세션 local_date (없으면 시작 시각의 UTC 날짜)
+def summarize_by_session_date_and_kind(user):
+    first_results = (
+        CognitiveResult.objects.filter(user=user)
+        .order_by("cognitive_session_id", "test_kind", "id")
+        .distinct("cognitive_session_id", "test_kind")
+        .values("id")
+    )
+    session_date = Coalesce(
+        "cognitive_session__local_date",
+        TruncDate("cognitive_session__started_at", tzinfo=timezone.utc),
+    )
+    rows = (
+        CognitiveResult.objects.filter(id__in=first_results)
+        .values("test_kind", session_date=session_date)
+        .annotate(
+            score_avg=Avg("score"),
+            reaction_avg_ms=Avg("reaction_avg_ms"),
+            correct_sum=Sum("correct"),
+            accuracy_avg=Avg("accuracy"),
+            count=Count("id"),
+        )
+        .order_by("session_date", "test_kind")
+    )
+    return {(row["session_date"], row["test_kind"]): row for row in rows}
+
+
+# 테스트 포맷 id 조회 (없으면 None)
+def get_test_format(format_id):
+    return test_format_cache.get(
+        f"id:{format_id}",
+        lambda: CognitiveTestFormat.objects.filter(id=format_id).first(),
+    )
+
+
+# 테스트 포맷 이름 조회 (없으면 None)
+def get_test_format_by_name(name):
+    return test_format_cache.get(
+        f"name:{name}",
+        lambda: CognitiveTestFormat.objects.filter(name=name).first(),
+    )
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CognitiveTestFormat
+from .services import test_format_cache
+
+
+# 테스트 포맷 변경 시 id/이름 캐시 전체 무효화 (이름 변경 시 이전 이름 키도 제거)
+@receiver([post_save, post_delete], sender=CognitiveTestFormat)
+def invalidate_test_format_cache(sender, instance, **kwargs):
+    test_format_cache.invalidate()
@@ -0,0 +1,90 @@
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.core.management import call_command
+
+from cognitive_statistics.models import (
+    CognitiveResult,
+    CognitiveSession,
+    CognitiveTestResult,
+)
+from cognitive_statistics.norms import load_norm_table
+from users.services import get_cognitive_detail
+from users.tests import UserAPITestCase
+
+
+class TestUnifiedCognitiveResults(UserAPITestCase):
+    def test_unified_results_drive_cognitive_detail(self):
+        self.post_cognitive_results((90, 60, 30))
+        self.post_cognitive_results((70, 40, 50))
+        # 같은 세션의 패턴 재시도는 최신 결과만 집계
+        session = CognitiveSession.objects.latest("id")
+        self.client.post(
+            "/api/cognitive-statistics/result/pattern/",
+            {"cognitiveSession": session.id, "score": 80},
+            format="json",
+        )
+        self.assertEqual(CognitiveResult.objects.filter(user=self.user).count(), 7)
+
+        with self.assertNumQueries(2):
+            # 종류별 집계 1회 + 개인 기준선 1회
+            detail = get_cognitive_detail(self.user, self.today)
+        self.assertEqual(detail["srt_score"], 80.0)
+        self.assertEqual(detail["symbol_score"], 40.0)
+        self.assertEqual(detail["pattern_score"], 70.0)
+
+        response = self.client.get("/api/cognitive-statistics/result/daily-summary/")
+        self.assertEqual(response.status_code, 200)
+        raw_scores = response.data[0]["raw_scores"]
+        self.assertEqual(raw_scores["srt"]["average_score"], 80.0)
+        # 일별 요약은 세션별 첫 결과 기준 (재시도 80점 제외)
+        self.assertEqual(raw_scores["pattern"]["average_score"], 50.0)
+
+        # 결과 날짜가 아닌 세션 날짜로 묶음
+        CognitiveSession.objects.filter(user=self.user).update(local_date=self.today)
+        CognitiveSession.objects.filter(id=session.id).update(
+            local_date=self.today - timedelta(days=1)
+        )
+        response = self.client.get("/api/cognitive-statistics/result/daily-summary/")
+        before, selected = response.data
+        self.assertEqual(before["date"], str(self.today - timedelta(days=1)))
+        self.assertEqual(before["raw_scores"]["pattern"]["average_score"], 40.0)
+        self.assertEqual(selected["raw_scores"]["srt"]["average_score"], 90.0)
+
+
+class TestNormalizedScores(UserAPITestCase):
+    def test_test_result_is_normalized_against_norm_tables(self):
+        session = CognitiveSession.objects.create(
+            user=self.user, test_format=self.test_format
+        )
+        CognitiveResult.objects.bulk_create(
+            CognitiveResult(
+                user=self.user,
+                cognitive_session=session,
+                test_kind=kind,
+                source_id=10_000 + score,
+                score=score,
+                local_date=self.today,
+                created_at=datetime.now(timezone.utc),
+            )
+            for kind in ("srt", "pattern", "symbol")
+            for score in range(1, 101)
+        )
+
+        with (
+            tempfile.TemporaryDirectory() as norm_dir,
+            self.settings(NORM_TABLE_DIR=norm_dir),
+        ):
+            call_command("build_norm_tables")
+            self.assertIsInstance(load_norm_table("srt"), np.memmap)
+            self.post_cognitive_results((50, 80, 20))
+
+        result = CognitiveTestResult.objects.get(user=self.user)
+        srt = result.normalized_scores["srt"]
+        self.assertEqual(srt["norm_group"], "all")
+        self.assertAlmostEqual(srt["percentile"], 49.5, delta=0.1)
+        self.assertAlmostEqual(srt["t_score"], 49.9, delta=0.1)
+        self.assertAlmostEqual(
+            result.normalized_scores["symbol"]["percentile"], 19.2, delta=0.1
+        )
@@ -2,14 +2,17 @@ import json
 from collections import defaultdict
 from random import randint
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from cognitives.models import CognitiveProblem
+from users.reaction_sketch import parse_reaction_list
+from users.stats import apply_cognitive_result
+from users.utils import local_today
 
 from .models import (
     CognitiveResultPattern,
@@ -17,13 +20,20 @@ from .models import (
     CognitiveResultSymbol,
     CognitiveSession,
     CognitiveSessionProblem,
-    CognitiveTestFormat,
+    CognitiveTestKind,
     CognitiveTestResult,
 )
+from .norms import normalize_scores
 from .serializers import (
     CognitiveSessionWithProblemsSerializer,
     CognitiveTestResultDetailedSerializer,
 )
+from .services import (
+    get_session_results,
+    get_test_format,
+    save_unified_result,
+    summarize_by_session_date_and_kind,
+)
 
 
 class CognitiveTestResultBasicAPIView(generics.ListAPIView):
@@ -31,12 +41,12 @@ class CognitiveTestResultBasicAPIView(generics.ListAPIView):
     serializer_class = CognitiveTestResultDetailedSerializer
 
     def get_queryset(self):
-        today = timezone.localdate()  # ✅ 오늘 날짜 기준 (한국 시간)
-        return CognitiveTestResult.objects.filter(
-            user=self.request.user, timestamp__date=today
-        ).order_by(
-            "-timestamp"
-        )  # 최신 순 정렬
+        today = local_today(self.request.user)  # ✅ 오늘 날짜 기준 (유저 타임존)
+        return (
+            CognitiveTestResult.objects.filter(user=self.request.user, local_date=today)
+            .prefetch_related("cognitive_session__unified_results")
+            .order_by("-timestamp")  # 최신 순 정렬
+        )
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
@@ -59,13 +69,14 @@ class CognitiveSessionCreateAPIView(APIView):
         if not format_id:
             return Response({"error": "format_id is required"}, status=400)
 
-        try:
-            test_format = CognitiveTestFormat.objects.get(id=format_id)
-        except CognitiveTestFormat.DoesNotExist:
+        test_format = get_test_format(format_id)
+        if test_format is None:
             return Response({"error": "존재하지 않는 format_id"}, status=400)
 
         session = CognitiveSession.objects.create(
-            user=request.user, test_format=test_format
+            user=request.user,
+            test_format=test_format,
+            local_date=local_today(request.user),
         )
 
         for i in range(5):
@@ -97,17 +108,36 @@ class CognitiveResultSRTAPIView(APIView):
         session_id = data.get("cognitiveSession") or data.get("cognitive_session")
         session = get_object_or_404(CognitiveSession, id=session_id, user=request.user)
 
-        result = CognitiveResultSRT.objects.create(
-            cognitive_session=session,
-            score=data.get("score"),
-            reaction_avg_ms=data.get("reactionAvgMs") or data.get("reaction_avg_ms"),
-            reaction_list=",".join(map(str, data.get("reactionList", []))),
-        )
+        with transaction.atomic():
+            result = CognitiveResultSRT.objects.create(
+                cognitive_session=session,
+                user=request.user,
+                score=data.get("score"),
+                reaction_avg_ms=data.get("reactionAvgMs")
+                or data.get("reaction_avg_ms"),
+                reaction_list=",".join(map(str, data.get("reactionList", []))),
+                local_date=local_today(request.user),
+            )
+            # 통합 결과 테이블 기록 + 마이페이지 일별 집계 반영
+            save_unified_result(CognitiveTestKind.SRT, result)
+            feedback = apply_cognitive_result(
+                request.user,
+                "srt",
+                result,
+                reaction_times=parse_reaction_list(result.reaction_list),
+            )
 
         debug = try_create_test_result(request.user, session)
 
         return Response(
-            {"detail": "SRT 저장 완료", "result_id": result.id, "debug": debug},
+            {
+                "detail": "SRT 저장 완료",
+                "result_id": result.id,
+                # 개인 기준선 대비 (z_score: 기준선 평균과의 표준편차 단위 차이)
+                # + 이상 징후 판정 지표 {지표: z 점수}
+                **feedback,
+                "debug": debug,
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -145,19 +175,34 @@ class CognitiveResultSymbolAPIView(APIView):
             data.get("symbolAccuracy") or data.get("symbol_accuracy") or 0.0
         )
 
-        result = CognitiveResultSymbol.objects.create(
-            cognitive_session=session,
-            score=data.get("score") or 0,
-            symbol_correct=symbol_correct,
-            symbol_accuracy=symbol_accuracy,
-            reaction_avg_ms=avg_ms,
-        )
+        with transaction.atomic():
+            result = CognitiveResultSymbol.objects.create(
+                cognitive_session=session,
+                user=request.user,
+                score=data.get("score") or 0,
+                symbol_correct=symbol_correct,
+                symbol_accuracy=symbol_accuracy,
+                reaction_avg_ms=avg_ms,
+                local_date=local_today(request.user),
+            )
+            # 통합 결과 테이블 기록 + 마이페이지 일별 집계 반영
+            save_unified_result(CognitiveTestKind.SYMBOL, result)
+            feedback = apply_cognitive_result(
+                request.user, "symbol", result, reaction_times=cleaned_times
+            )
 
         # 통합 결과 생성 시도
         debug = try_create_test_result(request.user, session)
 
         return Response(
-            {"detail": "Symbol 저장 완료", "result_id": result.id, "debug": debug},
+            {
+                "detail": "Symbol 저장 완료",
+                "result_id": result.id,
+                # 개인 기준선 대비 (z_score: 기준선 평균과의 표준편차 단위 차이)
+                # + 이상 징후 판정 지표 {지표: z 점수}
+                **feedback,
+                "debug": debug,
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -179,17 +224,30 @@ class CognitiveResultPatternAPIView(APIView):
         except (TypeError, ValueError):
             pattern_time_sec = 0.0
 
-        result = CognitiveResultPattern.objects.create(
-            cognitive_session=session,
-            score=score,
-            pattern_correct=pattern_correct,
-            pattern_time_sec=pattern_time_sec,
-        )
+        with transaction.atomic():
+            result = CognitiveResultPattern.objects.create(
+                cognitive_session=session,
+                user=request.user,
+                score=score,
+                pattern_correct=pattern_correct,
+                pattern_time_sec=pattern_time_sec,
+                local_date=local_today(request.user),
+            )
+            # 통합 결과 테이블 기록 + 마이페이지 일별 집계 반영
+            save_unified_result(CognitiveTestKind.PATTERN, result)
+            feedback = apply_cognitive_result(request.user, "pattern", result)
 
         debug = try_create_test_result(request.user, session)
 
         return Response(
-            {"detail": "Pattern 저장 완료", "result_id": result.id, "debug": debug},
+            {
+                "detail": "Pattern 저장 완료",
+                "result_id": result.id,
+                # 개인 기준선 대비 (z_score: 기준선 평균과의 표준편차 단위 차이)
+                # + 이상 징후 판정 지표 {지표: z 점수}
+                **feedback,
+                "debug": debug,
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -199,70 +257,22 @@ class CognitiveResultDailySummaryAPIView(APIView):
 
     def get(self, request):
         user = request.user
-        sessions = CognitiveSession.objects.filter(user=user)
+        # 세션 날짜 x 종류 단위 집계 (세션별 첫 결과만, GROUP BY 1회)
+        summaries = summarize_by_session_date_and_kind(user)
 
-        daily_summary = defaultdict(
-            lambda: {
-                "srt": {"scores": [], "avg_ms": []},
-                "symbol": {"scores": [], "correct": 0, "avg_ms": [], "accuracy": []},
-                "pattern": {"scores": [], "correct": 0},
-            }
-        )
-
-        for session in sessions:
-            date_str = session.started_at.date().isoformat()
-
-            srt = CognitiveResultSRT.objects.filter(cognitive_session=session).first()
-            if srt:
-                daily_summary[date_str]["srt"]["scores"].append(srt.score)
-                daily_summary[date_str]["srt"]["avg_ms"].append(srt.reaction_avg_ms)
-
-            symbol = CognitiveResultSymbol.objects.filter(
-                cognitive_session=session
-            ).first()
-            if symbol:
-                daily_summary[date_str]["symbol"]["scores"].append(symbol.score)
-                daily_summary[date_str]["symbol"]["correct"] += (
-                    symbol.symbol_correct or 0
-                )
-                daily_summary[date_str]["symbol"]["avg_ms"].append(
-                    symbol.symbol_accuracy * 1000
-                )  # 예시
-                daily_summary[date_str]["symbol"]["accuracy"].append(
-                    symbol.symbol_accuracy
-                )
-
-            pattern = CognitiveResultPattern.objects.filter(
-                cognitive_session=session
-            ).first()
-            if pattern:
-                daily_summary[date_str]["pattern"]["scores"].append(pattern.score)
-                daily_summary[date_str]["pattern"]["correct"] += (
-                    pattern.pattern_correct or 0
-                )
+        daily_summary = defaultdict(dict)
+        for (session_date, kind), row in summaries.items():
+            daily_summary[session_date.isoformat()][kind] = row
 
         result = []
         for date, data in sorted(daily_summary.items()):
-            srt_scores = data["srt"]["scores"]
-            srt_avg_ms = data["srt"]["avg_ms"]
-
-            symbol_scores = data["symbol"]["scores"]
-            symbol_avg_ms = data["symbol"]["avg_ms"]
-            symbol_accs = data["symbol"]["accuracy"]
-
-            pattern_scores = data["pattern"]["scores"]
+            srt = data.get(CognitiveTestKind.SRT, {})
+            symbol = data.get(CognitiveTestKind.SYMBOL, {})
+            pattern = data.get(CognitiveTestKind.PATTERN, {})
 
-            srt_score = round(sum(srt_scores) / len(srt_scores), 2) if srt_scores else 0
-            symbol_score = (
-                round(sum(symbol_scores) / len(symbol_scores), 2)
-                if symbol_scores
-                else 0
-            )
-            pattern_score = (
-                round(sum(pattern_scores) / len(pattern_scores), 2)
-                if pattern_scores
-                else 0
-            )
+            srt_score = round(srt.get("score_avg") or 0, 2)
+            symbol_score = round(symbol.get("score_avg") or 0, 2)
+            pattern_score = round(pattern.get("score_avg") or 0, 2)
 
             avg_score = round((srt_score + symbol_score + pattern_score) / 3, 2)
 
@@ -274,29 +284,19 @@ class CognitiveResultDailySummaryAPIView(APIView):
                     "raw_scores": {
                         "srt": {
                             "average_score": srt_score,
-                            "avg_ms": (
-                                round(sum(srt_avg_ms) / len(srt_avg_ms), 2)
-                                if srt_avg_ms
-                                else 0
-                            ),
+                            "avg_ms": round(srt.get("reaction_avg_ms") or 0, 2),
                         },
                         "symbol": {
                             "average_score": symbol_score,
-                            "correct": data["symbol"]["correct"],
-                            "avg_ms": (
-                                round(sum(symbol_avg_ms) / len(symbol_avg_ms), 2)
-                                if symbol_avg_ms
-                                else 0
-                            ),
-                            "symbol_accuracy": (
-                                round(sum(symbol_accs) / len(symbol_accs), 2)
-                                if symbol_accs
-                                else 0
+                            "correct": symbol.get("correct_sum") or 0,
+                            "avg_ms": round(symbol.get("reaction_avg_ms") or 0, 2),
+                            "symbol_accuracy": round(
+                                symbol.get("accuracy_avg") or 0, 2
                             ),
                         },
                         "pattern": {
                             "average_score": pattern_score,
-                            "correct": data["pattern"]["correct"],
+                            "correct": pattern.get("correct_sum") or 0,
                         },
                     },
                 }
@@ -309,9 +309,10 @@ def try_create_test_result(user, session):
     if hasattr(session, "result"):
         return {"status": "이미 생성됨", "session_id": session.id}
 
-    srt = CognitiveResultSRT.objects.filter(cognitive_session=session).first()
-    sym = CognitiveResultSymbol.objects.filter(cognitive_session=session).first()
-    pat = CognitiveResultPattern.objects.filter(cognitive_session=session).first()
+    results = get_session_results(session)
+    srt = results.get(CognitiveTestKind.SRT)
+    sym = results.get(CognitiveTestKind.SYMBOL)
+    pat = results.get(CognitiveTestKind.PATTERN)
 
     if not all([srt, sym, pat]):
         return {"status": "결과 미완성", "session_id": session.id}
@@ -322,19 +323,22 @@ def try_create_test_result(user, session):
     pat_score = pat.score or 0
 
     reaction_avg_ms = srt.reaction_avg_ms if srt.reaction_avg_ms is not None else 0
-    symbol_correct = sym.symbol_correct if sym.symbol_correct is not None else 0
-    pattern_time_sec = pat.pattern_time_sec if pat.pattern_time_sec is not None else 0
-
+    symbol_correct = sym.correct if sym.correct is not None else 0
+    pattern_time_sec = pat.time_sec if pat.time_sec is not None else 0
+
+    raw_scores = {
+        "srt": srt_score,
+        "symbol": sym_score,
+        "pattern": pat_score,
+    }
     result = CognitiveTestResult.objects.create(
         user=user,
         test_format=session.test_format,
         cognitive_session=session,
-        raw_scores={
-            "srt": srt_score,
-            "symbol": sym_score,
-            "pattern": pat_score,
-        },
-        normalized_scores={},
+        local_date=local_today(user),
+        raw_scores=raw_scores,
+        # 모집단 규준표 기준 백분위/T 점수 (규준표가 아직 없으면 빈 값)
+        normalized_scores=normalize_scores(user, raw_scores),
         average_score=round((srt_score + sym_score + pat_score) / 3, 2),
         total_duration_sec=(
             int((reaction_avg_ms or 0) * 10 // 1000)
@@ -1,10 +1,13 @@
 # 작성자: 한율
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from cognitive_statistics.models import CognitiveTestFormat, CognitiveTestResult
+from cognitive_statistics.services import get_test_format_by_name
+from users.utils import local_today
 
 from .models import CognitiveProblem, CognitiveResponse
 from .serializers import (
@@ -27,7 +30,9 @@ class TestPlayAPIView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        fmt = get_object_or_404(CognitiveTestFormat, name=self.kwargs["test_type"])
+        fmt = get_test_format_by_name(self.kwargs["test_type"])
+        if fmt is None:
+            raise Http404
         return CognitiveProblem.objects.filter(test_format=fmt)
 
 
@@ -40,7 +45,9 @@ class TestSubmitAPIView(APIView):
         serializer.is_valid(raise_exception=True)
         answers = serializer.validated_data["answers"]
 
-        fmt = get_object_or_404(CognitiveTestFormat, name=test_type)
+        fmt = get_test_format_by_name(test_type)
+        if fmt is None:
+            raise Http404
 
         raw_scores = {}
         normalized_scores = {}
@@ -76,6 +83,7 @@ class TestSubmitAPIView(APIView):
         CognitiveTestResult.objects.create(
             user=request.user,
             test_format=fmt,
+            local_date=local_today(request.user),
             raw_scores=raw_scores,
             normalized_scores=normalized_scores,
             average_score=average_score,
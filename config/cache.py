@@ -0,0 +1,172 @@
+# config/cache.py
+# 유저 데이터 버전 기반 응답 캐시 (쓰기 시 버전만 올리고, 이전 버전 캐시는 TTL로 자연 만료)
+# 만료 시점의 동시 재계산(stampede) 방지:
+# - Redis 락으로 한 워커만 재계산 (single-flight)
+# - 만료 직전 확률적으로 미리 갱신 (XFetch)
+# - 재계산 중에는 만료된 값을 그대로 응답 (stale-while-revalidate)
+# - 만료된 값도 없으면 짧게(CACHE_LOCK_WAIT)만 기다린 뒤 직접 계산
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Any, Callable, Hashable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import LockError
+
+# 캐시가 비어 있을 때 락을 잡지 못한 요청이 결과를 기다리는 간격 (초)
+LOCK_POLL_INTERVAL = 0.05
+
+METRIC_KINDS = ("hit", "stale", "refresh", "miss")
+
+# 지표를 집계할 캐시 이름 목록 (각 모듈에서 register_cache로 등록)
+_registered_caches: set[str] = set()
+
+
+def register_cache(name: str) -> str:
+    _registered_caches.add(name)
+    return name
+
+
+def _version_key(user_id: int) -> str:
+    return f"data_version:{user_id}"
+
+
+def _metric_key(name: str, kind: str) -> str:
+    return f"cache_metrics:{name}:{kind}"
+
+
+# 유저 데이터 버전 조회
+# 버전 키가 없으면 현재 시각(ns)으로 초기화 → 키가 축출돼도 과거 캐시와 충돌하지 않음
+def get_data_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+# 유저 데이터 변경 시 버전 증가 (이전 버전 키의 캐시는 더 이상 조회되지 않음)
+def bump_data_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.incr(key)
+
+
+def _record_metric(name: str, kind: str) -> None:
+    key = _metric_key(name, kind)
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+# 캐시 이름별 지표 및 적중률
+# hit: 신선한 값 응답, stale: 만료된 값 응답(재계산 중), refresh: 만료/조기 갱신 재계산, miss: 캐시 없음
+def get_cache_metrics() -> dict[str, dict[str, Any]]:
+    names = sorted(_registered_caches)
+    keys = [_metric_key(name, kind) for name in names for kind in METRIC_KINDS]
+    values = cache.get_many(keys)
+
+    metrics = {}
+    for name in names:
+        counts = {kind: values.get(_metric_key(name, kind), 0) for kind in METRIC_KINDS}
+        total = sum(counts.values())
+        served = counts["hit"] + counts["stale"]
+        metrics[name] = {
+            **counts,
+            "hit_ratio": round(served / total, 4) if total else 0.0,
+        }
+    return metrics
+
+
+# XFetch: 계산 시간(delta)이 길수록, 만료가 가까울수록 높은 확률로 미리 갱신
+def _should_refresh_early(expires_at: float, delta: float, beta: float) -> bool:
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _compute_and_store(
+    key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int
+) -> Any:
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    if value is not None:
+        # 논리 만료(expires_at) 이후에도 stale_ttl 동안은 만료된 값 응답용으로 보관
+        entry = (value, time.time() + ttl, delta)
+        cache.set(key, entry, timeout=ttl + stale_ttl)
+    return value
+
+
+# 캐시 조회 + single-flight 재계산
+# compute가 None을 반환하거나 예외를 던지면 캐시하지 않음
+def get_or_compute_shared(
+    name: str,
+    key: str,
+    compute: Callable[[], Any],
+    ttl: int | None = None,
+    stale_ttl: int | None = None,
+) -> Any:
+    ceiling = settings.CACHE_TTL_CEILING
+    ttl = min(ttl or ceiling, ceiling)
+    stale_ttl = settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, delta = entry
+        if not _should_refresh_early(expires_at, delta, settings.CACHE_XFETCH_BETA):
+            _record_metric(name, "hit")
+            return value
+
+        # 만료(또는 조기 갱신 대상): 락을 잡은 한 요청만 재계산, 나머지는 기존 값 응답
+        lock = cache.lock(f"lock:{key}", timeout=settings.CACHE_LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            _record_metric(name, "stale" if time.time() >= expires_at else "hit")
+            return value
+        _record_metric(name, "refresh")
+        try:
+            return _compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            _release(lock)
+
+    _record_metric(name, "miss")
+    lock = cache.lock(f"lock:{key}", timeout=settings.CACHE_LOCK_TIMEOUT)
+    if lock.acquire(blocking=False):
+        try:
+            return _compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            _release(lock)
+
+    # 다른 워커가 계산 중 → 짧게 대기 후에도 결과가 없으면 직접 계산
+    # (락 만료 시간까지 기다리면 느린 재계산 하나가 동기 워커 전체를 묶음)
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if not cache.has_key(f"lock:{key}"):
+            break
+    return _compute_and_store(key, compute, ttl, stale_ttl)
+
+
+def _release(lock) -> None:
+    try:
+        lock.release()
+    except LockError:
+        # 계산이 락 만료 시간을 넘긴 경우 (다른 워커가 이미 락을 가져감)
+        pass
+
+
+# 유저 데이터 버전을 키에 포함해 계산 결과를 캐시
+def get_or_compute(
+    name: str,
+    user_id: int,
+    key_parts: Iterable[Hashable],
+    compute: Callable[[], Any],
+    ttl: int | None = None,
+) -> Any:
+    version = get_data_version(user_id)
+    key = ":".join([name, str(user_id), str(version), *map(str, key_parts)])
+    return get_or_compute_shared(name, key, compute, ttl=ttl)
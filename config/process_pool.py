@@ -0,0 +1,52 @@
+# config/process_pool.py
+# CPU 위주 분석 계산용 프로세스 풀 (웹 워커 프로세스당 1개, 최초 사용 시 생성)
+# spawn 방식이라 전달하는 함수는 Django를 import하지 않는 모듈에 있어야 하고, 인자는 pickle 가능해야 함
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+
+_pool: ProcessPoolExecutor | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool, _pool_pid
+    if _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        # fork된 자식 프로세스는 부모의 풀을 쓸 수 없으므로 새로 생성
+        if _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.ANALYSIS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_pid = os.getpid()
+    return _pool
+
+
+# 풀에서 실행 후 결과 대기 (작업 예외는 호출한 쪽으로 그대로 전달)
+def run_in_process_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    future = get_process_pool().submit(fn, *args)
+    return future.result(timeout=settings.ANALYSIS_POOL_TIMEOUT)
+
+
+def _setup_django_worker() -> None:
+    import django
+
+    django.setup()
+
+
+# DB 조회가 필요한 배치 작업용 풀 (관리 명령어에서 생성/종료, 워커마다 Django 초기화)
+def django_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_setup_django_worker,
+    )
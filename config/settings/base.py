@@ -127,11 +127,56 @@ CACHES = {
     }
 }
 
+# 응답 캐시 TTL 상한 (초)
+CACHE_TTL_CEILING = int(os.getenv("CACHE_TTL_CEILING", 600))
+# 만료 후 재계산 동안 기존 값을 응답할 수 있는 추가 보관 시간 (초)
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 300))
+# 재계산 락 유지 시간 (초, 가장 느린 계산보다 길게)
+CACHE_LOCK_TIMEOUT = int(os.getenv("CACHE_LOCK_TIMEOUT", 30))
+# 캐시가 비어 있고 다른 워커가 계산 중일 때 결과를 기다리는 최대 시간 (초, 이후 직접 계산)
+# 동기 워커가 느린 재계산에 묶이지 않도록 짧게 유지
+CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", 0.5))
+# 조기 갱신 강도 (클수록 일찍 갱신, 0이면 만료 시에만 갱신)
+CACHE_XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", 1.0))
+
+# 2단 캐시 (워커별 메모리 LRU + Redis)
+# 워커당 L1 메모리 예산 (바이트)
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+# L1 보관 시간 (초, 무효화 메시지 유실 대비)
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", 60))
+# L2(Redis) 보관 시간 (초)
+TIERED_CACHE_TTL = int(os.getenv("TIERED_CACHE_TTL", 600))
+# 무효화 메시지 채널
+CACHE_INVALIDATION_CHANNEL = os.getenv(
+    "CACHE_INVALIDATION_CHANNEL", "cache_invalidation"
+)
+
+# 수면 기록 여부 비트맵 보관 시간 (초, 기록 작성/재생성 시 연장)
+SLEEP_BITMAP_TTL = int(os.getenv("SLEEP_BITMAP_TTL", 30 * 24 * 60 * 60))
+# 비트맵이 없을 때 작성된 기록 비트 보관 시간 (초, 다음 재생성 시 병합)
+SLEEP_BITMAP_PENDING_TTL = int(os.getenv("SLEEP_BITMAP_PENDING_TTL", 600))
+
+# 분석 계산용 프로세스 풀
+# 웹 워커당 풀 프로세스 수
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", 2))
+# 풀 작업 결과 대기 시간 (초)
+ANALYSIS_POOL_TIMEOUT = int(os.getenv("ANALYSIS_POOL_TIMEOUT", 30))
+# 기록 기간이 이 일수 이상이면 시차 상관 계산을 풀에서 실행
+LAG_CORRELATION_POOL_MIN_DAYS = int(os.getenv("LAG_CORRELATION_POOL_MIN_DAYS", 730))
+
+# 수면 기록 작성 가능 기간: 가입일 이전 최대 일수 ~ 오늘
+# (누적합 인덱스가 가장 이른 기록일부터 하루 1행이므로 범위 밖 날짜는 거부)
+SLEEP_RECORD_MAX_PAST_DAYS = int(os.getenv("SLEEP_RECORD_MAX_PAST_DAYS", 3650))
+
+# 인지 테스트 규준표(.npy) 저장 디렉터리 (모든 워커가 읽기 전용 메모리 매핑)
+NORM_TABLE_DIR = os.getenv("NORM_TABLE_DIR", str(BASE_DIR.parent / "data" / "norms"))
+
+# 테스트 실행마다 캐시 키 접두어 분리
+TEST_RUNNER = "config.test_runner.RedisIsolatedTestRunner"
+
 # DRF 설정
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
 
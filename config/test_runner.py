@@ -0,0 +1,30 @@
+# config/test_runner.py
+# 테스트 실행 단위로 캐시 키 접두어를 분리해 개발용 Redis 데이터와 섞이지 않도록 함
+# (인증 유저, 응답 캐시 등 대부분의 요청이 Redis를 거치므로 이전 실행의 값이 남으면 안 됨)
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class RedisIsolatedTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_override = override_settings(
+            CACHES={
+                "default": {
+                    **settings.CACHES["default"],
+                    "KEY_PREFIX": f"test-{uuid4().hex}",
+                }
+            },
+            CACHE_INVALIDATION_CHANNEL=f"test-{uuid4().hex}",
+        )
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        # 이번 실행에서 만든 키만 삭제
+        cache.delete_pattern("*")
+        self._cache_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,115 @@
+import time
+
+from django.core.cache import cache
+
+from config.cache import get_or_compute_shared
+from config.tiered_cache import BoundedLRU, clear_local_caches
+from users.models import User
+from users.services import get_cached_auth_fields, get_cached_user, user_cache
+from users.tests import UserAPITestCase
+
+
+class TestResponseCache(UserAPITestCase):
+    def test_mypage_cache_is_invalidated_by_data_version(self):
+        self.post_sleep_record(self.today, sleep_duration=420)
+        url = f"/api/users/mypage/records/{self.today}/detail/"
+
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            # 응답 캐시 + 인증 유저 캐시 적중
+            self.assertEqual(self.client.get(url).data, first.data)
+
+        # 커밋 후 버전이 올라가면 이전 캐시는 조회되지 않음
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_cognitive_results((90, 60, 30))
+        second = self.client.get(url)
+        self.assertNotEqual(second.data, first.data)
+
+        admin = User.objects.create_user(
+            email="admin@example.com",
+            social_type="KAKAO",
+            social_id="admin_kakao_1",
+            is_staff=True,
+        )
+        self.client.force_authenticate(admin)
+        metrics = self.client.get("/api/admin/cache/metrics/").data
+        self.assertEqual(metrics["mypage_record_date_detail"]["hit"], 1)
+        self.assertEqual(metrics["mypage_record_date_detail"]["miss"], 2)
+
+    def test_expired_entry_is_recomputed_by_single_flight(self):
+        def fail():
+            raise AssertionError("락을 잡지 못한 요청은 재계산하지 않아야 함")
+
+        # 논리 만료가 지난 값 + 다른 워커가 락 보유 → 만료된 값 응답
+        cache.set("payload", ("old", time.time() - 1, 0.0), timeout=60)
+        lock = cache.lock("lock:payload", timeout=5)
+        lock.acquire()
+        self.assertEqual(get_or_compute_shared("test", "payload", fail), "old")
+
+        # 락이 풀리면 한 요청이 재계산 후 저장
+        lock.release()
+        self.assertEqual(get_or_compute_shared("test", "payload", lambda: "new"), "new")
+        self.assertEqual(get_or_compute_shared("test", "payload", fail), "new")
+
+    def test_miss_waits_briefly_before_computing_inline(self):
+        # 캐시가 비어 있고 다른 워커가 오래 계산 중 → 락 만료까지 기다리지 않음
+        lock = cache.lock("lock:payload", timeout=30)
+        lock.acquire()
+        started = time.monotonic()
+        with self.settings(CACHE_LOCK_WAIT=0.1):
+            value = get_or_compute_shared("test", "payload", lambda: "inline")
+        self.assertEqual(value, "inline")
+        self.assertLess(time.monotonic() - started, 5)
+        lock.release()
+
+
+class TestTieredCache(UserAPITestCase):
+    def test_auth_user_is_served_from_tiered_cache(self):
+        self.client.get("/api/users/mypage/main/")
+        # 인증 필드는 캐시에서, 나머지 필드는 첫 접근 시 한 번에 조회
+        with self.assertNumQueries(1):
+            user = get_cached_user(self.user.pk)
+            self.assertTrue(user.is_active)
+            self.assertEqual(user.nickname, "tester")
+            self.assertEqual(user.sleep_target_minutes, 480)
+        # 비밀번호 해시는 캐시에 보관하지 않음
+        self.assertNotIn("password", get_cached_auth_fields(self.user.pk))
+
+        # 저장 커밋 시 무효화 → 다음 조회는 DB에서 최신 값
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.nickname = "renamed"
+            self.user.save()
+        with self.assertNumQueries(2):
+            self.assertEqual(get_cached_user(self.user.pk).nickname, "renamed")
+
+        # 일괄 수정(QuerySet.update)도 커밋 시 무효화 → 비활성 유저는 인증 거부
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get("/api/users/mypage/main/")
+        self.assertEqual(response.status_code, 401)
+
+        # 메모리 예산을 넘으면 가장 오래 사용되지 않은 항목부터 제거
+        lru = BoundedLRU(max_bytes=10)
+        lru.set(("t", 1), b"12345", ttl=60)
+        lru.set(("t", 2), b"12345", ttl=60)
+        lru.get(("t", 1))
+        lru.set(("t", 3), b"12345", ttl=60)
+        self.assertIsNone(lru.get(("t", 2)))
+        self.assertEqual(lru.get(("t", 1)), b"12345")
+        self.assertEqual(lru.evictions, 1)
+
+    def test_stale_read_is_not_written_back_after_invalidation(self):
+        stale = get_cached_auth_fields(self.user.pk)
+        user_cache._invalidate_now(self.user.pk)
+        clear_local_caches()
+
+        # 커밋 전에 DB를 읽은 요청 → 조회 중 무효화(커밋) → 이전 값은 캐시하지 않음
+        def load_before_commit():
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            user_cache._invalidate_now(self.user.pk)
+            return stale
+
+        self.assertTrue(user_cache.get(self.user.pk, load_before_commit)["is_active"])
+        self.assertFalse(get_cached_auth_fields(self.user.pk)["is_active"])
+        response = self.client.get("/api/users/mypage/main/")
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,268 @@
+# config/tiered_cache.py
+# 자주 읽고 거의 바뀌지 않는 객체용 2단 캐시
+# L1: 워커(프로세스)별 메모리 LRU (메모리 예산 초과 시 오래된 항목부터 제거)
+# L2: Redis (django cache)
+# 모델 변경 시 Redis pub/sub 채널로 무효화 메시지를 보내 모든 워커의 L1 항목 제거
+# 무효화마다 세대 번호를 올리고, L2 저장은 조회 시작 시점의 세대가 그대로일 때만 허용
+# (커밋 전에 DB를 읽은 요청이 무효화 이후 이전 값을 L2에 다시 쓰지 못하게 함)
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# 무효화 구독 연결이 끊겼을 때 재연결 대기 시간 (초)
+RECONNECT_DELAY = 1.0
+
+# 세대(항목/이름공간)가 조회 시작 시점과 같을 때만 L2 저장
+# KEYS: [값, 항목 세대, 이름공간 세대], ARGV: [항목 세대, 이름공간 세대, 값, TTL]
+SET_IF_GENERATION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+if (redis.call('GET', KEYS[3]) or '0') ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[4])
+return 1
+"""
+
+# 세대 증가 후 L2 값 삭제 (세대 키는 조회 중인 요청보다 오래 남도록 값 TTL만큼 유지)
+# KEYS: [세대, 값(없으면 생략)], ARGV: [세대 TTL]
+INVALIDATE_SCRIPT = """
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+if KEYS[2] then
+    redis.call('DEL', KEYS[2])
+end
+return 1
+"""
+
+
+# 바이트 예산 기반 LRU (값은 pickle 바이트로 보관 → 요청마다 독립된 객체 반환)
+class BoundedLRU:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: tuple, data: bytes, ttl: float) -> None:
+        # 예산보다 큰 값은 L1에 두지 않음
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (data, time.monotonic() + ttl)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def delete(self, key: tuple) -> None:
+        with self._lock:
+            self._pop(key)
+
+    # 특정 이름공간 전체 제거
+    def delete_namespace(self, name: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == name]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+
+_local = BoundedLRU(settings.LOCAL_CACHE_MAX_BYTES)
+_tiers: dict[str, "TieredCache"] = {}
+_listener_pid: int | None = None
+_listener_lock = threading.Lock()
+
+
+class TieredCache:
+    def __init__(self, name: str, ttl: int | None = None, local_ttl: int | None = None):
+        self.name = name
+        self.ttl = ttl or settings.TIERED_CACHE_TTL
+        # 무효화 메시지를 놓쳐도 L1 값이 오래 남지 않도록 짧게 유지
+        self.local_ttl = local_ttl or settings.LOCAL_CACHE_TTL
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        _tiers[name] = self
+
+    # L2는 pickle 바이트를 그대로 보관 (세대 확인 스크립트로 저장하므로 Redis 직접 사용)
+    # 캐시 키 접두어를 붙여 캐시 전체 삭제(delete_pattern) 대상에 포함
+    def _redis_key(self, key: Hashable) -> str:
+        return cache.make_key(f"tiered:{self.name}:{key}")
+
+    def _generation_key(self, key: Hashable | None = None) -> str:
+        suffix = "" if key is None else f":{key}"
+        return cache.make_key(f"tiered_gen:{self.name}{suffix}")
+
+    # L1 -> L2 -> loader 순으로 조회 (loader가 None을 반환하면 캐시하지 않음)
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        _ensure_listener()
+        # 토큰 클레임(문자열)과 모델 pk(정수)가 같은 항목을 가리키도록 문자열로 통일
+        key = str(key)
+        local_key = (self.name, key)
+
+        data = _local.get(local_key)
+        if data is not None:
+            self.local_hits += 1
+            return pickle.loads(data)
+
+        # 값과 세대를 한 번에 조회 (세대는 loader 호출 전 시점 기준)
+        redis = get_redis_connection("default")
+        data, generation, namespace_generation = redis.mget(
+            self._redis_key(key), self._generation_key(key), self._generation_key()
+        )
+        if data is not None:
+            self.redis_hits += 1
+            _local.set(local_key, data, self.local_ttl)
+            return pickle.loads(data)
+
+        self.misses += 1
+        value = loader()
+        if value is not None:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            stored = redis.eval(
+                SET_IF_GENERATION_SCRIPT,
+                3,
+                self._redis_key(key),
+                self._generation_key(key),
+                self._generation_key(),
+                generation or b"0",
+                namespace_generation or b"0",
+                data,
+                self.ttl,
+            )
+            # 조회 중 무효화됐으면 이번 응답에만 사용하고 캐시하지 않음
+            if stored:
+                _local.set(local_key, data, self.local_ttl)
+        return value
+
+    # 커밋 이후 L2 삭제 + 모든 워커에 무효화 전파 (key가 None이면 이름공간 전체)
+    def invalidate(self, key: Hashable | None = None) -> None:
+        if key is not None:
+            key = str(key)
+        transaction.on_commit(lambda: self._invalidate_now(key))
+
+    def _invalidate_now(self, key: Hashable | None) -> None:
+        redis = get_redis_connection("default")
+        if key is None:
+            redis.eval(INVALIDATE_SCRIPT, 1, self._generation_key(), self.ttl)
+            cache.delete_pattern(f"tiered:{self.name}:*")
+        else:
+            redis.eval(
+                INVALIDATE_SCRIPT,
+                2,
+                self._generation_key(key),
+                self._redis_key(key),
+                self.ttl,
+            )
+        _drop_local({"name": self.name, "key": key})
+        redis.publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"name": self.name, "key": key}),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        total = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hit": self.local_hits,
+            "redis_hit": self.redis_hits,
+            "miss": self.misses,
+            "local_hit_ratio": round(self.local_hits / total, 4) if total else 0.0,
+            "hit_ratio": (
+                round((self.local_hits + self.redis_hits) / total, 4) if total else 0.0
+            ),
+        }
+
+
+def _drop_local(message: dict) -> None:
+    if message.get("key") is None:
+        _local.delete_namespace(message["name"])
+    else:
+        _local.delete((message["name"], message["key"]))
+
+
+# 무효화 채널 구독 (데몬 스레드, 연결이 끊기면 로컬 캐시를 비우고 재연결)
+def _listen() -> None:
+    while True:
+        try:
+            pubsub = get_redis_connection("default").pubsub(
+                ignore_subscribe_messages=True
+            )
+            pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                _drop_local(json.loads(message["data"]))
+        except Exception:
+            logger.warning("캐시 무효화 구독 연결 끊김, 재연결", exc_info=True)
+            _local.clear()
+            time.sleep(RECONNECT_DELAY)
+
+
+# 워커 프로세스마다 구독 스레드 1개 (fork 이후 최초 사용 시 시작)
+def _ensure_listener() -> None:
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        # fork 이전 부모 프로세스의 L1 항목은 무효화를 받지 못했을 수 있음
+        _local.clear()
+        threading.Thread(target=_listen, name="cache-invalidation", daemon=True).start()
+        _listener_pid = os.getpid()
+
+
+def clear_local_caches() -> None:
+    _local.clear()
+
+
+# 현재 워커의 이름공간별 적중률 및 L1 메모리 사용량
+def get_local_cache_stats() -> dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "entries": len(_local),
+        "bytes": _local.size,
+        "max_bytes": _local.max_bytes,
+        "evictions": _local.evictions,
+        "caches": {name: tier.stats() for name, tier in sorted(_tiers.items())},
+    }
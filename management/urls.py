@@ -3,6 +3,8 @@ from typing import List, Union
 from django.urls import URLPattern, URLResolver, path
 
 from management.views import (
+    AdminCacheMetricsView,
+    AdminLocalCacheStatsView,
     AdminLogsView,
     AdminRootView,
     AdminUserDetailView,
@@ -16,4 +18,14 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
         "admin/users/<int:pk>/", AdminUserDetailView.as_view(), name="admin_user_detail"
     ),
     path("admin/logs/", AdminLogsView.as_view(), name="admin_logs"),
+    path(
+        "admin/cache/metrics/",
+        AdminCacheMetricsView.as_view(),
+        name="admin_cache_metrics",
+    ),
+    path(
+        "admin/cache/local/",
+        AdminLocalCacheStatsView.as_view(),
+        name="admin_local_cache_stats",
+    ),
 ]
@@ -1,8 +1,11 @@
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.cache import get_cache_metrics
+from config.tiered_cache import get_local_cache_stats
 from management.serializers import UserDetailSerializer, UserUpdateSerializer
 from users.models import User
 
@@ -115,3 +118,19 @@ class AdminLogsView(APIView):
             {"message": "GET logs data (logs model not available in management app)"},
             status=status.HTTP_200_OK,
         )
+
+
+# 응답 캐시 hit/miss 지표 조회
+class AdminCacheMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_cache_metrics(), status=status.HTTP_200_OK)
+
+
+# 2단 캐시(워커 메모리 LRU) 적중률 및 메모리 사용량 조회 (요청을 처리한 워커 기준)
+class AdminLocalCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_local_cache_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,149 @@
+# 유저별 수면 기록 여부 Redis 비트맵 (가입일부터 하루 1비트, 비트 위치 = 가입일로부터 지난 일수)
+# 달력 표시용 존재 여부를 Postgres 대신 Redis 한 번 호출로 응답
+# 키가 없으면(재생성 전/TTL 만료/축출) DB에서 다시 만들고, 가입일 이전 날짜는 DB에서 조회
+from datetime import timedelta
+from functools import partial
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from sleep_record.models import SleepRecord
+from users.models import User
+from users.utils import to_local_date
+
+# 기록 비트 설정 (비트맵 키가 있으면 그 키에, 없으면 대기 키에 설정)
+# 없는 키에 바로 설정하면 이전 날짜가 모두 0인 비트맵이 생기므로, 재생성 시 대기 키를 합쳐 반영
+# KEYS: [비트맵, 대기], ARGV: [비트 위치, 비트맵 TTL, 대기 TTL]
+SETBIT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SETBIT', KEYS[1], ARGV[1], 1)
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+redis.call('SETBIT', KEYS[2], ARGV[1], 1)
+return redis.call('EXPIRE', KEYS[2], ARGV[3])
+"""
+
+# DB로 만든 비트맵을 기존 비트맵/대기 비트와 OR로 병합 (재생성 중 커밋된 기록의 비트 보존)
+# 기록은 삭제되지 않으므로(유저 삭제 제외) 비트는 0 → 1로만 바뀜
+# KEYS: [비트맵, 대기, 임시], ARGV: [재생성 비트맵, 비트맵 TTL]
+MERGE_SCRIPT = """
+redis.call('SET', KEYS[3], ARGV[1])
+redis.call('BITOP', 'OR', KEYS[1], KEYS[1], KEYS[2], KEYS[3])
+redis.call('DEL', KEYS[2], KEYS[3])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SET', KEYS[1], '')
+end
+return redis.call('EXPIRE', KEYS[1], ARGV[2])
+"""
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+# 비트맵 기준일 (유저 로컬 가입일)
+def bitmap_origin(user):
+    return to_local_date(user, user.joined_at)
+
+
+# 기준일이 바뀌면(타임존/하루 기준 시각 변경) 다른 키를 사용 → 이전 비트맵은 TTL로 만료
+# 캐시 키 접두어를 붙여 캐시 전체 삭제(delete_pattern) 대상에 포함
+def _key(user, origin, kind="sleep_bitmap"):
+    return cache.make_key(f"{kind}:{user.pk}:{origin}")
+
+
+# 기준일 이후 날짜 목록 → 비트맵 바이트 (Redis 비트 순서: 바이트 내 상위 비트부터)
+def pack_dates(origin, dates):
+    offsets = [(day - origin).days for day in dates if day >= origin]
+    bits = np.zeros(max(offsets, default=-1) + 1, dtype=bool)
+    bits[offsets] = True
+    return np.packbits(bits).tobytes()
+
+
+# DB의 수면 기록 날짜로 비트맵 재생성 (병합 스크립트 1회), 반환값: 기준일 이후 기록 날짜 집합
+def rebuild_sleep_bitmap(user):
+    origin = bitmap_origin(user)
+    dates = set(
+        SleepRecord.objects.filter(user=user, date__gte=origin).values_list(
+            "date", flat=True
+        )
+    )
+    _redis().eval(
+        MERGE_SCRIPT,
+        3,
+        _key(user, origin),
+        _key(user, origin, "sleep_bitmap_pending"),
+        _key(user, origin, "sleep_bitmap_rebuild"),
+        pack_dates(origin, dates),
+        settings.SLEEP_BITMAP_TTL,
+    )
+    return dates
+
+
+# 전체(또는 지정) 유저 비트맵 재생성 (관리 명령어에서 사용)
+def rebuild_sleep_bitmaps(user_ids=None):
+    users = User.objects.all()
+    if user_ids:
+        users = users.filter(user_id__in=user_ids)
+    count = 0
+    for user in users.iterator():
+        rebuild_sleep_bitmap(user)
+        count += 1
+    return count
+
+
+def _set_bit(user, day):
+    origin = bitmap_origin(user)
+    if day >= origin:
+        _redis().eval(
+            SETBIT_SCRIPT,
+            2,
+            _key(user, origin),
+            _key(user, origin, "sleep_bitmap_pending"),
+            (day - origin).days,
+            settings.SLEEP_BITMAP_TTL,
+            settings.SLEEP_BITMAP_PENDING_TTL,
+        )
+
+
+# 수면 기록 작성 시 호출 (커밋 이후 비트 설정 → 롤백된 작성은 반영되지 않음)
+def mark_sleep_record(user, day):
+    transaction.on_commit(partial(_set_bit, user, day))
+
+
+# 기간 [start_date, end_date] 날짜별 기록 여부 (비트맵 GETRANGE 1회)
+def sleep_record_days(user, start_date, end_date):
+    origin = bitmap_origin(user)
+    key = _key(user, origin)
+    days = (end_date - start_date).days + 1
+    result = np.zeros(days, dtype=bool)
+
+    # 가입일 이전 구간은 비트맵 범위 밖 → DB 조회
+    if start_date < origin:
+        for day in SleepRecord.objects.filter(
+            user=user, date__range=(start_date, min(end_date, origin - timedelta(1)))
+        ).values_list("date", flat=True):
+            result[(day - start_date).days] = True
+    if end_date < origin:
+        return result.tolist()
+
+    first = max((start_date - origin).days, 0)
+    last = (end_date - origin).days
+    pipe = _redis().pipeline(transaction=False)
+    pipe.exists(key)
+    pipe.getrange(key, first // 8, last // 8)
+    exists, chunk = pipe.execute()
+
+    if exists:
+        bits = np.unpackbits(np.frombuffer(chunk, dtype=np.uint8))
+        bits = bits[first % 8 : first % 8 + last - first + 1]
+        offset = (origin + timedelta(days=first) - start_date).days
+        result[offset : offset + len(bits)] = bits.astype(bool)
+    else:
+        for day in rebuild_sleep_bitmap(user):
+            if start_date <= day <= end_date:
+                result[(day - start_date).days] = True
+    return result.tolist()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sleep_record.bitmap import rebuild_sleep_bitmaps
+
+
+# 수면 기록 여부 Redis 비트맵 일괄 재생성 (Redis 초기화/기능 도입 전 기록 반영용)
+class Command(BaseCommand):
+    help = "SleepRecord 날짜로 유저별 수면 기록 여부 비트맵을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids", help="대상 유저 id"
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_sleep_bitmaps(user_ids=options["user_ids"])
+        self.stdout.write(self.style.SUCCESS(f"유저 {count}명 수면 비트맵 재생성 완료"))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# 유니크 제약 추가 전 (user, date) 중복 기록 정리 (가장 최근 수정본만 유지)
+def remove_duplicate_records(apps, schema_editor):
+    SleepRecord = apps.get_model("sleep_record", "SleepRecord")
+    duplicates = (
+        SleepRecord.objects.values("user_id", "date")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for dup in duplicates.iterator():
+        records = SleepRecord.objects.filter(
+            user_id=dup["user_id"], date=dup["date"]
+        ).order_by("-updated_at", "-id")
+        keep = records.first()
+        records.exclude(pk=keep.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sleep_record", "0003_merge_0002_alter_sleeprecord_memo_0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_records, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="sleeprecord",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="unique_sleep_record_user_date"
+            ),
+        ),
+    ]
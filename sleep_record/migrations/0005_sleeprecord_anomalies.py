@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sleep_record", "0004_unique_user_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sleeprecord",
+            name="anomalies",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sleep_record", "0005_sleeprecord_anomalies"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sleeprecord",
+            name="sleep_debt_14",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="sleeprecord",
+            name="sleep_debt_7",
+            field=models.IntegerField(default=0),
+        ),
+    ]
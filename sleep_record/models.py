@@ -20,8 +20,19 @@ class SleepRecord(models.Model):
     )
     score = models.IntegerField()
     memo = models.TextField(blank=True, null=True)
+    # 작성 시점 이상 탐지 결과 {지표: z 점수} (이상 없으면 빈 dict)
+    anomalies = models.JSONField(default=dict, blank=True)
+    # 이 날짜까지 최근 7/14일 수면 빚(분) = Σ(목표 수면 시간 - 수면 시간), 음수는 초과 수면
+    sleep_debt_7 = models.IntegerField(default=0)
+    sleep_debt_14 = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "sleep_record"
+        # 유저당 하루 1건 (upsert 충돌 기준 + 유저/날짜 조회 인덱스)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="unique_sleep_record_user_date"
+            )
+        ]
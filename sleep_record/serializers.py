@@ -1,6 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
 from rest_framework import serializers
 
 from sleep_record.models import SleepRecord
+from users.utils import local_calendar_today, to_local_date
 
 
 class SleepRecordSerializer(serializers.ModelSerializer):
@@ -20,3 +24,18 @@ class SleepRecordSerializer(serializers.ModelSerializer):
         ]
 
         read_only_fields = ["id", "score", "created_at", "updated_at"]
+
+    # 가입일 이전 SLEEP_RECORD_MAX_PAST_DAYS일 ~ 유저 타임존 달력상 오늘만 허용
+    # (하루 기준 시각을 적용하면 야간 근무자는 정오 전까지 오늘 날짜를 기록할 수 없음)
+    def validate_date(self, value):
+        user = self.context["request"].user
+        earliest = to_local_date(user, user.joined_at) - timedelta(
+            days=settings.SLEEP_RECORD_MAX_PAST_DAYS
+        )
+        if value > local_calendar_today(user):
+            raise serializers.ValidationError("미래 날짜는 기록할 수 없습니다.")
+        if value < earliest:
+            raise serializers.ValidationError(
+                f"{earliest} 이후 날짜만 기록할 수 있습니다."
+            )
+        return value
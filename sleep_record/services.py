@@ -1,29 +1,144 @@
+import json
 import logging
 
+from django.db import connection, transaction
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from sleep_record.bitmap import mark_sleep_record, sleep_record_days
 from sleep_record.models import SleepRecord
+from users.anomaly import detect_sleep_anomalies
+from users.sleep_debt import new_night_debts
+from users.stats import apply_sleep_record
 
 logger = logging.getLogger(__name__)
 
 
+# 중복 확인과 생성을 INSERT ... ON CONFLICT 한 문장으로 처리
+# (동시 재시도 요청이 와도 (user_id, date) 유니크 제약으로 1건만 생성)
+# shifted: 새 날짜가 창(7/14일)에 포함되는 이후 기록의 수면 빚 보정
+# (그날 기록이 이미 있으면 삽입되지 않으므로 보정도 하지 않음)
+INSERT_SLEEP_RECORD_SQL = """
+    WITH shifted AS (
+        UPDATE sleep_record
+        SET sleep_debt_7 = sleep_debt_7
+                + CASE WHEN date < %s::date + 7 THEN %s ELSE 0 END,
+            sleep_debt_14 = sleep_debt_14 + %s
+        WHERE user_id = %s AND date > %s AND date < %s::date + 14
+            AND NOT EXISTS (
+                SELECT 1 FROM sleep_record WHERE user_id = %s AND date = %s
+            )
+    )
+    INSERT INTO sleep_record (
+        user_id, date, sleep_duration, subjective_quality, sleep_latency,
+        wake_count, disturb_factors, score, memo, anomalies, sleep_debt_7,
+        sleep_debt_14, created_at, updated_at
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s)
+    ON CONFLICT (user_id, date) DO NOTHING
+    RETURNING sleep_record_id
+"""
+
+# 수정과 수정 전 값 조회를 UPDATE 한 문장으로 처리
+# (FROM 절의 old는 수정 전 스냅샷이므로 누적 통계 증감 계산에 사용)
+# 수면 시간 차이(수정 전 - 수정 후)만큼 그날과 창 안의 이후 기록 수면 빚 보정
+UPDATE_SLEEP_RECORD_SQL = """
+    WITH shifted AS (
+        UPDATE sleep_record AS later
+        SET sleep_debt_7 = later.sleep_debt_7
+                + CASE WHEN later.date < old.date + 7
+                    THEN old.sleep_duration - %s ELSE 0 END,
+            sleep_debt_14 = later.sleep_debt_14 + old.sleep_duration - %s
+        FROM sleep_record AS old
+        WHERE old.user_id = %s AND old.date = %s
+            AND later.user_id = old.user_id
+            AND later.date > old.date AND later.date < old.date + 14
+    )
+    UPDATE sleep_record AS record
+    SET sleep_duration = %s, subjective_quality = %s, sleep_latency = %s,
+        wake_count = %s, disturb_factors = %s, score = %s, memo = %s,
+        anomalies = %s::jsonb,
+        sleep_debt_7 = old.sleep_debt_7 + old.sleep_duration - %s,
+        sleep_debt_14 = old.sleep_debt_14 + old.sleep_duration - %s,
+        updated_at = %s
+    FROM sleep_record AS old
+    WHERE old.sleep_record_id = record.sleep_record_id
+        AND record.user_id = %s AND record.date = %s
+    RETURNING record.sleep_record_id, record.created_at,
+        old.sleep_duration, old.score, record.sleep_debt_7, record.sleep_debt_14
+"""
+
+
+# 요청 데이터로 수면 기록 인스턴스 구성 (점수 계산 포함)
+def build_sleep_record(user, data, date):
+    return SleepRecord(
+        user=user,
+        date=date,
+        sleep_duration=data["sleep_duration"],
+        subjective_quality=data["subjective_quality"],
+        sleep_latency=data["sleep_latency"],
+        wake_count=data["wake_count"],
+        disturb_factors=data["disturb_factors"],
+        score=calculate_sleep_score(data),
+        memo=data["memo"],
+    )
+
+
 def create_sleep_record(user, data):
     try:
+        sleep_record = build_sleep_record(user, data, data["date"])
+        sleep_record.created_at = sleep_record.updated_at = timezone.now()
+
+        with transaction.atomic():
+            # 이상 탐지 판정을 먼저 하고 결과를 INSERT 문에 함께 저장
+            # (중복 작성으로 삽입되지 않으면 트랜잭션 롤백으로 상태 갱신도 취소)
+            sleep_record.anomalies = detect_sleep_anomalies(user, sleep_record)
+            # 새 날짜의 수면 빚 + 이후 기록 보정량 (목표 - 수면 시간)
+            sleep_record.sleep_debt_7, sleep_record.sleep_debt_14 = new_night_debts(
+                user, sleep_record.date, sleep_record.sleep_duration
+            )
+            delta = user.sleep_target_minutes - sleep_record.sleep_duration
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    INSERT_SLEEP_RECORD_SQL,
+                    [
+                        sleep_record.date,
+                        delta,
+                        delta,
+                        user.pk,
+                        sleep_record.date,
+                        sleep_record.date,
+                        user.pk,
+                        sleep_record.date,
+                        user.pk,
+                        sleep_record.date,
+                        sleep_record.sleep_duration,
+                        sleep_record.subjective_quality,
+                        sleep_record.sleep_latency,
+                        sleep_record.wake_count,
+                        sleep_record.disturb_factors,
+                        sleep_record.score,
+                        sleep_record.memo,
+                        json.dumps(sleep_record.anomalies),
+                        sleep_record.sleep_debt_7,
+                        sleep_record.sleep_debt_14,
+                        sleep_record.created_at,
+                        sleep_record.updated_at,
+                    ],
+                )
+                row = cursor.fetchone()
+
+            # 충돌로 삽입되지 않았으면 이미 작성된 기록
+            if row is None:
+                raise ValidationError("수면 기록을 이미 작성했습니다.")
+            sleep_record.id = row[0]
+
+            # 마이페이지 일별 집계 반영
+            apply_sleep_record(user, sleep_record)
+            # 달력용 기록 여부 비트맵 (커밋 후 SETBIT)
+            mark_sleep_record(user, sleep_record.date)
 
-        if SleepRecord.objects.filter(user=user, date=data["date"]).exists():
-            raise ValidationError("수면 기록을 이미 작성했습니다.")
-
-        return SleepRecord.objects.create(
-            user=user,
-            date=data["date"],
-            sleep_duration=data["sleep_duration"],
-            subjective_quality=data["subjective_quality"],
-            sleep_latency=data["sleep_latency"],
-            wake_count=data["wake_count"],
-            disturb_factors=data["disturb_factors"],
-            score=calculate_sleep_score(data),
-            memo=data["memo"],
-        )
+        return sleep_record
 
     except Exception as e:
         logger.error("💥 수면 기록 생성 오류: %s", e)
@@ -46,18 +161,48 @@ def get_sleep_record(user, date):
 def update_sleep_record(user, data, date):
 
     try:
-        sleep_record = SleepRecord.objects.get(user=user, date=date)
-
-        sleep_record.sleep_duration = data["sleep_duration"]
-        sleep_record.subjective_quality = data["subjective_quality"]
-        sleep_record.sleep_latency = data["sleep_latency"]
-        sleep_record.wake_count = data["wake_count"]
-        sleep_record.disturb_factors = data["disturb_factors"]
-        sleep_record.memo = data["memo"]
-
-        sleep_record.score = calculate_sleep_score(data)
-
-        sleep_record.save()
+        sleep_record = build_sleep_record(user, data, date)
+        sleep_record.updated_at = timezone.now()
+
+        with transaction.atomic():
+            # 수정은 판정만 (탐지 상태에는 작성 시점 값이 이미 반영됨)
+            sleep_record.anomalies = detect_sleep_anomalies(
+                user, sleep_record, update_state=False
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    UPDATE_SLEEP_RECORD_SQL,
+                    [
+                        sleep_record.sleep_duration,
+                        sleep_record.sleep_duration,
+                        user.pk,
+                        date,
+                        sleep_record.sleep_duration,
+                        sleep_record.subjective_quality,
+                        sleep_record.sleep_latency,
+                        sleep_record.wake_count,
+                        sleep_record.disturb_factors,
+                        sleep_record.score,
+                        sleep_record.memo,
+                        json.dumps(sleep_record.anomalies),
+                        sleep_record.sleep_duration,
+                        sleep_record.sleep_duration,
+                        sleep_record.updated_at,
+                        user.pk,
+                        date,
+                    ],
+                )
+                row = cursor.fetchone()
+
+            if row is None:
+                raise SleepRecord.DoesNotExist("수정할 수면 기록이 없습니다.")
+            sleep_record.id, sleep_record.created_at = row[0], row[1]
+            sleep_record.sleep_debt_7, sleep_record.sleep_debt_14 = row[4], row[5]
+            # 누적 통계 증감 계산용 수정 전 값
+            previous = (row[2], row[3])
+
+            # 마이페이지 일별 집계 반영
+            apply_sleep_record(user, sleep_record, previous=previous)
 
         return sleep_record
     except Exception as e:
@@ -65,8 +210,9 @@ def update_sleep_record(user, data, date):
         raise ValidationError({"detail": f"수면 기록 수정 실패: {str(e)}"})
 
 
+# 기록 여부 비트맵 조회 (비트맵이 없거나 가입일 이전 날짜면 DB 조회 1회)
 def sleep_record_exists(user, date) -> bool:
-    return SleepRecord.objects.filter(user=user, date=date).exists()
+    return sleep_record_days(user, date, date)[0]
 
 
 def sleep_duration_score(minutes: int) -> int:
@@ -0,0 +1,197 @@
+import re
+from datetime import date, datetime, timezone
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_redis import get_redis_connection
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.tiered_cache import clear_local_caches
+from sleep_record.bitmap import _set_bit, rebuild_sleep_bitmap, sleep_record_days
+from sleep_record.models import SleepRecord
+from users.models import User, UserPrefixSums
+
+
+class TestSleepRecordAPI(APITestCase):
+    def setUp(self):
+        # 기록 여부 비트맵/인증 유저 캐시가 이전 실행 값으로 남지 않도록 캐시를 직접 비움
+        cache.delete_pattern("*")
+        clear_local_caches()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            social_type="KAKAO",
+            social_id="user_kakao_1",
+            nickname="tester",
+        )
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access_token)
+        self.payload = {
+            "date": "2025-06-01",
+            "sleep_duration": 450,
+            "subjective_quality": 3,
+            "sleep_latency": 0,
+            "wake_count": 1,
+            "disturb_factors": ["noise"],
+            "memo": "",
+        }
+
+    # sleep_record 테이블에 실행된 쿼리만 추출
+    def sleep_record_queries(self, context):
+        return [
+            q["sql"]
+            for q in context.captured_queries
+            if re.search(r"\bsleep_record\b", q["sql"])
+        ]
+
+    def test_create_is_single_upsert_and_rejects_duplicates(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/sleepRecord/", self.payload, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        queries = self.sleep_record_queries(context)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("ON CONFLICT", queries[0])
+
+        response = self.client.post("/api/sleepRecord/", self.payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(SleepRecord.objects.filter(user=self.user).count(), 1)
+
+    def test_duplicate_create_keeps_later_sleep_debts(self):
+        for day, minutes in (("2025-06-01", 450), ("2025-06-02", 400)):
+            self.client.post(
+                "/api/sleepRecord/",
+                {**self.payload, "date": day, "sleep_duration": minutes},
+                format="json",
+            )
+        records = SleepRecord.objects.filter(user=self.user).order_by("date")
+        debts = list(records.values_list("date", "sleep_debt_7", "sleep_debt_14"))
+
+        response = self.client.post(
+            "/api/sleepRecord/",
+            {**self.payload, "sleep_duration": 300},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            list(records.values_list("date", "sleep_debt_7", "sleep_debt_14")), debts
+        )
+
+    def test_create_rejects_dates_outside_recordable_range(self):
+        for day in ("9999-12-31", "0001-01-01"):
+            response = self.client.post(
+                "/api/sleepRecord/", {**self.payload, "date": day}, format="json"
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("date", response.data)
+        self.assertFalse(SleepRecord.objects.filter(user=self.user).exists())
+        self.assertFalse(UserPrefixSums.objects.filter(user=self.user).exists())
+
+    def test_night_shift_user_can_record_today_before_cutover(self):
+        # 야간 근무자(기준 시각 12시), 현지 시각 09:00 → 유저 기준 오늘은 전날
+        self.user.day_cutover_hour = 12
+        self.user.save()
+        now = datetime(2025, 6, 2, 0, 0, tzinfo=timezone.utc)  # 2025-06-02 09:00 KST
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            response = self.client.post(
+                "/api/sleepRecord/",
+                {**self.payload, "date": "2025-06-02"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+            response = self.client.post(
+                "/api/sleepRecord/",
+                {**self.payload, "date": "2025-06-03"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_patch_is_single_update(self):
+        self.client.post("/api/sleepRecord/", self.payload, format="json")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                "/api/sleepRecord/?date=2025-06-01",
+                {**self.payload, "sleep_duration": 480},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.sleep_record_queries(context)), 1)
+        self.assertEqual(SleepRecord.objects.get(user=self.user).sleep_duration, 480)
+
+        response = self.client.patch(
+            "/api/sleepRecord/?date=2025-06-02", self.payload, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_exists_is_single_query(self):
+        self.client.post("/api/sleepRecord/", self.payload, format="json")
+        with self.assertNumQueries(2):
+            # 유저 필드 1회 + 존재 여부 1회 (커밋 전 작성이라 비트맵은 DB로 재생성)
+            response = self.client.get("/api/sleepRecord/exist/?date=2025-06-01")
+        self.assertEqual(response.data, {"exists": True})
+
+    def test_calendar_and_exists_read_redis_bitmap(self):
+        self.user.joined_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+        self.user.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/sleepRecord/", self.payload, format="json")
+
+        # 유저 필드 1회 + 비트맵이 없으면 DB로 재생성 (1회)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/sleepRecord/exist/?date=2025-06-01")
+        self.assertEqual(response.data, {"exists": True})
+
+        # 이후 작성은 커밋 후 SETBIT
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/api/sleepRecord/",
+                {**self.payload, "date": "2025-06-03"},
+                format="json",
+            )
+        # 요청마다 유저 필드 1회, 기록 여부는 Redis만 사용
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/sleepRecord/exist/?date=2025-06-03")
+            self.assertEqual(response.data, {"exists": True})
+            response = self.client.get("/api/sleepRecord/calendar/?year=2025&month=6")
+        self.assertEqual(response.data["bits"], "101" + "0" * 27)
+
+        # 유저 필드 1회 + 가입일 이전 구간만 DB 조회
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/sleepRecord/calendar/?year=2025")
+        self.assertEqual(len(response.data["bits"]), 365)
+        self.assertEqual(response.data["bits"].count("1"), 2)
+
+        response = self.client.get("/api/sleepRecord/calendar/?year=2025&month=13")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rebuild_keeps_bits_set_while_the_bitmap_was_missing(self):
+        self.user.joined_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+        self.user.save()
+        SleepRecord.objects.create(
+            user=self.user,
+            date=date(2025, 6, 1),
+            sleep_duration=450,
+            subjective_quality=3,
+            sleep_latency=0,
+            wake_count=1,
+            disturb_factors=[],
+            score=80,
+        )
+
+        # 재생성이 DB를 읽은 뒤 커밋된 작성 → 비트맵 키가 없어 대기 키에 설정
+        _set_bit(self.user, date(2025, 6, 3))
+        rebuild_sleep_bitmap(self.user)
+        self.assertEqual(
+            sleep_record_days(self.user, date(2025, 6, 1), date(2025, 6, 3)),
+            [True, False, True],
+        )
+
+        # 기준일별 키는 TTL로 만료 (기준일이 바뀐 이전 키가 남지 않음)
+        key = cache.make_key(f"sleep_bitmap:{self.user.pk}:2025-05-01")
+        ttl = get_redis_connection("default").ttl(key)
+        self.assertTrue(0 < ttl <= settings.SLEEP_BITMAP_TTL)
@@ -2,7 +2,11 @@ from typing import List, Union
 
 from django.urls import URLPattern, URLResolver, path
 
-from sleep_record.views import SleepRecordExistsAPIView, SleepRecordView
+from sleep_record.views import (
+    SleepRecordCalendarAPIView,
+    SleepRecordExistsAPIView,
+    SleepRecordView,
+)
 
 urlpatterns: List[Union[URLPattern, URLResolver]] = [
     path(
@@ -15,4 +19,9 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
         SleepRecordExistsAPIView.as_view(),
         name="sleep_record_exist",
     ),
+    path(
+        "calendar/",
+        SleepRecordCalendarAPIView.as_view(),
+        name="sleep_record_calendar",
+    ),
 ]
@@ -1,4 +1,6 @@
+import calendar
 import logging
+from datetime import date as date_cls
 from datetime import datetime
 
 from rest_framework.permissions import IsAuthenticated
@@ -6,6 +8,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from sleep_record.bitmap import sleep_record_days
 from sleep_record.serializers import SleepRecordSerializer
 from sleep_record.services import (
     create_sleep_record,
@@ -21,7 +24,9 @@ class SleepRecordView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request: Request) -> Response:
-        serializer = SleepRecordSerializer(data=request.data)
+        serializer = SleepRecordSerializer(
+            data=request.data, context={"request": request}
+        )
         serializer.is_valid(raise_exception=True)
 
         create_sleep_record(user=request.user, data=serializer.validated_data)
@@ -55,7 +60,9 @@ class SleepRecordView(APIView):
     def patch(self, request: Request) -> Response:
         date = request.query_params.get("date")
 
-        serializer = SleepRecordSerializer(data=request.data)
+        serializer = SleepRecordSerializer(
+            data=request.data, context={"request": request}
+        )
         serializer.is_valid(raise_exception=True)
 
         if not date:
@@ -94,3 +101,36 @@ class SleepRecordExistsAPIView(APIView):
         exists = sleep_record_exists(user=request.user, date=date)
 
         return Response({"exists": exists}, status=200)
+
+
+# 월/연도 달력 기록 여부 (year 필수, month 생략 시 연도 전체)
+# bits: 시작일부터 하루 1글자 ("1": 기록 있음), 비트맵 GETRANGE 1회
+class SleepRecordCalendarAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        try:
+            year = int(request.query_params["year"])
+            month = request.query_params.get("month")
+            month = int(month) if month else None
+            if month is None:
+                start_date, end_date = date_cls(year, 1, 1), date_cls(year, 12, 31)
+            else:
+                last_day = calendar.monthrange(year, month)[1]
+                start_date = date_cls(year, month, 1)
+                end_date = date_cls(year, month, last_day)
+        except (KeyError, ValueError, calendar.IllegalMonthError):
+            return Response(
+                {"detail": "year(YYYY)는 필수이며 month는 1~12여야 합니다."},
+                status=400,
+            )
+
+        days = sleep_record_days(request.user, start_date, end_date)
+        return Response(
+            {
+                "start_date": str(start_date),
+                "end_date": str(end_date),
+                "bits": "".join("1" if exists else "0" for exists in days),
+            },
+            status=200,
+        )
@@ -0,0 +1,95 @@
+# 작성 시점 이상 탐지 (지수 가중 이동 평균 z 점수)
+# 지표별 상태(반영 수, 평균, 분산)를 누적 통계 행에 보관 → 기록 저장 시 O(1)로 판정, 조회 시 과거 기록 스캔 없음
+from datetime import timedelta
+from math import sqrt
+
+from .baseline import ewma_step
+from .models import UserLifetimeStats
+
+# 이상으로 판정할 |z| 기준
+ANOMALY_Z_THRESHOLD = 3.0
+# 판정을 시작할 최소 반영 수 (초기 몇 건은 상태만 쌓음)
+ANOMALY_MIN_COUNT = 5
+# 누적 통계 행에 보관하는 최근 알림 수
+MAX_RECENT_ALERTS = 10
+# 마이페이지에 표시하는 알림 기간 (일)
+ALERT_DAYS = 14
+# 지표별 이상 방향 (-1: 평소보다 낮으면 이상, 1: 평소보다 높으면 이상)
+ANOMALY_DIRECTIONS = {
+    "sleep_score": -1,
+    "sleep_duration": -1,
+    "srt_reaction_ms": 1,
+    "srt_score": -1,
+    "pattern_score": -1,
+    "symbol_score": -1,
+}
+
+
+def _z_score(state, value):
+    count, mean, var = state
+    if count < ANOMALY_MIN_COUNT or var <= 0:
+        return None
+    return (value - mean) / sqrt(var)
+
+
+# 지표 값 판정 + 상태 갱신 + 알림 기록 (기록 저장 트랜잭션 안에서 호출)
+# values: {지표: 값}, update_state=False면 판정만 (기존 기록 수정 시 상태 이중 반영 방지)
+# 반환값: 이상으로 판정된 지표 {지표: z 점수}
+def observe_values(user, day, values, update_state=True):
+    UserLifetimeStats.objects.get_or_create(user=user)
+    lifetime = UserLifetimeStats.objects.select_for_update().get(pk=user.pk)
+    state = dict(lifetime.anomaly_state)
+
+    anomalies = {}
+    for metric, value in values.items():
+        if value is None:
+            continue
+        count, mean, var = state.get(metric, (0, 0.0, 0.0))
+        z = _z_score((count, mean, var), value)
+        if z is not None and z * ANOMALY_DIRECTIONS[metric] >= ANOMALY_Z_THRESHOLD:
+            anomalies[metric] = round(z, 2)
+        if update_state:
+            mean, var = ewma_step(count, mean, var, value)
+            state[metric] = [count + 1, mean, var]
+
+    # 같은 날짜+지표 알림은 최신 판정으로 교체
+    date = str(day)
+    alerts = [
+        alert
+        for alert in lifetime.recent_alerts
+        if not (alert["date"] == date and alert["metric"] in values)
+    ]
+    alerts += [
+        {"date": date, "metric": metric, "value": values[metric], "z_score": z}
+        for metric, z in anomalies.items()
+    ]
+    lifetime.anomaly_state = state
+    lifetime.recent_alerts = alerts[-MAX_RECENT_ALERTS:]
+    lifetime.save(update_fields=["anomaly_state", "recent_alerts", "updated_at"])
+    return anomalies
+
+
+# 수면 기록 판정 (수면 기록 INSERT/UPDATE 전에 호출, 결과는 같은 문장으로 저장)
+def detect_sleep_anomalies(user, record, update_state=True):
+    return observe_values(
+        user,
+        record.date,
+        {"sleep_score": record.score, "sleep_duration": record.sleep_duration},
+        update_state=update_state,
+    )
+
+
+# 인지 테스트 결과 판정 (SRT는 평균 반응 시간도 판정)
+def detect_cognitive_anomalies(user, kind, result):
+    values = {f"{kind}_score": result.score or 0}
+    if kind == "srt":
+        values["srt_reaction_ms"] = result.reaction_avg_ms
+    return observe_values(user, result.local_date, values)
+
+
+# 마이페이지 알림 목록 (누적 통계 행의 최근 알림 중 기간 내, 최신순)
+def recent_alerts(lifetime, today):
+    since = str(today - timedelta(days=ALERT_DAYS - 1))
+    return [
+        alert for alert in reversed(lifetime.recent_alerts) if alert["date"] >= since
+    ]
@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .services import get_cached_auth_fields, user_from_auth_fields
+
+
+# JWT 인증 시 유저 조회를 2단 캐시(워커 메모리 + Redis)로 처리
+# 캐시에는 인증 확인에 필요한 필드만 두고, 나머지 필드는 뷰에서 처음 접근할 때 한 번에 조회
+# 검증 순서와 오류 응답은 JWTAuthentication.get_user와 동일
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        fields = get_cached_auth_fields(user_id)
+        if fields is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not fields["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != fields.get(
+                "password_digest"
+            ):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user_from_auth_fields(fields)
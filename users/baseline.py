@@ -0,0 +1,82 @@
+# 유저별 인지 테스트 개인 기준선 (UserCognitiveBaseline)
+# 결과가 저장될 때마다 지수 가중 평균/분산을 O(1)로 갱신 → 조회 시 과거 기록 없이 z 점수 계산
+from math import sqrt
+
+from cognitive_statistics.models import CognitiveResult
+
+from .models import UserCognitiveBaseline
+
+# 최신 결과 가중치 (클수록 최근 결과 위주, 0.1 ≈ 최근 약 20회 반영)
+BASELINE_ALPHA = 0.1
+# z 점수를 계산할 최소 결과 수
+BASELINE_MIN_COUNT = 3
+
+
+# 지수 가중 평균/분산 증분 갱신 (count: 지금까지 반영된 값 수) → (평균, 분산)
+def ewma_step(count, mean, var, value, alpha=BASELINE_ALPHA):
+    if count == 0:
+        return float(value), 0.0
+    diff = value - mean
+    increment = alpha * diff
+    return mean + increment, (1 - alpha) * (var + diff * increment)
+
+
+# 결과 1개 반영
+def _observe(baseline, score):
+    baseline.ewma_mean, baseline.ewma_var = ewma_step(
+        baseline.count, baseline.ewma_mean, baseline.ewma_var, score
+    )
+    baseline.count += 1
+
+
+# 기준선 대비 z 점수 (결과 수가 적거나 분산이 0이면 None)
+def baseline_z_score(baseline, score):
+    if (
+        baseline is None
+        or score is None
+        or baseline.count < BASELINE_MIN_COUNT
+        or baseline.ewma_var <= 0
+    ):
+        return None
+    return round((score - baseline.ewma_mean) / sqrt(baseline.ewma_var), 2)
+
+
+# 응답용 기준선 요약 (기준선이 없으면 값은 None)
+def baseline_summary(baseline, score):
+    has_baseline = baseline is not None and baseline.count > 0
+    return {
+        "count": baseline.count if baseline else 0,
+        "mean": round(baseline.ewma_mean, 1) if has_baseline else None,
+        "std": round(sqrt(baseline.ewma_var), 1) if has_baseline else None,
+        "z_score": baseline_z_score(baseline, score),
+    }
+
+
+# 결과 저장 시 기준선 갱신 (결과 POST 트랜잭션 안에서 호출)
+# 반환값: 이번 결과를 반영하기 전 기준선 대비 요약
+def update_cognitive_baseline(user, kind, result):
+    _, created = UserCognitiveBaseline.objects.get_or_create(user=user, test_kind=kind)
+    baseline = UserCognitiveBaseline.objects.select_for_update().get(
+        user=user, test_kind=kind
+    )
+    if created:
+        # 기능 도입 전 결과가 있는 유저는 최초 1회만 과거 결과로 기준선 초기화
+        history = (
+            CognitiveResult.objects.filter(user=user, test_kind=kind)
+            .exclude(source_id=result.id)
+            .order_by("created_at", "id")
+            .values_list("score", flat=True)
+        )
+        for score in history:
+            _observe(baseline, score or 0)
+
+    score = result.score or 0
+    summary = baseline_summary(baseline, score)
+    _observe(baseline, score)
+    baseline.save()
+    return summary
+
+
+# 유저의 테스트 종류별 기준선 {종류: 기준선} (조회 1회)
+def get_cognitive_baselines(user):
+    return {b.test_kind: b for b in user.cognitive_baselines.all()}
@@ -0,0 +1,270 @@
+# 코호트 백분위 비교
+# 야간 배치: 유저별 평균 수면 시간/수면 점수/인지 점수를 구해 코호트 x 지표별 고정 구간 히스토그램 생성
+# 조회: 유저가 속한 코호트의 히스토그램만 읽어 O(구간 수)로 백분위 계산 (원본 테이블 조회 없음)
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cognitive_statistics.models import CognitiveResult
+from sleep_record.models import SleepRecord
+
+from .models import (
+    CohortHistogram,
+    Gender,
+    JobSurvey,
+    MBTIType,
+    User,
+    UserLifetimeStats,
+)
+
+# 지표별 히스토그램 구간 (최솟값, 최댓값, 구간 수), 범위 밖 값은 양 끝 구간에 포함
+COHORT_METRICS = {
+    "sleep_duration": (0, 960, 96),  # 평균 수면 시간(분), 10분 단위
+    "sleep_score": (0, 100, 100),  # 평균 수면 점수
+    "cognitive_score": (0, 100, 100),  # 평균 인지 테스트 점수
+}
+# 코호트 구분 기준 (all: 전체 유저)
+COHORT_DIMENSIONS = (
+    "all",
+    "age_band",
+    "gender",
+    "mbti",
+    "cognitive_type",
+    "work_time_pattern",
+)
+# 백분위를 계산할 최소 코호트 인원 (너무 작은 코호트는 의미가 없고 개인 값 노출 우려)
+MIN_COHORT_USERS = 5
+# 코호트로 쓰지 않는 값 (선택 안 함)
+_UNSPECIFIED = {Gender.NONE, MBTIType.NONE}
+
+
+# 출생년도 → 연령대 (20대 → "20s")
+def age_band(birth_year, year):
+    if not birth_year:
+        return None
+    return f"{(year - birth_year) // 10 * 10}s"
+
+
+# 유저가 속한 코호트 목록 [(dimension, value), ...]
+def user_cohorts(birth_year, gender, mbti, cognitive_type, work_time_pattern, year):
+    cohorts = [("all", "")]
+    for dimension, value in (
+        ("age_band", age_band(birth_year, year)),
+        ("gender", gender),
+        ("mbti", mbti),
+        ("cognitive_type", cognitive_type),
+        ("work_time_pattern", work_time_pattern),
+    ):
+        if value and value not in _UNSPECIFIED:
+            cohorts.append((dimension, value))
+    return cohorts
+
+
+# 값 → 구간 번호
+def _bin_index(metric, value):
+    low, high, bins = COHORT_METRICS[metric]
+    position = (value - low) / (high - low) * bins
+    return min(max(int(position), 0), bins - 1)
+
+
+# 유저 id 범위 [first_id, last_id]의 코호트 x 지표별 히스토그램 (프로세스 풀 워커에서 실행)
+# 원본 기록은 서버 측 커서(iterator)로 스트리밍하며 유저별 합계/횟수만 보관
+# 반환값: {(dimension, value, metric): int64 도수 배열}
+def build_partial_histograms(first_id, last_id, chunk_size=2000):
+    # FK 컬럼은 range 조회를 지원하지 않아 gte/lte로 지정
+    id_range = {"user_id__gte": first_id, "user_id__lte": last_id}
+    sleep = defaultdict(lambda: [0, 0, 0])  # 수면 시간 합, 수면 점수 합, 횟수
+    for user_id, duration, score in (
+        SleepRecord.objects.filter(**id_range)
+        .values_list("user_id", "sleep_duration", "score")
+        .iterator(chunk_size=chunk_size)
+    ):
+        totals = sleep[user_id]
+        totals[0] += duration or 0
+        totals[1] += score or 0
+        totals[2] += 1
+
+    cognitive = defaultdict(lambda: [0, 0])  # 점수 합, 횟수
+    for user_id, score in (
+        CognitiveResult.objects.filter(**id_range)
+        .values_list("user_id", "score")
+        .iterator(chunk_size=chunk_size)
+    ):
+        totals = cognitive[user_id]
+        totals[0] += score or 0
+        totals[1] += 1
+
+    # 유저별 최신 직업 설문 (DISTINCT ON)
+    latest_jobs = (
+        JobSurvey.objects.filter(**id_range)
+        .order_by("user_id", "-created_at")
+        .distinct("user_id")
+        .values_list("user_id", "cognitive_type", "work_time_pattern")
+    )
+    jobs = {user_id: job for user_id, *job in latest_jobs}
+
+    year = timezone.localdate().year
+    histograms = {}
+    users = (
+        User.objects.filter(user_id__in={*sleep, *cognitive})
+        .values_list("user_id", "birth_year", "gender", "mbti")
+        .iterator(chunk_size=chunk_size)
+    )
+    for user_id, birth_year, gender, mbti in users:
+        values = {}
+        if user_id in sleep:
+            minutes, score_sum, count = sleep[user_id]
+            values["sleep_duration"] = minutes / count
+            values["sleep_score"] = score_sum / count
+        if user_id in cognitive:
+            score_sum, count = cognitive[user_id]
+            values["cognitive_score"] = score_sum / count
+
+        cohorts = user_cohorts(
+            birth_year, gender, mbti, *jobs.get(user_id, (None, None)), year
+        )
+        for metric, value in values.items():
+            index = _bin_index(metric, value)
+            for dimension, cohort_value in cohorts:
+                key = (dimension, cohort_value, metric)
+                if key not in histograms:
+                    histograms[key] = np.zeros(
+                        COHORT_METRICS[metric][2], dtype=np.int64
+                    )
+                histograms[key][index] += 1
+    return histograms
+
+
+# 워커별 부분 히스토그램 합치기 (같은 코호트/지표는 도수 합)
+def merge_histograms(partials):
+    merged = {}
+    for partial in partials:
+        for key, counts in partial.items():
+            if key in merged:
+                merged[key] += counts
+            else:
+                merged[key] = counts.copy()
+    return merged
+
+
+# 유저 id를 batch_size명 단위 범위로 분할 [(first_id, last_id), ...]
+def user_id_ranges(batch_size):
+    ids = list(User.objects.order_by("user_id").values_list("user_id", flat=True))
+    return [
+        (ids[i], ids[min(i + batch_size, len(ids)) - 1])
+        for i in range(0, len(ids), batch_size)
+    ]
+
+
+# 전체 히스토그램 교체 저장 (조회 중에도 이전 또는 새 히스토그램 중 하나만 보이도록 한 트랜잭션)
+def save_cohort_histograms(histograms):
+    built_at = timezone.now()
+    objs = [
+        CohortHistogram(
+            dimension=dimension,
+            value=value,
+            metric=metric,
+            counts=counts.astype("<i8").tobytes(),
+            user_count=int(counts.sum()),
+            built_at=built_at,
+        )
+        for (dimension, value, metric), counts in sorted(histograms.items())
+    ]
+    with transaction.atomic():
+        CohortHistogram.objects.all().delete()
+        CohortHistogram.objects.bulk_create(objs)
+    return len(objs)
+
+
+# 히스토그램에서 value의 백분위 (구간 내부는 선형 보간, 인원이 적으면 None)
+def percentile_from_histogram(counts, metric, value):
+    total = counts.sum()
+    if total < MIN_COHORT_USERS:
+        return None
+    low, high, bins = COHORT_METRICS[metric]
+    position = min(max((value - low) / (high - low) * bins, 0.0), float(bins))
+    index = min(int(position), bins - 1)
+    below = counts[:index].sum() + counts[index] * (position - index)
+    return round(float(below / total * 100), 1)
+
+
+# 유저 누적 통계 → 지표별 본인 값 (기록이 없으면 None)
+def user_metric_values(lifetime):
+    if lifetime is None:
+        return dict.fromkeys(COHORT_METRICS)
+    return {
+        "sleep_duration": (
+            lifetime.total_sleep_minutes / lifetime.sleep_count
+            if lifetime.sleep_count
+            else None
+        ),
+        "sleep_score": (
+            lifetime.sleep_score_sum / lifetime.sleep_count
+            if lifetime.sleep_count
+            else None
+        ),
+        "cognitive_score": (
+            lifetime.cognitive_score_sum / lifetime.cognitive_count
+            if lifetime.cognitive_count
+            else None
+        ),
+    }
+
+
+# 마이페이지 코호트 백분위 (누적 통계/최신 직업 설문/히스토그램 조회 각 1회)
+def get_cohort_percentiles(user):
+    lifetime = UserLifetimeStats.objects.filter(pk=user.pk).first()
+    job = user.job_surveys.order_by("-created_at").first()
+    cohorts = user_cohorts(
+        user.birth_year,
+        user.gender,
+        user.mbti,
+        job.cognitive_type if job else None,
+        job.work_time_pattern if job else None,
+        timezone.localdate().year,
+    )
+
+    query = Q()
+    for dimension, value in cohorts:
+        query |= Q(dimension=dimension, value=value)
+    histograms = {
+        (h.dimension, h.value, h.metric): h
+        for h in CohortHistogram.objects.filter(query)
+    }
+
+    values = user_metric_values(lifetime)
+    metrics = []
+    for metric, value in values.items():
+        rows = []
+        for dimension, cohort_value in cohorts:
+            histogram = histograms.get((dimension, cohort_value, metric))
+            if histogram is None:
+                continue
+            counts = np.frombuffer(bytes(histogram.counts), dtype="<i8")
+            rows.append(
+                {
+                    "dimension": dimension,
+                    "value": cohort_value,
+                    "user_count": histogram.user_count,
+                    "percentile": (
+                        None
+                        if value is None
+                        else percentile_from_histogram(counts, metric, value)
+                    ),
+                }
+            )
+        metrics.append(
+            {
+                "metric": metric,
+                "value": None if value is None else round(value, 1),
+                "cohorts": rows,
+            }
+        )
+
+    return {
+        "built_at": max((h.built_at for h in histograms.values()), default=None),
+        "metrics": metrics,
+    }
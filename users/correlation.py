@@ -0,0 +1,236 @@
+# 유저별 수면-인지 상관 통계 (UserCorrelationStats)
+# 날짜 쌍 (수면일 d, 인지일 d + lag)을 하나의 표본으로 보고 Welford 방식으로 평균/편차 제곱합/편차 곱의 합을 누적
+# 일별 값이 바뀌면 기존 표본을 제거하고 새 표본을 추가 → 전체 기록을 다시 읽지 않고 O(1) 갱신
+from datetime import timedelta
+from math import sqrt
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from config.process_pool import run_in_process_pool
+
+from .lag_correlation import lag_correlation_table
+from .models import UserCorrelationStats, UserDailyStats
+from .series import fetch_history_matrix, series_from_matrix
+
+# 0: 같은 날, 1: 다음 날
+CORRELATION_LAGS = (0, 1)
+# 시차 교차 상관 최대 lag (일)
+MAX_CROSS_CORRELATION_LAG = 7
+# 수면 쪽 변수 (모델 필드 접두어)
+SLEEP_VARIABLES = ("sleep_minutes", "sleep_score")
+
+
+# 일별 집계 행 → {"sleep": (수면 시간, 수면 점수) 또는 None, "cognitive": 인지 점수 또는 None}
+def day_values(stats):
+    if stats is None:
+        return {"sleep": None, "cognitive": None}
+    return {
+        "sleep": (
+            (stats.sleep_minutes, stats.sleep_score or 0) if stats.has_sleep else None
+        ),
+        "cognitive": stats.cognitive_score,
+    }
+
+
+# 수면일 값 + 인지일 값 → 표본 (수면 값들..., 인지 점수), 한쪽이라도 없으면 None
+def _sample(sleep_day, cognitive_day):
+    if sleep_day["sleep"] is None or cognitive_day["cognitive"] is None:
+        return None
+    return (*sleep_day["sleep"], cognitive_day["cognitive"])
+
+
+# 표본 1개 추가
+def _add(stats, sample):
+    *xs, y = sample
+    stats.n += 1
+    dy = y - stats.cognitive_mean
+    stats.cognitive_mean += dy / stats.n
+    stats.cognitive_m2 += dy * (y - stats.cognitive_mean)
+    for name, x in zip(SLEEP_VARIABLES, xs):
+        mean = getattr(stats, f"{name}_mean")
+        dx = x - mean
+        mean += dx / stats.n
+        setattr(stats, f"{name}_mean", mean)
+        setattr(stats, f"{name}_m2", getattr(stats, f"{name}_m2") + dx * (x - mean))
+        setattr(
+            stats,
+            f"{name}_comoment",
+            getattr(stats, f"{name}_comoment") + dx * (y - stats.cognitive_mean),
+        )
+
+
+# 표본 1개 제거 (추가의 역연산)
+def _remove(stats, sample):
+    if stats.n <= 1:
+        _reset(stats)
+        return
+    *xs, y = sample
+    n = stats.n - 1
+    old_y_mean = stats.cognitive_mean
+    stats.cognitive_mean = (old_y_mean * stats.n - y) / n
+    stats.cognitive_m2 -= (y - stats.cognitive_mean) * (y - old_y_mean)
+    for name, x in zip(SLEEP_VARIABLES, xs):
+        old_mean = getattr(stats, f"{name}_mean")
+        mean = (old_mean * stats.n - x) / n
+        dx = x - mean
+        setattr(stats, f"{name}_mean", mean)
+        setattr(stats, f"{name}_m2", getattr(stats, f"{name}_m2") - dx * (x - old_mean))
+        setattr(
+            stats,
+            f"{name}_comoment",
+            getattr(stats, f"{name}_comoment") - dx * (y - old_y_mean),
+        )
+    stats.n = n
+
+
+def _reset(stats):
+    stats.n = 0
+    stats.cognitive_mean = stats.cognitive_m2 = 0.0
+    for name in SLEEP_VARIABLES:
+        setattr(stats, f"{name}_mean", 0.0)
+        setattr(stats, f"{name}_m2", 0.0)
+        setattr(stats, f"{name}_comoment", 0.0)
+
+
+# 일별 집계 전체로 상관 통계 재계산 (통계 행이 없는 기존 유저, 재집계 이후)
+def build_correlation_stats(user):
+    rows = UserDailyStats.objects.filter(user=user)
+    values = {stats.date: day_values(stats) for stats in rows}
+    empty = day_values(None)
+
+    results = []
+    for lag in CORRELATION_LAGS:
+        samples = [
+            sample
+            for day, sleep_day in values.items()
+            if (
+                sample := _sample(
+                    sleep_day, values.get(day + timedelta(days=lag), empty)
+                )
+            )
+        ]
+        stats = UserCorrelationStats(user=user, lag=lag)
+        if samples:
+            # 전체 표본은 2-pass로 계산 (증분 갱신 오차 누적 초기화)
+            matrix = np.array(samples, dtype=float)
+            means = matrix.mean(axis=0)
+            deviations = matrix - means
+            y = deviations[:, -1]
+            stats.n = len(samples)
+            stats.cognitive_mean = float(means[-1])
+            stats.cognitive_m2 = float(y @ y)
+            for i, name in enumerate(SLEEP_VARIABLES):
+                setattr(stats, f"{name}_mean", float(means[i]))
+                setattr(stats, f"{name}_m2", float(deviations[:, i] @ deviations[:, i]))
+                setattr(stats, f"{name}_comoment", float(deviations[:, i] @ y))
+        results.append(stats)
+
+    with transaction.atomic():
+        UserCorrelationStats.objects.filter(user=user).delete()
+        UserCorrelationStats.objects.bulk_create(results)
+    return results
+
+
+# 날짜 day의 일별 값이 바뀐 뒤 해당 날짜가 포함된 표본만 교체
+# previous: 변경 전 값 중 바뀐 항목 (sleep=(수면 시간, 수면 점수) 또는 None / cognitive=인지 점수 또는 None)
+def update_correlation_stats(user, day, **previous):
+    with transaction.atomic():
+        stats_by_lag = {
+            stats.lag: stats
+            for stats in UserCorrelationStats.objects.select_for_update().filter(
+                user=user
+            )
+        }
+        if len(stats_by_lag) < len(CORRELATION_LAGS):
+            build_correlation_stats(user)
+            return
+
+        lead = max(CORRELATION_LAGS)
+        rows = UserDailyStats.objects.filter(
+            user=user,
+            date__range=(day - timedelta(days=lead), day + timedelta(days=lead)),
+        )
+        new = {stats.date: day_values(stats) for stats in rows}
+        empty = day_values(None)
+        old = dict(new)
+        old[day] = {**new.get(day, empty), **previous}
+
+        for lag, stats in stats_by_lag.items():
+            offset = timedelta(days=lag)
+            # day가 수면일인 표본 + day가 인지일인 표본 (lag 0이면 같은 표본)
+            for sleep_day in {day, day - offset}:
+                cognitive_day = sleep_day + offset
+                before = _sample(
+                    old.get(sleep_day, empty), old.get(cognitive_day, empty)
+                )
+                after = _sample(
+                    new.get(sleep_day, empty), new.get(cognitive_day, empty)
+                )
+                if before == after:
+                    continue
+                if before is not None:
+                    _remove(stats, before)
+                if after is not None:
+                    _add(stats, after)
+            stats.save()
+
+
+# 상관계수/회귀 기울기 (표본 2개 미만이거나 분산이 0이면 None)
+def _coefficients(stats, name):
+    m2_x = getattr(stats, f"{name}_m2")
+    comoment = getattr(stats, f"{name}_comoment")
+    if stats.n < 2 or m2_x <= 0:
+        return {"r": None, "slope": None}
+    r = None
+    if stats.cognitive_m2 > 0:
+        r = round(max(-1.0, min(1.0, comoment / sqrt(m2_x * stats.cognitive_m2))), 4)
+    return {"r": r, "slope": round(comoment / m2_x, 4)}
+
+
+# 마이페이지 상관 분석 응답 (통계 행 조회 1회)
+def get_correlation_insights(user):
+    stats_by_lag = {stats.lag: stats for stats in user.correlation_stats.all()}
+    if len(stats_by_lag) < len(CORRELATION_LAGS):
+        stats_by_lag = {stats.lag: stats for stats in build_correlation_stats(user)}
+
+    def summary(stats):
+        return {
+            "n": stats.n,
+            "sleep_duration": _coefficients(stats, "sleep_minutes"),
+            "sleep_score": _coefficients(stats, "sleep_score"),
+        }
+
+    return {
+        "same_day": summary(stats_by_lag[0]),
+        "next_day": summary(stats_by_lag[1]),
+    }
+
+
+# 수면 → 0~7일 뒤 인지 점수 시차 교차 상관 (전체 기록 조회 1회)
+# 기록 기간이 길면 프로세스 풀에서 계산
+def get_lag_correlations(user, max_lag=MAX_CROSS_CORRELATION_LAG):
+    history = fetch_history_matrix(user)
+    if history is None:
+        return {
+            "start_date": None,
+            "end_date": None,
+            "lags": lag_correlation_table(
+                np.array([]), np.array([]), np.array([]), max_lag
+            ),
+        }
+
+    start_date, end_date, matrix = history
+    series = series_from_matrix(matrix)
+    args = (
+        series["sleep_minutes"],
+        series["sleep_score"],
+        series["cognitive_score"],
+        max_lag,
+    )
+    if len(matrix) >= settings.LAG_CORRELATION_POOL_MIN_DAYS:
+        table = run_in_process_pool(lag_correlation_table, *args)
+    else:
+        table = lag_correlation_table(*args)
+    return {"start_date": start_date, "end_date": end_date, "lags": table}
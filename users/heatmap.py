@@ -0,0 +1,105 @@
+# 유저별 연도 히트맵 (UserYearHeatmap)
+# 일별 점수를 1바이트(0~100, 255 = 기록 없음)로 양자화해 연도별 366바이트 배열로 보관
+# 기록 작성/수정 시 overlay()로 그날 바이트만 교체 → 조회 시 집계 없이 바이트 그대로 응답
+import calendar
+from datetime import date
+
+import numpy as np
+from django.db import connection
+
+from .models import UserDailyStats, UserYearHeatmap
+
+# 연중 최대 일수 (평년은 마지막 바이트를 항상 기록 없음으로 둠)
+HEATMAP_DAYS = 366
+MISSING = 255
+# 지표 (UserYearHeatmap 필드명)
+HEATMAP_METRICS = ("sleep_score", "cognitive_score")
+
+# 행이 없으면 생성, 있으면 해당 지표의 그날 바이트만 교체 (한 문장)
+# inserted: 새로 만든 행인지 (xmax = 0) → 그날 외 바이트는 비어 있으므로 일별 집계로 다시 채움
+PATCH_HEATMAP_SQL = """
+    INSERT INTO {table} AS heatmap (
+        user_id, year, sleep_score, cognitive_score, updated_at
+    )
+    VALUES (%s, %s, %s, %s, now())
+    ON CONFLICT (user_id, year) DO UPDATE
+    SET {metric} = overlay(heatmap.{metric} placing %s from %s for 1),
+        updated_at = now()
+    RETURNING (xmax = 0) AS inserted
+"""
+
+
+# 점수 → 1바이트 (없으면 255)
+def quantize(score):
+    if score is None:
+        return MISSING
+    return int(round(min(max(score, 0), 100)))
+
+
+def _empty():
+    return np.full(HEATMAP_DAYS, MISSING, dtype=np.uint8)
+
+
+# 연중 일자 기준 0부터 시작하는 바이트 위치
+def day_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+# 날짜 day의 지표 점수 반영 (기록 작성/수정 트랜잭션 안에서 호출)
+# 그해 행이 없던 경우(기능 도입 전 기록, 재집계 이후)는 일별 집계로 연도 전체 생성
+def patch_heatmap(user, day, metric, score):
+    value = quantize(score)
+    index = day_index(day)
+    arrays = {name: _empty() for name in HEATMAP_METRICS}
+    arrays[metric][index] = value
+
+    sql = PATCH_HEATMAP_SQL.format(table=UserYearHeatmap._meta.db_table, metric=metric)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [
+                user.pk,
+                day.year,
+                arrays["sleep_score"].tobytes(),
+                arrays["cognitive_score"].tobytes(),
+                bytes([value]),
+                index + 1,
+            ],
+        )
+        (inserted,) = cursor.fetchone()
+    if inserted:
+        build_year_heatmap(user, day.year)
+
+
+# 일별 집계로 연도 히트맵 생성 (히트맵이 없는 기존 유저, 재집계 이후, 기록이 있는 연도만 저장)
+def build_year_heatmap(user, year):
+    arrays = {name: _empty() for name in HEATMAP_METRICS}
+    rows = UserDailyStats.objects.filter(
+        user=user, date__range=(date(year, 1, 1), date(year, 12, 31))
+    )
+    for stats in rows:
+        index = day_index(stats.date)
+        if stats.has_sleep:
+            arrays["sleep_score"][index] = quantize(stats.sleep_score)
+        arrays["cognitive_score"][index] = quantize(stats.cognitive_score)
+
+    data = {name: array.tobytes() for name, array in arrays.items()}
+    if rows:
+        UserYearHeatmap.objects.update_or_create(user=user, year=year, defaults=data)
+    return data
+
+
+# 연도 히트맵 (행 조회 1회, 없으면 일별 집계로 생성)
+# 반환값: {"year", "days": 그해 일수, "missing": 255, "sleep_score": bytes, "cognitive_score": bytes}
+def get_year_heatmap(user, year):
+    heatmap = UserYearHeatmap.objects.filter(user=user, year=year).first()
+    if heatmap is None:
+        data = build_year_heatmap(user, year)
+    else:
+        data = {name: bytes(getattr(heatmap, name)) for name in HEATMAP_METRICS}
+    return {
+        "year": year,
+        "days": 366 if calendar.isleap(year) else 365,
+        "missing": MISSING,
+        **data,
+    }
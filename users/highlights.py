@@ -0,0 +1,182 @@
+# 유저별 연속 기록/최고·최저 기록일 인덱스 (UserHighlights)
+# 기록 작성/수정 시 해당 날짜만 반영 → 조회 시 전체 수면 기록/인지 결과를 다시 읽지 않음
+# 마지막 연속 구간보다 이전 날짜가 새로 생기거나 목록 안의 날짜 점수가 나빠지면 해당 항목만 DB에서 재계산
+import heapq
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from .models import UserDailyStats, UserHighlights
+
+# 최고/최저 기록일 보관 수
+TOP_K = 5
+# 인덱스 대상 ("sleep": 수면 기록, "cognitive": 인지 테스트)
+HIGHLIGHT_KINDS = ("sleep", "cognitive")
+
+
+def _sort_key(entry):
+    return entry["score"], entry["date"]
+
+
+# 새로 기록된 날 day로 연속 구간 연장 (마지막 구간 시작일 이전이면 False → 재계산 필요)
+def _extend(streak, day):
+    value = str(day)
+    if not streak:
+        streak.update(
+            start=value, end=value, longest=1, longest_start=value, longest_end=value
+        )
+        return True
+
+    start = date.fromisoformat(streak["start"])
+    end = date.fromisoformat(streak["end"])
+    if day < start:
+        return False
+    if day <= end:
+        return True
+    if day == end + timedelta(days=1):
+        end = day
+    else:
+        start = end = day
+    streak["start"], streak["end"] = str(start), str(end)
+
+    length = (end - start).days + 1
+    if length > streak["longest"]:
+        streak.update(longest=length, longest_start=str(start), longest_end=str(end))
+    return True
+
+
+def _streak_from_days(days):
+    streak = {}
+    for day in sorted(days):
+        _extend(streak, day)
+    return streak
+
+
+# day 점수 반영 후 상위/하위 k일 (목록에 있던 날짜가 나빠져 k+1번째를 알 수 없으면 None)
+def _rank(entries, day, score, largest):
+    value = str(day)
+    current = next((entry for entry in entries if entry["date"] == value), None)
+    if current is not None and len(entries) >= TOP_K:
+        worse = score < current["score"] if largest else score > current["score"]
+        if worse:
+            return None
+    candidates = [entry for entry in entries if entry["date"] != value]
+    candidates.append({"date": value, "score": score})
+    pick = heapq.nlargest if largest else heapq.nsmallest
+    return pick(TOP_K, candidates, key=_sort_key)
+
+
+# 종류별 기록 있는 날짜 + 점수 쿼리셋 (score: 수면 점수 / 그날 인지 테스트 평균)
+def _scored_days(user, kind):
+    rows = UserDailyStats.objects.filter(user=user)
+    if kind == "sleep":
+        return rows.filter(sleep_minutes__isnull=False).annotate(score=F("sleep_score"))
+    return rows.annotate(
+        test_count=F("srt_count") + F("pattern_count") + F("symbol_count"),
+        score=Cast(
+            F("srt_score_sum") + F("pattern_score_sum") + F("symbol_score_sum"),
+            FloatField(),
+        )
+        / F("test_count"),
+    ).filter(test_count__gt=0)
+
+
+# 상위/하위 k일 DB 재계산 (ORDER BY + LIMIT 조회 1회)
+def _ranked_days(user, kind, largest):
+    order = ("-score", "-date") if largest else ("score", "date")
+    return [
+        {"date": str(day), "score": round(score, 1)}
+        for day, score in _scored_days(user, kind)
+        .order_by(*order)
+        .values_list("date", "score")[:TOP_K]
+    ]
+
+
+# 연속 기록 DB 재계산 (기록 날짜 조회 1회)
+def _build_streak(user, kind):
+    return _streak_from_days(_scored_days(user, kind).values_list("date", flat=True))
+
+
+# 일별 집계 전체로 인덱스 생성 후 저장 (인덱스가 없는 기존 유저, 재집계 이후)
+def build_highlights(user):
+    scores = {kind: [] for kind in HIGHLIGHT_KINDS}
+    for stats in UserDailyStats.objects.filter(user=user):
+        if stats.has_sleep:
+            scores["sleep"].append(
+                {"date": str(stats.date), "score": stats.sleep_score}
+            )
+        if stats.cognitive_score is not None:
+            scores["cognitive"].append(
+                {"date": str(stats.date), "score": stats.cognitive_score}
+            )
+
+    defaults = {}
+    for kind, entries in scores.items():
+        defaults[f"{kind}_streak"] = _streak_from_days(
+            date.fromisoformat(entry["date"]) for entry in entries
+        )
+        defaults[f"best_{kind}_days"] = heapq.nlargest(TOP_K, entries, key=_sort_key)
+        defaults[f"worst_{kind}_days"] = heapq.nsmallest(TOP_K, entries, key=_sort_key)
+    highlights, _ = UserHighlights.objects.update_or_create(
+        user=user, defaults=defaults
+    )
+    return highlights
+
+
+# 날짜 day의 kind 점수가 바뀐 뒤 인덱스 갱신 (기록 작성/수정 트랜잭션 안에서 호출)
+# new_day: 그날 해당 종류의 첫 기록인지 (연속 기록은 첫 기록일 때만 연장)
+def update_highlights(user, day, kind, score, new_day):
+    with transaction.atomic():
+        row = UserHighlights.objects.select_for_update().filter(pk=user.pk).first()
+        if row is None:
+            build_highlights(user)
+            return
+
+        streak = getattr(row, f"{kind}_streak")
+        if new_day and not _extend(streak, day):
+            setattr(row, f"{kind}_streak", _build_streak(user, kind))
+
+        for prefix, largest in (("best", True), ("worst", False)):
+            field = f"{prefix}_{kind}_days"
+            ranked = _rank(getattr(row, field), day, score, largest)
+            if ranked is None:
+                ranked = _ranked_days(user, kind, largest)
+            setattr(row, field, ranked)
+        row.save()
+
+
+def _streak_summary(streak, today):
+    if not streak:
+        return {
+            "current": 0,
+            "longest": 0,
+            "longest_start": None,
+            "longest_end": None,
+        }
+    start = date.fromisoformat(streak["start"])
+    end = date.fromisoformat(streak["end"])
+    # 마지막 기록일이 어제 이전이면 현재 연속 기록은 끊김
+    current = (end - start).days + 1 if end >= today - timedelta(days=1) else 0
+    return {
+        "current": current,
+        "longest": streak["longest"],
+        "longest_start": streak["longest_start"],
+        "longest_end": streak["longest_end"],
+    }
+
+
+# 마이페이지 하이라이트 응답 (인덱스 행 조회 1회, 없으면 생성)
+def get_highlights(user, today):
+    highlights = UserHighlights.objects.filter(pk=user.pk).first()
+    if highlights is None:
+        highlights = build_highlights(user)
+    return {
+        "sleep_streak": _streak_summary(highlights.sleep_streak, today),
+        "cognitive_streak": _streak_summary(highlights.cognitive_streak, today),
+        "best_sleep_days": highlights.best_sleep_days,
+        "worst_sleep_days": highlights.worst_sleep_days,
+        "best_cognitive_days": highlights.best_cognitive_days,
+        "worst_cognitive_days": highlights.worst_cognitive_days,
+    }
@@ -0,0 +1,62 @@
+# 수면 → 인지 점수 시차(lag) 교차 상관 (순수 NumPy 계산)
+# 프로세스 풀 워커에서도 실행되므로 Django 모델/설정을 import하지 않음
+import numpy as np
+
+# 상관계수를 계산할 최소 표본 수
+MIN_SAMPLES = 3
+
+
+# x: (변수 수, 일수) 수면 쪽 일별 값, y: (일수,) 일별 인지 점수 (기록 없는 날은 nan)
+# 반환값: (r, n) 각각 (변수 수, max_lag + 1), r[v, k] = corr(x[v, t], y[t + k])
+def lagged_pearson(x, y, max_lag):
+    days = len(y)
+    # shifted[k, t] = y[t + k] (범위 밖은 nan) → 모든 lag을 한 번에 계산
+    padded = np.concatenate([y, np.full(max_lag, np.nan)])
+    shifted = np.lib.stride_tricks.sliding_window_view(padded, days)[: max_lag + 1]
+
+    xs = x[:, None, :]
+    ys = shifted[None, :, :]
+    mask = ~np.isnan(xs) & ~np.isnan(ys)
+    n = mask.sum(axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.where(mask, xs, 0.0).sum(axis=-1) / n
+        mean_y = np.where(mask, ys, 0.0).sum(axis=-1) / n
+        dx = np.where(mask, xs - mean_x[..., None], 0.0)
+        dy = np.where(mask, ys - mean_y[..., None], 0.0)
+        r = (dx * dy).sum(axis=-1) / np.sqrt(
+            (dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1)
+        )
+
+    r[(n < MIN_SAMPLES) | ~np.isfinite(r)] = np.nan
+    return r, n
+
+
+# 응답용 lag별 결과 목록
+# threshold: 무상관 가정 시 95% 신뢰 구간 근사값 (|r|이 이보다 크면 유의한 상관으로 볼 수 있음)
+def lag_correlation_table(sleep_minutes, sleep_score, cognitive_score, max_lag):
+    r, n = lagged_pearson(
+        np.vstack([sleep_minutes, sleep_score]), cognitive_score, max_lag
+    )
+    rounded = np.round(r, 4)
+    table = []
+    for lag in range(max_lag + 1):
+        samples = int(n[0, lag])
+        table.append(
+            {
+                "lag": lag,
+                "n": samples,
+                "sleep_duration_r": (
+                    None if np.isnan(rounded[0, lag]) else float(rounded[0, lag])
+                ),
+                "sleep_score_r": (
+                    None if np.isnan(rounded[1, lag]) else float(rounded[1, lag])
+                ),
+                "threshold": (
+                    round(1.96 / np.sqrt(samples), 4)
+                    if samples >= MIN_SAMPLES
+                    else None
+                ),
+            }
+        )
+    return table
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.process_pool import django_process_pool
+from users.cohorts import (
+    build_partial_histograms,
+    merge_histograms,
+    save_cohort_histograms,
+    user_id_ranges,
+)
+
+
+# 코호트별 지표 히스토그램 생성 (매일 밤 cron 등으로 실행)
+class Command(BaseCommand):
+    help = "유저 코호트별 수면/인지 지표 히스토그램을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.ANALYSIS_POOL_WORKERS,
+            help="프로세스 풀 워커 수 (0이면 현재 프로세스에서 실행)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000, help="워커 작업당 유저 수"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=2000, help="서버 측 커서 fetch 크기"
+        )
+
+    def handle(self, *args, **options):
+        ranges = user_id_ranges(options["batch_size"])
+        chunk_size = options["chunk_size"]
+
+        if options["workers"] > 0 and len(ranges) > 1:
+            with django_process_pool(options["workers"]) as pool:
+                partials = pool.map(
+                    build_partial_histograms,
+                    *zip(*ranges),
+                    [chunk_size] * len(ranges),
+                )
+                histograms = merge_histograms(partials)
+        else:
+            histograms = merge_histograms(
+                build_partial_histograms(first_id, last_id, chunk_size)
+                for first_id, last_id in ranges
+            )
+
+        count = save_cohort_histograms(histograms)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"유저 범위 {len(ranges)}개, 히스토그램 {count}건 생성 완료"
+            )
+        )
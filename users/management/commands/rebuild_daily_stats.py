@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.stats import rebuild_daily_stats
+
+
+# 마이페이지 일별 집계 테이블 일괄 재생성
+class Command(BaseCommand):
+    help = "원본 수면/인지 기록으로 UserDailyStats를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids", help="대상 유저 id"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_stats(
+            user_ids=options["user_ids"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"일별 집계 {count}건 재생성 완료"))
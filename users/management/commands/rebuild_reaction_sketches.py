@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.reaction_sketch import rebuild_reaction_sketches
+
+
+# SRT 반응 시간 스케치 일괄 재생성 (기능 도입 전 결과 반영용)
+class Command(BaseCommand):
+    help = "SRT 결과의 reaction_list로 UserReactionSketch를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids", help="대상 유저 id"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_reaction_sketches(
+            user_ids=options["user_ids"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"반응 시간 스케치 {count}건 재생성 완료"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from users.sleep_debt import rebuild_sleep_debts
+
+
+# 수면 기록의 7/14일 수면 빚 일괄 재계산 (기능 도입 전 기록 반영용)
+class Command(BaseCommand):
+    help = (
+        "목표 수면 시간 기준으로 SleepRecord 수면 빚과 최신 수면 빚을 다시 계산합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids", help="대상 유저 id"
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_sleep_debts(user_ids=options["user_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"수면 기록 {count}건 수면 빚 재계산 완료")
+        )
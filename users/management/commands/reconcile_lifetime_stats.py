@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from users.stats import reconcile_lifetime_stats
+
+
+# 마이페이지 누적 통계 drift 검사 및 복구
+class Command(BaseCommand):
+    help = "원본 수면/인지 기록과 UserLifetimeStats를 비교해 차이를 복구합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids", help="대상 유저 id"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="복구하지 않고 차이만 출력"
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_lifetime_stats(
+            user_ids=options["user_ids"], dry_run=options["dry_run"]
+        )
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("누적 통계 차이 없음"))
+            return
+
+        action = "발견" if options["dry_run"] else "복구"
+        self.stdout.write(
+            self.style.WARNING(
+                f"누적 통계 차이 {len(drifted)}건 {action}: "
+                + ", ".join(map(str, drifted))
+            )
+        )
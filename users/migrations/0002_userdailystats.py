@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserDailyStats",
+            fields=[
+                (
+                    "daily_stats_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                ("date", models.DateField()),
+                ("sleep_minutes", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "sleep_score",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("srt_score_sum", models.IntegerField(default=0)),
+                ("srt_count", models.PositiveIntegerField(default=0)),
+                ("pattern_score_sum", models.IntegerField(default=0)),
+                ("pattern_count", models.PositiveIntegerField(default=0)),
+                ("symbol_score_sum", models.IntegerField(default=0)),
+                ("symbol_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "date"), name="unique_user_daily_stats"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_userdailystats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserLifetimeStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="lifetime_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("total_sleep_minutes", models.BigIntegerField(default=0)),
+                ("sleep_score_sum", models.BigIntegerField(default=0)),
+                ("sleep_count", models.PositiveIntegerField(default=0)),
+                ("cognitive_score_sum", models.BigIntegerField(default=0)),
+                ("cognitive_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:37
+
+import django.core.validators
+from django.db import migrations, models
+
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_userlifetimestats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="day_cutover_hour",
+            field=models.PositiveSmallIntegerField(
+                default=0, validators=[django.core.validators.MaxValueValidator(23)]
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="time_zone",
+            field=models.CharField(
+                default="Asia/Seoul",
+                max_length=64,
+                validators=[users.models.validate_timezone],
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_userprefixsums"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCorrelationStats",
+            fields=[
+                (
+                    "correlation_stats_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                ("lag", models.PositiveSmallIntegerField()),
+                ("n", models.PositiveIntegerField(default=0)),
+                ("sleep_minutes_mean", models.FloatField(default=0)),
+                ("sleep_score_mean", models.FloatField(default=0)),
+                ("cognitive_mean", models.FloatField(default=0)),
+                ("sleep_minutes_m2", models.FloatField(default=0)),
+                ("sleep_score_m2", models.FloatField(default=0)),
+                ("cognitive_m2", models.FloatField(default=0)),
+                ("sleep_minutes_comoment", models.FloatField(default=0)),
+                ("sleep_score_comoment", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="correlation_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "lag"), name="unique_user_correlation_lag"
+                    )
+                ],
+            },
+        ),
+    ]
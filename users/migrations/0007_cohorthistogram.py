@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_usercorrelationstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CohortHistogram",
+            fields=[
+                (
+                    "cohort_histogram_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                ("dimension", models.CharField(max_length=30)),
+                ("value", models.CharField(blank=True, max_length=30)),
+                ("metric", models.CharField(max_length=30)),
+                ("counts", models.BinaryField()),
+                ("user_count", models.PositiveIntegerField(default=0)),
+                ("built_at", models.DateTimeField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "value", "metric"),
+                        name="unique_cohort_histogram",
+                    )
+                ],
+            },
+        ),
+    ]
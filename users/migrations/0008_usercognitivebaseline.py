@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_cohorthistogram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCognitiveBaseline",
+            fields=[
+                (
+                    "cognitive_baseline_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                ("test_kind", models.CharField(max_length=10)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("ewma_mean", models.FloatField(default=0)),
+                ("ewma_var", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cognitive_baselines",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "test_kind"),
+                        name="unique_user_cognitive_baseline",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_usercognitivebaseline"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserReactionSketch",
+            fields=[
+                (
+                    "reaction_sketch_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                ("date", models.DateField()),
+                ("test_kind", models.CharField(max_length=10)),
+                ("counts", models.BinaryField()),
+                ("trial_count", models.PositiveIntegerField(default=0)),
+                ("lapse_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reaction_sketches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "date", "test_kind"),
+                        name="unique_user_reaction_sketch",
+                    )
+                ],
+            },
+        ),
+    ]
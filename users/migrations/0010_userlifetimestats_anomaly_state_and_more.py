@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0009_userreactionsketch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userlifetimestats",
+            name="anomaly_state",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="userlifetimestats",
+            name="recent_alerts",
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0010_userlifetimestats_anomaly_state_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserHighlights",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="highlights",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("sleep_streak", models.JSONField(default=dict)),
+                ("cognitive_streak", models.JSONField(default=dict)),
+                ("best_sleep_days", models.JSONField(default=list)),
+                ("worst_sleep_days", models.JSONField(default=list)),
+                ("best_cognitive_days", models.JSONField(default=list)),
+                ("worst_cognitive_days", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
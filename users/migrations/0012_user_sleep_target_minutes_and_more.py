@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_userhighlights"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="sleep_target_minutes",
+            field=models.PositiveSmallIntegerField(
+                default=480,
+                validators=[
+                    django.core.validators.MinValueValidator(60),
+                    django.core.validators.MaxValueValidator(960),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="userlifetimestats",
+            name="sleep_debt_14",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="userlifetimestats",
+            name="sleep_debt_7",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="userlifetimestats",
+            name="sleep_debt_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
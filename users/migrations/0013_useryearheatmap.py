@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0012_user_sleep_target_minutes_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserYearHeatmap",
+            fields=[
+                ("heatmap_id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("year", models.PositiveSmallIntegerField()),
+                ("sleep_score", models.BinaryField()),
+                ("cognitive_score", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="heatmaps",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "year"), name="unique_user_year_heatmap"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# users.sleep_debt.REBUILD_SLEEP_DEBT_SQL과 동일 (마이그레이션은 앱 코드 변경과 무관하게 고정)
+# 기록별 최근 7/14일 (목표 - 수면 시간) 합계, 유저별 날짜 창 윈도 함수 1회
+REBUILD_SLEEP_DEBT_SQL = """
+    UPDATE {records} AS record
+    SET sleep_debt_7 = windowed.debt_7, sleep_debt_14 = windowed.debt_14
+    FROM (
+        SELECT night.sleep_record_id,
+            SUM(sleeper.sleep_target_minutes - night.sleep_duration) OVER (
+                PARTITION BY night.user_id ORDER BY night.date
+                RANGE BETWEEN INTERVAL '6 days' PRECEDING AND CURRENT ROW
+            ) AS debt_7,
+            SUM(sleeper.sleep_target_minutes - night.sleep_duration) OVER (
+                PARTITION BY night.user_id ORDER BY night.date
+                RANGE BETWEEN INTERVAL '13 days' PRECEDING AND CURRENT ROW
+            ) AS debt_14
+        FROM {records} AS night
+        JOIN {users} AS sleeper ON sleeper.user_id = night.user_id
+    ) AS windowed
+    WHERE record.sleep_record_id = windowed.sleep_record_id
+"""
+
+
+# 기존 수면 기록의 수면 빚 + 누적 통계의 최신 수면 빚 채우기
+# 컬럼 기본값 0에서 시작하면 이후 증분 보정이 잘못된 기준값 위에 쌓이므로 배포 시 1회 재계산
+def backfill_sleep_debt(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserLifetimeStats = apps.get_model("users", "UserLifetimeStats")
+    SleepRecord = apps.get_model("sleep_record", "SleepRecord")
+
+    sql = REBUILD_SLEEP_DEBT_SQL.format(
+        records=SleepRecord._meta.db_table, users=User._meta.db_table
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(sql)
+
+    # 유저별 마지막 수면 기록 (DISTINCT ON)
+    latest = SleepRecord.objects.order_by("user_id", "-date").distinct("user_id")
+    for user_id, day, debt_7, debt_14 in latest.values_list(
+        "user_id", "date", "sleep_debt_7", "sleep_debt_14"
+    ):
+        UserLifetimeStats.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                "sleep_debt_date": day,
+                "sleep_debt_7": debt_7,
+                "sleep_debt_14": debt_14,
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0013_useryearheatmap"),
+        ("sleep_record", "0006_sleeprecord_sleep_debt_14_sleeprecord_sleep_debt_7"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sleep_debt, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Any
+from zoneinfo import available_timezones
 
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -9,6 +10,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
@@ -22,6 +24,12 @@ def validate_birth_year(value):
         raise ValidationError(f"1900년부터 {current_year}년 사이로 입력해주세요.")
 
 
+# 타임존 유효성 검사용 함수 (time_zone에 사용)
+def validate_timezone(value):
+    if value not in available_timezones():
+        raise ValidationError(f"지원하지 않는 타임존입니다: {value}")
+
+
 # User ENUM 필드 (선택지 제한용)
 class SocialType(models.TextChoices):
     KAKAO = "KAKAO"
@@ -84,8 +92,28 @@ class WorkTimePattern(models.TextChoices):
     NO_SCHEDULE = "no_schedule", "일정 없음 / 학생 / 주부 등"
 
 
+# 근무 패턴별 하루 기준 시각 (이 시각 이전 기록은 전날로 집계)
+# 야간 근무자는 퇴근 후 새벽/오전 검사가 전날 기록으로 묶이도록 정오 기준
+DEFAULT_DAY_CUTOVER_HOURS = {
+    WorkTimePattern.SHIFT_NIGHT: 12,
+}
+
+
 # 커스텀 유저 매니저
-class CustomUserManager(BaseUserManager["User"]):
+# 일괄 수정(update/bulk_update)은 post_save 시그널이 없으므로 인증 유저 캐시를 직접 무효화
+class UserQuerySet(models.QuerySet["User"]):
+    def update(self, **kwargs: Any) -> int:
+        # users.services → users.models 순환 import 방지
+        from .services import user_cache
+
+        user_ids = list(self.values_list("pk", flat=True))
+        count = super().update(**kwargs)
+        for user_id in user_ids:
+            user_cache.invalidate(user_id)
+        return count
+
+
+class CustomUserManager(BaseUserManager.from_queryset(UserQuerySet)):  # type: ignore[misc]
     # 일반 사용자
     def create_user(
         self, email: str, social_type: str, social_id: str, **extra_fields: Any
@@ -135,6 +163,17 @@ class User(AbstractBaseUser, PermissionsMixin):
         max_length=10, choices=MBTIType.choices, null=True, blank=True
     )  # 시리얼라이저에서 null로 변환 처리
     joined_at = models.DateTimeField(default=timezone.now)
+    # 날짜별 집계 기준 (유저 로컬 타임존 + 하루 기준 시각)
+    time_zone = models.CharField(
+        max_length=64, default="Asia/Seoul", validators=[validate_timezone]
+    )
+    day_cutover_hour = models.PositiveSmallIntegerField(
+        default=0, validators=[MaxValueValidator(23)]
+    )
+    # 목표 수면 시간(분, 수면 빚 계산 기준)
+    sleep_target_minutes = models.PositiveSmallIntegerField(
+        default=480, validators=[MinValueValidator(60), MaxValueValidator(960)]
+    )
     last_login_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
     has_completed_onboarding = models.BooleanField(default=False)
@@ -153,6 +192,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return f"{self.nickname} - {self.email} / {self.social_type}"
 
+    # 인증 캐시로 만든 유저(일부 필드만 로드)는 지연 필드 첫 접근 시 나머지 필드를 한 번에 조회
+    def refresh_from_db(
+        self, using: str | None = None, fields: Any = None, **kwargs: Any
+    ) -> None:
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
     # 소셜 타입 + 소셜 아이디 유니크 조합 설정
     class Meta:
         constraints = [
@@ -187,3 +235,246 @@ class JobSurvey(models.Model):
         return (
             f"{self.user.nickname} - {self.cognitive_type} / {self.work_time_pattern}"
         )
+
+
+# 마이페이지 일별 집계 (유저별 하루 1행, 기록 조회 API 전용 읽기 모델)
+class UserDailyStats(models.Model):
+    daily_stats_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    # 수면 기록 (해당 날짜 기록이 없으면 null)
+    sleep_minutes = models.PositiveIntegerField(null=True, blank=True)
+    sleep_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    # 인지 테스트별 점수 합계/횟수 (평균은 합계/횟수로 계산)
+    srt_score_sum = models.IntegerField(default=0)
+    srt_count = models.PositiveIntegerField(default=0)
+    pattern_score_sum = models.IntegerField(default=0)
+    pattern_count = models.PositiveIntegerField(default=0)
+    symbol_score_sum = models.IntegerField(default=0)
+    symbol_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # 유저 + 날짜 유니크 (기간 조회 시 인덱스 범위 스캔으로 사용)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="unique_user_daily_stats"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.date}"
+
+    @property
+    def has_sleep(self) -> bool:
+        return self.sleep_minutes is not None
+
+    @property
+    def cognitive_count(self) -> int:
+        return self.srt_count + self.pattern_count + self.symbol_count
+
+    # 해당 날짜 전체 인지 테스트 점수 평균 (3종 결과를 모두 합산)
+    @property
+    def cognitive_score(self) -> float | None:
+        count = self.cognitive_count
+        if not count:
+            return None
+        total = self.srt_score_sum + self.pattern_score_sum + self.symbol_score_sum
+        return round(total / count, 1)
+
+
+# 마이페이지 메인 누적 통계 (유저당 1행, 기록 작성/수정 시 F 표현식으로 갱신)
+class UserLifetimeStats(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="lifetime_stats"
+    )
+    total_sleep_minutes = models.BigIntegerField(default=0)
+    sleep_score_sum = models.BigIntegerField(default=0)
+    sleep_count = models.PositiveIntegerField(default=0)
+    cognitive_score_sum = models.BigIntegerField(default=0)
+    cognitive_count = models.PositiveIntegerField(default=0)
+    # 이상 탐지 상태 {지표: [반영 수, 지수 가중 평균, 지수 가중 분산]} (users.anomaly)
+    anomaly_state = models.JSONField(default=dict)
+    # 최근 이상 알림 [{date, metric, value, z_score}, ...] (오래된 순, 최대 10건)
+    recent_alerts = models.JSONField(default=list)
+    # 마지막 수면 기록일 기준 최근 7/14일 수면 빚(분) (users.sleep_debt)
+    sleep_debt_date = models.DateField(null=True, blank=True)
+    sleep_debt_7 = models.IntegerField(default=0)
+    sleep_debt_14 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - 누적 통계"
+
+    @property
+    def average_sleep_score(self) -> float:
+        if not self.sleep_count:
+            return 0.0
+        return round(self.sleep_score_sum / self.sleep_count, 1)
+
+    @property
+    def average_cognitive_score(self) -> float:
+        if not self.cognitive_count:
+            return 0.0
+        return round(self.cognitive_score_sum / self.cognitive_count, 1)
+
+
+# 유저별 일별 집계 누적합 인덱스 (임의 기간 합계/평균을 두 행 차이로 계산)
+# sums: float64 (일수 + 1) x PREFIX_SUM_COLUMNS 배열의 바이트, 행 i = origin부터 i일 전까지의 누적합
+class UserPrefixSums(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="prefix_sums"
+    )
+    # 일 오프셋 기준일 (가입일, 그 이전 기록이 있으면 가장 이른 기록일)
+    origin = models.DateField()
+    sums = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - 누적합 인덱스"
+
+
+# 유저별 수면-인지 상관 통계 (Welford 방식 평균/분산/공분산, 기록 작성/수정 시 증분 갱신)
+# lag 0: 같은 날 수면 → 같은 날 인지 점수, lag 1: 수면 → 다음 날 인지 점수
+class UserCorrelationStats(models.Model):
+    correlation_stats_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="correlation_stats"
+    )
+    lag = models.PositiveSmallIntegerField()
+    # 수면 기록과 인지 점수가 모두 있는 날짜 쌍의 수
+    n = models.PositiveIntegerField(default=0)
+    sleep_minutes_mean = models.FloatField(default=0)
+    sleep_score_mean = models.FloatField(default=0)
+    cognitive_mean = models.FloatField(default=0)
+    # 편차 제곱합 (분산 = m2 / (n - 1))
+    sleep_minutes_m2 = models.FloatField(default=0)
+    sleep_score_m2 = models.FloatField(default=0)
+    cognitive_m2 = models.FloatField(default=0)
+    # 수면 값과 인지 점수의 편차 곱의 합 (공분산 = comoment / (n - 1))
+    sleep_minutes_comoment = models.FloatField(default=0)
+    sleep_score_comoment = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "lag"], name="unique_user_correlation_lag"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - 상관 통계 (lag {self.lag})"
+
+
+# 코호트(연령대/성별/MBTI/직업 유형 등)별 지표 히스토그램 (야간 배치로 생성, 백분위 조회 전용)
+# counts: int64 고정 구간 도수 배열의 바이트 (구간 정의는 users.cohorts.COHORT_METRICS)
+class CohortHistogram(models.Model):
+    cohort_histogram_id = models.BigAutoField(primary_key=True)
+    dimension = models.CharField(max_length=30)
+    value = models.CharField(max_length=30, blank=True)
+    metric = models.CharField(max_length=30)
+    counts = models.BinaryField()
+    user_count = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "value", "metric"],
+                name="unique_cohort_histogram",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.dimension}={self.value} - {self.metric}"
+
+
+# 유저별 인지 테스트 개인 기준선 (지수 가중 이동 평균/분산, 결과 저장 시 O(1) 갱신)
+class UserCognitiveBaseline(models.Model):
+    cognitive_baseline_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="cognitive_baselines"
+    )
+    test_kind = models.CharField(max_length=10)
+    # 반영된 결과 수
+    count = models.PositiveIntegerField(default=0)
+    ewma_mean = models.FloatField(default=0)
+    ewma_var = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "test_kind"], name="unique_user_cognitive_baseline"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.test_kind} 기준선"
+
+
+# 유저별 일별 반응 시간 분포 스케치 (고정 로그 구간 도수, 구간별 합으로 기간 병합)
+# counts: uint32 구간 도수 배열의 바이트 (구간 정의는 users.reaction_sketch)
+class UserReactionSketch(models.Model):
+    reaction_sketch_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="reaction_sketches"
+    )
+    date = models.DateField()
+    test_kind = models.CharField(max_length=10)
+    counts = models.BinaryField()
+    # 시행 수 / 반응 지연(lapse) 시행 수
+    trial_count = models.PositiveIntegerField(default=0)
+    lapse_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date", "test_kind"], name="unique_user_reaction_sketch"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.date} {self.test_kind} 반응 시간"
+
+
+# 유저별 연속 기록/최고·최저 기록일 인덱스 (기록 작성/수정 시 증분 갱신, users.highlights)
+class UserHighlights(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="highlights"
+    )
+    # 연속 기록 {"start", "end": 마지막 연속 구간, "longest", "longest_start", "longest_end"}
+    sleep_streak = models.JSONField(default=dict)
+    cognitive_streak = models.JSONField(default=dict)
+    # 점수 상위/하위 k일 [{"date", "score"}, ...] (좋은/나쁜 순)
+    best_sleep_days = models.JSONField(default=list)
+    worst_sleep_days = models.JSONField(default=list)
+    best_cognitive_days = models.JSONField(default=list)
+    worst_cognitive_days = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - 하이라이트"
+
+
+# 유저별 연도별 히트맵 (일별 점수를 0~100으로 양자화한 366바이트 배열, 255 = 기록 없음)
+# 바이트 위치 = 연중 일자 - 1, 기록 작성/수정 시 overlay()로 해당 바이트만 교체 (users.heatmap)
+class UserYearHeatmap(models.Model):
+    heatmap_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="heatmaps")
+    year = models.PositiveSmallIntegerField()
+    sleep_score = models.BinaryField()
+    cognitive_score = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "year"], name="unique_user_year_heatmap"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.year} 히트맵"
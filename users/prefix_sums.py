@@ -0,0 +1,176 @@
+# 유저별 일별 집계 누적합 인덱스 (UserPrefixSums)
+# prefix[i] = origin부터 i일 전까지 일별 값의 합 → [a, b] 기간 합계 = prefix[b + 1] - prefix[a]
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+
+from .models import UserDailyStats, UserPrefixSums
+from .utils import bucket_of, to_local_date
+
+# 누적합 열 (일별 값 기준, 모두 정수라 증분 갱신을 반복해도 float64 오차 없음)
+PREFIX_SUM_COLUMNS = (
+    "sleep_minutes",  # 수면 시간(분)
+    "sleep_score",  # 수면 점수
+    "sleep_days",  # 수면 기록 여부 (0/1)
+    "cognitive_score_sum",  # 인지 테스트 점수 합
+    "cognitive_count",  # 인지 테스트 횟수
+    "cognitive_daily_score_x10",  # 일별 인지 평균 점수 x 10 (소수 첫째 자리까지 정수로 보관)
+    "cognitive_days",  # 인지 기록 여부 (0/1)
+)
+WIDTH = len(PREFIX_SUM_COLUMNS)
+
+
+# 일별 집계 행 1개 → 누적합 열 순서의 값 벡터 (행이 없으면 0)
+def daily_vector(stats):
+    if stats is None:
+        return np.zeros(WIDTH)
+    cognitive_score = stats.cognitive_score
+    return np.array(
+        [
+            stats.sleep_minutes or 0,
+            (stats.sleep_score or 0) if stats.has_sleep else 0,
+            1 if stats.has_sleep else 0,
+            stats.srt_score_sum + stats.pattern_score_sum + stats.symbol_score_sum,
+            stats.cognitive_count,
+            round((cognitive_score or 0) * 10),
+            1 if cognitive_score is not None else 0,
+        ],
+        dtype=float,
+    )
+
+
+def _load(row):
+    return np.frombuffer(bytes(row.sums), dtype="<f8").reshape(-1, WIDTH).copy()
+
+
+def _dump(prefix):
+    return prefix.astype("<f8").tobytes()
+
+
+# 일별 집계 전체로 인덱스 생성 후 저장 (인덱스가 없거나 기준일 이전 기록이 생긴 경우)
+def build_prefix_sums(user):
+    rows = list(UserDailyStats.objects.filter(user=user).order_by("date"))
+    origin = to_local_date(user, user.joined_at)
+    if rows:
+        origin = min(origin, rows[0].date)
+    last = rows[-1].date if rows else origin
+
+    daily = np.zeros(((last - origin).days + 1, WIDTH))
+    for stats in rows:
+        daily[(stats.date - origin).days] = daily_vector(stats)
+    prefix = np.zeros((len(daily) + 1, WIDTH))
+    np.cumsum(daily, axis=0, out=prefix[1:])
+
+    UserPrefixSums.objects.update_or_create(
+        user=user, defaults={"origin": origin, "sums": _dump(prefix)}
+    )
+    return origin, prefix
+
+
+# 특정 날짜의 일별 집계가 바뀌었을 때 해당 날짜 이후 누적합만 보정
+def update_prefix_sums(user, day):
+    with transaction.atomic():
+        row = UserPrefixSums.objects.select_for_update().filter(pk=user.pk).first()
+        if row is None or day < row.origin:
+            build_prefix_sums(user)
+            return
+
+        prefix = _load(row)
+        offset = (day - row.origin).days
+        # 마지막 날짜 이후면 마지막 누적값을 반복해 배열 확장
+        if offset + 2 > len(prefix):
+            extra = np.repeat(prefix[-1:], offset + 2 - len(prefix), axis=0)
+            prefix = np.vstack([prefix, extra])
+
+        # 새 일별 값 - 기존 일별 값(누적합 차이)을 이후 모든 누적합에 반영
+        stats = UserDailyStats.objects.filter(user=user, date=day).first()
+        delta = daily_vector(stats) - (prefix[offset + 1] - prefix[offset])
+        prefix[offset + 1 :] += delta
+
+        row.sums = _dump(prefix)
+        row.save(update_fields=["sums", "updated_at"])
+
+
+# 인덱스 조회 (없으면 생성)
+def load_prefix_sums(user):
+    row = UserPrefixSums.objects.filter(pk=user.pk).first()
+    if row is None:
+        return build_prefix_sums(user)
+    return row.origin, _load(row)
+
+
+# 여러 기간 [start, end]의 합계를 한 번에 계산 (인덱스 밖 날짜는 0으로 취급)
+def range_totals(origin, prefix, ranges):
+    days = len(prefix) - 1
+    starts = np.array([(start - origin).days for start, _ in ranges], dtype=np.intp)
+    ends = np.array([(end - origin).days + 1 for _, end in ranges], dtype=np.intp)
+    starts = np.clip(starts, 0, days)
+    ends = np.maximum(np.clip(ends, 0, days), starts)
+    return prefix[ends] - prefix[starts]
+
+
+# 합계 벡터 → 총 수면시간/평균 수면점수/평균 인지점수 (구간 집계와 같은 반올림)
+def summarize(totals):
+    t = dict(zip(PREFIX_SUM_COLUMNS, totals.tolist()))
+    sleep_days = int(t["sleep_days"])
+    cognitive_days = int(t["cognitive_days"])
+    return {
+        "total_sleep_hours": round(t["sleep_minutes"] / 60, 1),
+        "sleep_days": sleep_days,
+        "average_sleep_score": (
+            round(t["sleep_score"] / sleep_days, 1) if sleep_days else 0
+        ),
+        "cognitive_days": cognitive_days,
+        "cognitive_test_count": int(t["cognitive_count"]),
+        # 일별 평균의 평균
+        "average_cognitive_score": (
+            round(t["cognitive_daily_score_x10"] / 10 / cognitive_days, 1)
+            if cognitive_days
+            else 0
+        ),
+    }
+
+
+# 임의 기간 통계 (인덱스 조회 1회 + 두 행 차이)
+def get_range_stats(user, start_date, end_date):
+    origin, prefix = load_prefix_sums(user)
+    totals = range_totals(origin, prefix, [(start_date, end_date)])[0]
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": (end_date - start_date).days + 1,
+        **summarize(totals),
+    }
+
+
+# 일/주/월/분기/연 구간 집계 (get_record_buckets와 같은 결과, 기록 없는 구간은 제외)
+def get_prefix_buckets(user, start_date, end_date, granularity):
+    bounds = []
+    day = start_date
+    while day <= end_date:
+        bucket_start, bucket_end, label = bucket_of(day, granularity)
+        bounds.append((bucket_start, bucket_end, label))
+        day = bucket_end + timedelta(days=1)
+
+    origin, prefix = load_prefix_sums(user)
+    # 구간 경계가 조회 기간 밖이면 조회 기간으로 자름
+    ranges = [(max(b[0], start_date), min(b[1], end_date)) for b in bounds]
+    results = []
+    for (bucket_start, bucket_end, label), totals in zip(
+        bounds, range_totals(origin, prefix, ranges)
+    ):
+        summary = summarize(totals)
+        if not summary["sleep_days"] and not summary["cognitive_days"]:
+            continue
+        results.append(
+            {
+                "label": label,
+                "start_date": bucket_start,
+                "end_date": bucket_end,
+                "total_sleep_hours": summary["total_sleep_hours"],
+                "average_sleep_score": summary["average_sleep_score"],
+                "average_cognitive_score": summary["average_cognitive_score"],
+            }
+        )
+    return results
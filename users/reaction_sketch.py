@@ -0,0 +1,151 @@
+# 유저별 반응 시간 분포 스케치 (UserReactionSketch)
+# 시행별 반응 시간을 고정 로그 구간(상대 오차 약 1%) 도수로 누적 → 날짜별 행을 구간별로 더하기만 하면 기간 병합
+# 조회 시 과거 reaction_list 문자열을 다시 파싱하지 않고 중앙값/p90/lapse 비율 계산
+import math
+
+import numpy as np
+from django.db import transaction
+
+from cognitive_statistics.models import CognitiveResultSRT, CognitiveTestKind
+
+from .models import UserReactionSketch
+
+# 로그 구간 범위 (ms, 범위 밖 값은 양 끝 구간에 포함) 및 구간 간 배율
+REACTION_MIN_MS = 50
+REACTION_MAX_MS = 10000
+REACTION_BIN_RATIO = 1.02
+REACTION_BINS = math.ceil(
+    math.log(REACTION_MAX_MS / REACTION_MIN_MS) / math.log(REACTION_BIN_RATIO)
+)
+# 이 시간 이상 걸린 시행은 반응 지연(lapse)으로 집계 (PVT 기준)
+LAPSE_THRESHOLD_MS = 500
+# 스케치를 저장하는 테스트 종류 (시행별 반응 시간이 있는 테스트)
+SKETCH_KINDS = (CognitiveTestKind.SRT, CognitiveTestKind.SYMBOL)
+
+
+# 반응 시간 목록 → (구간 도수 배열, 시행 수, lapse 수) (0 이하/비정상 값 제외)
+def sketch_counts(reaction_times):
+    times = np.asarray(reaction_times, dtype=float)
+    times = times[np.isfinite(times) & (times > 0)]
+    index = np.floor(
+        np.log(times / REACTION_MIN_MS) / math.log(REACTION_BIN_RATIO)
+    ).astype(np.intp)
+    counts = np.bincount(np.clip(index, 0, REACTION_BINS - 1), minlength=REACTION_BINS)
+    lapses = int(np.count_nonzero(times >= LAPSE_THRESHOLD_MS))
+    return counts.astype(np.uint32), len(times), lapses
+
+
+def _load(sketch):
+    return np.frombuffer(bytes(sketch.counts), dtype="<u4")
+
+
+# 결과 저장 시 해당 날짜 스케치에 시행별 반응 시간 추가 (결과 POST 트랜잭션 안에서 호출)
+def add_reaction_times(user, kind, day, reaction_times):
+    counts, trials, lapses = sketch_counts(reaction_times)
+    if not trials:
+        return
+    UserReactionSketch.objects.get_or_create(
+        user=user,
+        date=day,
+        test_kind=kind,
+        defaults={"counts": np.zeros(REACTION_BINS, dtype="<u4").tobytes()},
+    )
+    sketch = UserReactionSketch.objects.select_for_update().get(
+        user=user, date=day, test_kind=kind
+    )
+    sketch.counts = (_load(sketch) + counts).astype("<u4").tobytes()
+    sketch.trial_count += trials
+    sketch.lapse_count += lapses
+    sketch.save()
+
+
+# 구간 도수 → q 분위수 (구간의 기하 중앙값, ms)
+def quantile_from_counts(counts, q):
+    cumulative = np.cumsum(counts)
+    index = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+    return REACTION_MIN_MS * REACTION_BIN_RATIO ** (index + 0.5)
+
+
+# 기간 내 종류별 반응 시간 요약 (스케치 조회 1회, 날짜별 도수를 더해 병합)
+def get_reaction_time_summary(user, start_date, end_date):
+    merged = {kind: np.zeros(REACTION_BINS, dtype=np.uint64) for kind in SKETCH_KINDS}
+    trials = dict.fromkeys(SKETCH_KINDS, 0)
+    lapses = dict.fromkeys(SKETCH_KINDS, 0)
+    for sketch in UserReactionSketch.objects.filter(
+        user=user, date__range=(start_date, end_date)
+    ):
+        merged[sketch.test_kind] += _load(sketch)
+        trials[sketch.test_kind] += sketch.trial_count
+        lapses[sketch.test_kind] += sketch.lapse_count
+
+    results = []
+    for kind in SKETCH_KINDS:
+        count = trials[kind]
+        results.append(
+            {
+                "test_kind": kind,
+                "trial_count": count,
+                "median_ms": (
+                    round(quantile_from_counts(merged[kind], 0.5)) if count else None
+                ),
+                "p90_ms": (
+                    round(quantile_from_counts(merged[kind], 0.9)) if count else None
+                ),
+                "lapse_rate": round(lapses[kind] / count, 4) if count else None,
+            }
+        )
+    return {"start_date": start_date, "end_date": end_date, "results": results}
+
+
+# SRT 결과의 reaction_list 문자열 파싱 ("300,280,..." → [300.0, 280.0, ...])
+def parse_reaction_list(reaction_list):
+    times = []
+    for value in (reaction_list or "").split(","):
+        try:
+            times.append(float(value))
+        except ValueError:
+            continue
+    return times
+
+
+# 기존 SRT 결과로 스케치 재생성 (관리 명령어에서 사용, 심볼 결과는 시행별 시간이 저장되지 않아 제외)
+def rebuild_reaction_sketches(user_ids=None, batch_size=1000):
+    sketches = {}
+    results = CognitiveResultSRT.objects.all()
+    if user_ids:
+        results = results.filter(user_id__in=user_ids)
+    for user_id, day, reaction_list in results.values_list(
+        "user_id", "local_date", "reaction_list"
+    ).iterator(chunk_size=batch_size):
+        counts, trials, lapses = sketch_counts(parse_reaction_list(reaction_list))
+        if not trials:
+            continue
+        key = (user_id, day)
+        if key in sketches:
+            previous = sketches[key]
+            sketches[key] = (
+                previous[0] + counts,
+                previous[1] + trials,
+                previous[2] + lapses,
+            )
+        else:
+            sketches[key] = (counts, trials, lapses)
+
+    objs = [
+        UserReactionSketch(
+            user_id=user_id,
+            date=day,
+            test_kind=CognitiveTestKind.SRT,
+            counts=counts.astype("<u4").tobytes(),
+            trial_count=trials,
+            lapse_count=lapses,
+        )
+        for (user_id, day), (counts, trials, lapses) in sketches.items()
+    ]
+    with transaction.atomic():
+        stale = UserReactionSketch.objects.filter(test_kind=CognitiveTestKind.SRT)
+        if user_ids:
+            stale = stale.filter(user_id__in=user_ids)
+        stale.delete()
+        UserReactionSketch.objects.bulk_create(objs, batch_size=batch_size)
+    return len(objs)
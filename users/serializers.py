@@ -1,7 +1,8 @@
 from rest_framework import serializers
 
-from users.models import Gender, JobSurvey, MBTIType, User
+from users.models import DEFAULT_DAY_CUTOVER_HOURS, Gender, JobSurvey, MBTIType, User
 
+from .sleep_debt import rebuild_sleep_debts
 from .utils import normalize_mbti
 
 
@@ -88,7 +89,33 @@ class OnboardingJobSerializer(serializers.ModelSerializer):
     # 유저 정보와 설문 데이터로 설문 결과를 새로 저장
     def create(self, validated_data):
         user = self.context.get("request").user
-        return JobSurvey.objects.create(user=user, **validated_data)
+        job_survey = JobSurvey.objects.create(user=user, **validated_data)
+        apply_day_cutover_hour(user, job_survey.work_time_pattern)
+        return job_survey
+
+
+# 근무 패턴에 맞춰 날짜 집계 기준 시각 갱신
+def apply_day_cutover_hour(user, work_time_pattern):
+    cutover_hour = DEFAULT_DAY_CUTOVER_HOURS.get(work_time_pattern, 0)
+    if user.day_cutover_hour != cutover_hour:
+        user.day_cutover_hour = cutover_hour
+        user.save(update_fields=["day_cutover_hour"])
+
+
+# 이상 징후 알림 (metric: sleep_score/sleep_duration/srt_reaction_ms/<종류>_score)
+class AnomalyAlertSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    metric = serializers.CharField()
+    value = serializers.FloatField()
+    z_score = serializers.FloatField()
+
+
+# 수면 빚 (분, 최근 7/14일 Σ(목표 - 수면 시간), 음수는 초과 수면)
+class SleepDebtSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    debt_7 = serializers.IntegerField()
+    debt_14 = serializers.IntegerField()
+    target_minutes = serializers.IntegerField()
 
 
 # 마이페이지 메인
@@ -100,6 +127,8 @@ class MypageMainSerializer(serializers.Serializer):
     total_sleep_hours = serializers.FloatField()
     average_sleep_score = serializers.FloatField()
     average_cognitive_score = serializers.FloatField()
+    alerts = AnomalyAlertSerializer(many=True)
+    sleep_debt = SleepDebtSerializer(allow_null=True)
 
 
 # 마이페이지 프로필 상세 조회 및 프로필 수정
@@ -145,6 +174,8 @@ class MypageProfileSerializer(serializers.ModelSerializer):
             "work_time_pattern_out",
             "work_time_pattern_label",
             "email",
+            "time_zone",
+            "sleep_target_minutes",
         ]
         # 수정 불가 필드
         read_only_fields = [
@@ -210,10 +241,18 @@ class MypageProfileSerializer(serializers.ModelSerializer):
         cognitive_type = validated_data.pop("cognitive_type", None)
         work_time_pattern = validated_data.pop("work_time_pattern", None)
 
+        # 목표 수면 시간이 바뀌면 저장된 수면 빚 재계산
+        target = validated_data.get(
+            "sleep_target_minutes", instance.sleep_target_minutes
+        )
+        target_changed = target != instance.sleep_target_minutes
+
         # User 필드 저장
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
+        if target_changed:
+            rebuild_sleep_debts(user_ids=[instance.pk])
 
         # 직업 설문 값이 둘 중 하나라도 있으면 이전 값으로 채워서 JobSurvey 인스턴스 새로 생성
         if cognitive_type is not None or work_time_pattern is not None:
@@ -233,6 +272,7 @@ class MypageProfileSerializer(serializers.ModelSerializer):
             )
             # context에 최신 데이터 반영
             self.context["latest_job_survey"] = latest_survey
+            apply_day_cutover_hour(instance, latest_survey.work_time_pattern)
 
         return instance
 
@@ -263,6 +303,29 @@ class MypageRecordMonthSerializer(serializers.Serializer):
     average_cognitive_score = serializers.FloatField()
 
 
+# 마이페이지 기록 조회 (리스트뷰-임의 기간/집계 단위)
+class MypageRecordBucketSerializer(serializers.Serializer):
+    label = serializers.CharField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    total_sleep_hours = serializers.FloatField()
+    average_sleep_score = serializers.FloatField()
+    average_cognitive_score = serializers.FloatField()
+
+
+# 마이페이지 임의 기간 통계 (누적합 인덱스)
+class MypageRecordRangeSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    days = serializers.IntegerField()
+    total_sleep_hours = serializers.FloatField()
+    sleep_days = serializers.IntegerField()
+    average_sleep_score = serializers.FloatField()
+    cognitive_days = serializers.IntegerField()
+    cognitive_test_count = serializers.IntegerField()
+    average_cognitive_score = serializers.FloatField()
+
+
 # 마이페이지 선택 날짜 기록 상세 조회
 # Cognitive test 상세
 class MypageRecordDetailCognitiveSerializer(serializers.Serializer):
@@ -274,6 +337,10 @@ class MypageRecordDetailCognitiveSerializer(serializers.Serializer):
     pattern_score = serializers.FloatField()
     pattern_count = serializers.IntegerField()
     pattern_time_ms = serializers.FloatField()
+    # 개인 기준선 대비 z 점수 (기준선이 부족하면 null)
+    srt_z_score = serializers.FloatField(allow_null=True)
+    symbol_z_score = serializers.FloatField(allow_null=True)
+    pattern_z_score = serializers.FloatField(allow_null=True)
 
 
 # detail 전체
@@ -281,19 +348,120 @@ class MypageRecordDetailSerializer(serializers.Serializer):
     date = serializers.DateField()
     total_sleep_hours = serializers.FloatField()
     sleep_score = serializers.FloatField()
+    # 최근 7/14일 수면 빚(분, 수면 기록이 없는 날짜면 null)
+    sleep_debt_7 = serializers.IntegerField(allow_null=True)
+    sleep_debt_14 = serializers.IntegerField(allow_null=True)
     cognitive_test = MypageRecordDetailCognitiveSerializer()
 
 
-# graph 블록
-class MypageRecordGraphSerializer(serializers.Serializer):
-    dates = serializers.ListField(child=serializers.DateField())
-    sleep_hour_list = serializers.ListField(child=serializers.FloatField())
-    sleep_score_list = serializers.ListField(child=serializers.FloatField())
-    cognitive_score_list = serializers.ListField(child=serializers.FloatField())
-    selected_date = serializers.DateField()
+# 여러 날짜 상세 기록 카드 (요청 날짜 오름차순, 기록 없는 날짜는 기본값)
+class MypageRecordDetailsSerializer(serializers.Serializer):
+    results = MypageRecordDetailSerializer(many=True)
 
 
 # 최상위 응답
 class MypageRecordDetailResponseSerializer(serializers.Serializer):
-    graph = MypageRecordGraphSerializer()
+    # graph 블록 (users.series에서 직렬화 가능한 값으로 생성, 원소별 검증 생략)
+    # dates, sleep_hour_list, sleep_score_list, cognitive_score_list, selected_date
+    # (+ 요청 시 moving_average, trend)
+    graph = serializers.JSONField(read_only=True)
     detail = MypageRecordDetailSerializer()
+
+
+# 마이페이지 수면-인지 상관 분석
+# r: 피어슨 상관계수, slope: 수면 값 1 증가당 인지 점수 변화량 (수면 시간은 분 단위)
+class CorrelationCoefficientSerializer(serializers.Serializer):
+    r = serializers.FloatField(allow_null=True)
+    slope = serializers.FloatField(allow_null=True)
+
+
+class CorrelationLagSerializer(serializers.Serializer):
+    n = serializers.IntegerField()
+    sleep_duration = CorrelationCoefficientSerializer()
+    sleep_score = CorrelationCoefficientSerializer()
+
+
+class MypageCorrelationSerializer(serializers.Serializer):
+    same_day = CorrelationLagSerializer()
+    next_day = CorrelationLagSerializer()
+
+
+# 마이페이지 시차 교차 상관 (lag일 뒤 인지 점수와의 상관계수)
+class LagCorrelationSerializer(serializers.Serializer):
+    lag = serializers.IntegerField()
+    n = serializers.IntegerField()
+    sleep_duration_r = serializers.FloatField(allow_null=True)
+    sleep_score_r = serializers.FloatField(allow_null=True)
+    threshold = serializers.FloatField(allow_null=True)
+
+
+class MypageLagCorrelationSerializer(serializers.Serializer):
+    start_date = serializers.DateField(allow_null=True)
+    end_date = serializers.DateField(allow_null=True)
+    lags = LagCorrelationSerializer(many=True)
+
+
+# 마이페이지 코호트 백분위 비교
+class CohortPercentileSerializer(serializers.Serializer):
+    dimension = serializers.CharField()
+    value = serializers.CharField(allow_blank=True)
+    user_count = serializers.IntegerField()
+    percentile = serializers.FloatField(allow_null=True)
+
+
+class MetricPercentileSerializer(serializers.Serializer):
+    metric = serializers.CharField()
+    value = serializers.FloatField(allow_null=True)
+    cohorts = CohortPercentileSerializer(many=True)
+
+
+class MypagePercentileSerializer(serializers.Serializer):
+    built_at = serializers.DateTimeField(allow_null=True)
+    metrics = MetricPercentileSerializer(many=True)
+
+
+# 마이페이지 반응 시간 분포 (lapse_rate: 500ms 이상 걸린 시행 비율)
+class ReactionTimeSummarySerializer(serializers.Serializer):
+    test_kind = serializers.CharField()
+    trial_count = serializers.IntegerField()
+    median_ms = serializers.IntegerField(allow_null=True)
+    p90_ms = serializers.IntegerField(allow_null=True)
+    lapse_rate = serializers.FloatField(allow_null=True)
+
+
+class MypageReactionTimeSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    results = ReactionTimeSummarySerializer(many=True)
+
+
+# 연속 기록 (current: 오늘 또는 어제까지 이어지는 연속 일수, 끊겼으면 0)
+class StreakSerializer(serializers.Serializer):
+    current = serializers.IntegerField()
+    longest = serializers.IntegerField()
+    longest_start = serializers.DateField(allow_null=True)
+    longest_end = serializers.DateField(allow_null=True)
+
+
+class HighlightDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    score = serializers.FloatField()
+
+
+# 마이페이지 하이라이트 (연속 기록 + 점수 상위/하위 기록일)
+class MypageHighlightsSerializer(serializers.Serializer):
+    sleep_streak = StreakSerializer()
+    cognitive_streak = StreakSerializer()
+    best_sleep_days = HighlightDaySerializer(many=True)
+    worst_sleep_days = HighlightDaySerializer(many=True)
+    best_cognitive_days = HighlightDaySerializer(many=True)
+    worst_cognitive_days = HighlightDaySerializer(many=True)
+
+
+# 마이페이지 연도 히트맵 (지표별 366바이트 배열의 base64, 바이트 = 0~100 점수, missing = 기록 없음)
+class MypageHeatmapSerializer(serializers.Serializer):
+    year = serializers.IntegerField()
+    days = serializers.IntegerField()
+    missing = serializers.IntegerField()
+    sleep_score = serializers.CharField()
+    cognitive_score = serializers.CharField()
@@ -0,0 +1,185 @@
+# 마이페이지 그래프용 일별 시계열 (NumPy 벡터 연산)
+# 기간 내 일별 집계 행을 한 번에 조회해 시작일 기준 일 오프셋 위치에 채움
+from datetime import timedelta
+
+import numpy as np
+
+from .models import UserDailyStats
+
+# 일별 집계 테이블에서 읽어오는 컬럼 (순서 = 배열 열 순서)
+SERIES_COLUMNS = (
+    "sleep_minutes",
+    "sleep_score",
+    "srt_score_sum",
+    "srt_count",
+    "pattern_score_sum",
+    "pattern_count",
+    "symbol_score_sum",
+    "symbol_count",
+)
+
+
+# 일별 집계 행 (date, *SERIES_COLUMNS) → 시작일 기준 일 오프셋 위치에 채운 배열
+# 행 = 일 오프셋, 열 = SERIES_COLUMNS, 기록 없는 날/값은 nan
+def _fill_matrix(rows, start_date, days):
+    matrix = np.full((days, len(SERIES_COLUMNS)), np.nan)
+    if rows:
+        dates, *columns = zip(*rows)
+        offsets = np.fromiter(
+            ((d - start_date).days for d in dates), dtype=np.intp, count=len(dates)
+        )
+        # None -> nan 변환 후 오프셋 위치에 일괄 대입
+        matrix[offsets] = np.array(columns, dtype=float).T
+    return matrix
+
+
+# 기간 내 일별 원본 값 배열
+def fetch_daily_matrix(user, start_date, end_date):
+    rows = UserDailyStats.objects.filter(
+        user=user, date__range=(start_date, end_date)
+    ).values_list("date", *SERIES_COLUMNS)
+    return _fill_matrix(rows, start_date, (end_date - start_date).days + 1)
+
+
+# 전체 기록 기간의 일별 원본 값 배열 (조회 1회, 기록이 없으면 None)
+# 반환값: (첫 기록일, 마지막 기록일, 배열)
+def fetch_history_matrix(user):
+    rows = list(
+        UserDailyStats.objects.filter(user=user)
+        .order_by("date")
+        .values_list("date", *SERIES_COLUMNS)
+    )
+    if not rows:
+        return None
+    start_date, end_date = rows[0][0], rows[-1][0]
+    return (
+        start_date,
+        end_date,
+        _fill_matrix(rows, start_date, (end_date - start_date).days + 1),
+    )
+
+
+# 일별 원본 값 배열 → 수면 시간/수면 점수/인지 점수 배열 (기록 없는 날은 nan)
+def series_from_matrix(matrix):
+    sleep_minutes, sleep_score = matrix[:, 0], matrix[:, 1]
+
+    # 인지 점수 = 그날 모든 테스트 점수 합 / 테스트 횟수
+    score_sum = np.nansum(matrix[:, 2::2], axis=1)
+    count = np.nansum(matrix[:, 3::2], axis=1)
+    cognitive_score = np.divide(
+        score_sum, count, out=np.full(len(count), np.nan), where=count > 0
+    )
+
+    return {
+        "sleep_minutes": sleep_minutes,
+        "sleep_hours": sleep_minutes / 60,
+        "sleep_score": sleep_score,
+        "cognitive_score": cognitive_score,
+    }
+
+
+# 기간 내 일별 수면 시간/수면 점수/인지 점수 배열
+def build_daily_series(user, start_date, end_date):
+    return series_from_matrix(fetch_daily_matrix(user, start_date, end_date))
+
+
+# 날짜 문자열 목록 (YYYY-MM-DD)
+def date_labels(start_date, end_date):
+    return (
+        np.arange(
+            np.datetime64(start_date),
+            np.datetime64(end_date + timedelta(days=1)),
+            dtype="datetime64[D]",
+        )
+        .astype(str)
+        .tolist()
+    )
+
+
+# 응답용 리스트 변환 (소수 첫째 자리 반올림, 기록 없는 날은 0)
+def to_graph_list(values):
+    return np.round(np.nan_to_num(values, nan=0.0), 1).tolist()
+
+
+# 응답용 리스트 변환 (소수 첫째 자리 반올림, 값이 없으면 None)
+def to_nullable_list(values):
+    rounded = np.round(values, 1)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+# 오버레이 대상 시계열
+OVERLAY_SERIES = ("sleep_hours", "sleep_score", "cognitive_score")
+# 이동 평균 창 크기 상한 (일)
+MAX_MOVING_AVERAGE_WINDOW = 365
+TREND_METHODS = ("linear",)
+
+
+# 후행 이동 평균 (해당 날짜 포함 과거 window일 중 기록 있는 날만 평균, 없으면 nan)
+def moving_average(values, window):
+    kernel = np.ones(window)
+    mask = ~np.isnan(values)
+    sums = np.convolve(np.where(mask, values, 0.0), kernel)[: len(values)]
+    counts = np.convolve(mask.astype(float), kernel)[: len(values)]
+    return np.divide(sums, counts, out=np.full(len(values), np.nan), where=counts > 0)
+
+
+# 최소제곱 직선 추세 (기록 2일 미만이면 None)
+# slope: 하루당 변화량, values: 기간 내 각 날짜의 추세값
+def linear_trend(values):
+    x = np.arange(len(values))
+    mask = ~np.isnan(values)
+    if np.count_nonzero(mask) < 2:
+        return None
+    slope, intercept = np.polyfit(x[mask], values[mask], 1)
+    return {
+        "slope": round(float(slope), 4),
+        "intercept": round(float(intercept), 4),
+        "values": to_nullable_list(intercept + slope * x),
+    }
+
+
+# 이동 평균/추세 오버레이 (series: lead일 앞당겨 조회한 일별 시계열)
+def _overlays(series, lead, windows, trend):
+    overlays = {}
+    if windows:
+        overlays["moving_average"] = {
+            str(window): {
+                key: to_nullable_list(moving_average(series[key], window)[lead:])
+                for key in OVERLAY_SERIES
+            }
+            for window in windows
+        }
+    if trend:
+        overlays["trend"] = {
+            key: linear_trend(series[key][lead:]) for key in OVERLAY_SERIES
+        }
+    return overlays
+
+
+def _fetch_with_lead(user, start_date, end_date, windows):
+    # 기간 첫날의 이동 평균도 계산되도록 가장 큰 창 크기만큼 앞에서부터 조회
+    lead = max(windows, default=1) - 1
+    return build_daily_series(user, start_date - timedelta(days=lead), end_date), lead
+
+
+# 기간 내 오버레이만 생성 (조회 1회)
+def build_overlays(user, start_date, end_date, windows=(), trend=None):
+    series, lead = _fetch_with_lead(user, start_date, end_date, windows)
+    return {
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        **_overlays(series, lead, windows, trend),
+    }
+
+
+# 그래프 블록 (날짜/수면 시간/수면 점수/인지 점수 + 요청 시 오버레이, 조회 1회)
+# 이미 직렬화 가능한 값이므로 시리얼라이저 검증 없이 그대로 응답에 사용
+def build_graph_block(user, start_date, end_date, windows=(), trend=None):
+    series, lead = _fetch_with_lead(user, start_date, end_date, windows)
+    return {
+        "dates": date_labels(start_date, end_date),
+        "sleep_hour_list": to_graph_list(series["sleep_hours"][lead:]),
+        "sleep_score_list": to_graph_list(series["sleep_score"][lead:]),
+        "cognitive_score_list": to_graph_list(series["cognitive_score"][lead:]),
+        **_overlays(series, lead, windows, trend),
+    }
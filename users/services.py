@@ -1,30 +1,80 @@
-from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 
-from django.db import transaction
-from django.db.models import Avg, Sum
+from django.db import router, transaction
 from django.utils import timezone
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
-from cognitive_statistics.models import (
-    CognitiveResultPattern,
-    CognitiveResultSRT,
-    CognitiveResultSymbol,
-)
+from cognitive_statistics.models import CognitiveTestKind
+from cognitive_statistics.services import summarize_by_date_and_kind
+from config.tiered_cache import TieredCache
 from sleep_record.models import SleepRecord
 
-from .models import User, UserBlacklist, UserStatus
+from .anomaly import recent_alerts
+from .baseline import baseline_z_score, get_cognitive_baselines
+from .models import User, UserBlacklist, UserDailyStats, UserLifetimeStats, UserStatus
+from .prefix_sums import get_prefix_buckets
+from .series import build_graph_block
 from .utils import (
-    daterange,
+    bucket_of,
     download_and_save_profile_image,
     generate_jwt_token_pair,
     get_access_token_from_code,
     get_google_user_info,
     get_kakao_user_info,
+    local_today,
+    month_end_of,
     normalize_profile_img,
-    weekrange,
+    to_local_date,
 )
 
+# 인증 유저 / 활성 블랙리스트 2단 캐시 (변경 시 users.signals에서 무효화)
+# 일괄 수정(QuerySet.update)은 UserQuerySet.update에서 무효화
+user_cache = TieredCache("auth_user")
+blacklist_cache = TieredCache("user_blacklist")
+
+# 인증 유저 캐시에 보관하는 필드 (모델 필드 순서, 비밀번호 해시는 보관하지 않음)
+AUTH_USER_FIELDS = ("user_id", "status", "is_active")
+
+
+# 인증 확인용 유저 필드 (토큰 폐기 확인을 켠 경우에만 비밀번호 해시의 md5 포함)
+def get_cached_auth_fields(user_id):
+    def load():
+        fields = list(AUTH_USER_FIELDS)
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            fields.append("password")
+        row = User.objects.filter(pk=user_id).values(*fields).first()
+        if row and "password" in row:
+            row["password_digest"] = get_md5_hash_password(row.pop("password"))
+        return row
+
+    return user_cache.get(user_id, load)
+
+
+# 캐시된 필드로 유저 인스턴스 구성 (나머지 필드는 첫 접근 시 한 번에 조회)
+def user_from_auth_fields(fields):
+    return User.from_db(
+        router.db_for_read(User),
+        AUTH_USER_FIELDS,
+        [fields[name] for name in AUTH_USER_FIELDS],
+    )
+
+
+def get_cached_user(user_id):
+    fields = get_cached_auth_fields(user_id)
+    return user_from_auth_fields(fields) if fields else None
+
+
+# 활성 블랙리스트 여부 및 사유 (is_blacklisted, reason)
+# 대부분의 유저는 블랙리스트가 아니므로 "없음"도 캐시
+def get_active_blacklist(user):
+    def load():
+        bl = UserBlacklist.objects.filter(user=user, is_active=True).first()
+        return (True, bl.reason) if bl else (False, None)
+
+    return blacklist_cache.get(user.pk, load)
+
 
 # 유저 상태 관련 예외 처리용
 class UserStatusException(Exception):
@@ -38,9 +88,9 @@ def get_or_create_active_user(provider, social_id, email, nickname, profile_img)
     ).first()
     # 블랙리스트 유저일 경우 로그인 거부
     if user:
-        bl = UserBlacklist.objects.filter(user=user, is_active=True).first()
-        if bl:
-            raise UserStatusException(f"블랙리스트 계정: {bl.reason}")
+        is_blacklisted, reason = get_active_blacklist(user)
+        if is_blacklisted:
+            raise UserStatusException(f"블랙리스트 계정: {reason}")
         # 탈퇴 유저일 경우 기존 계정 비활성화 + 신규 계정 생성
         if user.status == UserStatus.WITHDRAWN or not user.is_active:
             # 탈퇴 유저 소셜 아이디 무력화
@@ -170,34 +220,18 @@ def get_mypage_main_data(user, request):
         raise PermissionDenied("탈퇴된 유저입니다.")
 
     # 가입일 기준으로 tracking_days 계산
-    joined_date = user.joined_at.date() if user.joined_at else date.today()
-    today = timezone.now().date()
+    today = local_today(user)
+    joined_date = to_local_date(user, user.joined_at) if user.joined_at else today
     tracking_days = (today - joined_date).days + 1
 
-    # 수면 기록
-    sleep_records = SleepRecord.objects.filter(user=user)
-    total_sleep_minutes = (
-        sleep_records.aggregate(total=Sum("sleep_duration"))["total"] or 0
-    )
-    total_sleep_hours = round(total_sleep_minutes / 60, 1)
-
-    # score가 모두 null일 수 있으므로 None 처리 방어
-    avg_score = sleep_records.aggregate(avg=Avg("score"))["avg"]
-    average_sleep_score = round(avg_score, 1) if avg_score is not None else 0.0
-
-    # 90일치 일별 인지 점수(평균)
-    today = timezone.now().date()
-    start_date = today - timedelta(days=89)
-    end_date = today
-    cognitive_scores = get_daily_cognitive_scores(user, start_date, end_date)
-    cognitive_score_list = list(cognitive_scores.values())
-
-    if cognitive_score_list:
-        average_cognitive_score = round(
-            sum(cognitive_score_list) / len(cognitive_score_list), 1
-        )
-    else:
-        average_cognitive_score = 0.0
+    # 누적 통계 행 PK 조회 1회 (기록이 없으면 0으로 응답)
+    lifetime = UserLifetimeStats.objects.filter(pk=user.pk).first()
+    if lifetime is None:
+        lifetime = UserLifetimeStats(user=user)
+
+    total_sleep_hours = round(lifetime.total_sleep_minutes / 60, 1)
+    average_sleep_score = lifetime.average_sleep_score
+    average_cognitive_score = lifetime.average_cognitive_score
 
     return {
         "nickname": user.nickname,
@@ -212,6 +246,19 @@ def get_mypage_main_data(user, request):
         "total_sleep_hours": total_sleep_hours,
         "average_sleep_score": average_sleep_score,
         "average_cognitive_score": average_cognitive_score,
+        # 작성 시점에 판정해 둔 최근 이상 징후 (추가 조회 없음)
+        "alerts": recent_alerts(lifetime, today),
+        # 마지막 수면 기록일 기준 수면 빚 (누적 통계 행에 저장, 기록이 없으면 None)
+        "sleep_debt": (
+            {
+                "date": lifetime.sleep_debt_date,
+                "debt_7": lifetime.sleep_debt_7,
+                "debt_14": lifetime.sleep_debt_14,
+                "target_minutes": user.sleep_target_minutes,
+            }
+            if lifetime.sleep_debt_date
+            else None
+        ),
     }
 
 
@@ -239,75 +286,93 @@ def create_or_update_user_by_social(
 
 
 # 마이페이지 기록 조회 (리스트뷰)
-# 날짜별 인지 점수 합산 (각 날짜별로 3종 테스트 점수 평균)
-def get_daily_cognitive_scores(user, start_date, end_date):
-    cognitive_data = defaultdict(list)  # 날짜별 점수 리스트 저장
-
-    # 3가지 인지 테스트 결과 모델 반복
-    cognitive_models = [
-        CognitiveResultSRT,
-        CognitiveResultPattern,
-        CognitiveResultSymbol,
+# 기간 내 일별 집계를 한 번 조회한 뒤 일/주/월/분기/연 단위 구간으로 한 번에 집계
+# 구간 개수와 관계없이 쿼리는 1회
+def get_record_buckets(user, start_date, end_date, granularity):
+    buckets = {}
+    daily_stats = UserDailyStats.objects.filter(
+        user=user, date__range=(start_date, end_date)
+    ).order_by("date")
+
+    for stats in daily_stats:
+        cognitive_score = stats.cognitive_score
+        # 수면/인지 기록 모두 없는 날은 skip
+        if not stats.has_sleep and cognitive_score is None:
+            continue
+
+        bucket_start, bucket_end, label = bucket_of(stats.date, granularity)
+        bucket = buckets.get(bucket_start)
+        if bucket is None:
+            bucket = buckets[bucket_start] = {
+                "label": label,
+                "start_date": bucket_start,
+                "end_date": bucket_end,
+                "sleep_minutes": 0,
+                "sleep_days": 0,
+                "sleep_score_sum": 0,
+                "cognitive_score_sum": 0,
+                "cognitive_days": 0,
+            }
+
+        if stats.has_sleep:
+            bucket["sleep_minutes"] += stats.sleep_minutes
+            bucket["sleep_days"] += 1
+            bucket["sleep_score_sum"] += stats.sleep_score or 0
+        if cognitive_score is not None:
+            bucket["cognitive_score_sum"] += cognitive_score
+            bucket["cognitive_days"] += 1
+
+    # 총 수면시간(분 → 시간), 평균 수면점수, 평균 인지점수(일별 평균의 평균)
+    return [
+        {
+            "label": b["label"],
+            "start_date": b["start_date"],
+            "end_date": b["end_date"],
+            "total_sleep_hours": round(b["sleep_minutes"] / 60, 1),
+            "average_sleep_score": (
+                round(b["sleep_score_sum"] / b["sleep_days"], 1)
+                if b["sleep_days"]
+                else 0
+            ),
+            "average_cognitive_score": (
+                round(b["cognitive_score_sum"] / b["cognitive_days"], 1)
+                if b["cognitive_days"]
+                else 0
+            ),
+        }
+        for b in buckets.values()
     ]
-    for model in cognitive_models:
-        # 해당 유저의 테스트 결과에서 기간 내 날짜, 점수만 가져옴
-        results = model.objects.filter(
-            cognitive_session__user=user, created_at__date__range=(start_date, end_date)
-        ).values("created_at__date", "score")
-        for r in results:
-            date_key = r["created_at__date"]
-            # date/datetime 타입 모두 지원
-            if isinstance(date_key, datetime):
-                date_key = date_key.date()
-            cognitive_data[date_key].append(r["score"])
-
-    # 날짜별 점수 평균값 계산
-    daily_scores = {
-        d: round(sum(scores) / len(scores), 1) for d, scores in cognitive_data.items()
-    }
-    return daily_scores
 
 
-# 해당 유저의 기간 내 수면기록을 날짜별로 dict화
-def get_sleep_records(user, start_date, end_date):
-    return {
-        r.date: r
-        for r in SleepRecord.objects.filter(
-            user=user, date__range=(start_date, end_date)
+# 기록 리스트 기간별 조회 범위 (시작일, 종료일)
+def get_record_period_range(user, period):
+    today = local_today(user)
+    if period == "day":
+        return today - timedelta(days=89), today  # 최근 90일 범위
+    if period == "week":
+        # 최근 4주 범위 (3주 전 월요일 ~ 이번 주 일요일)
+        return (
+            bucket_of(today - timedelta(weeks=3), "week")[0],
+            bucket_of(today, "week")[1],
         )
-    }
+    # 11개월 전 1일 ~ 이번 달 말일
+    months_ago = today.year * 12 + today.month - 1 - 11
+    return date(months_ago // 12, months_ago % 12 + 1, 1), month_end_of(today)
 
 
 # 최근 90일간 일별 수면/인지 기록 리스트 조회
 def get_record_day_list(user):
-    today = timezone.now().date()
-    start_date, end_date = today - timedelta(days=89), today  # 최근 90일 범위
-
-    sleep_records = get_sleep_records(user, start_date, end_date)  # 날짜별 수면기록
-    cognitive_scores = get_daily_cognitive_scores(
-        user, start_date, end_date
-    )  # 날짜별 인지점수
-
-    results = []
-    # 각 날짜마다 기록이 존재하는지 확인
-    for single_date in daterange(start_date, end_date):  # end_date 포함
-        sleep = sleep_records.get(single_date)
-        cognitive_score = cognitive_scores.get(single_date)
-
-        # 수면 or 인지 데이터 하나라도 있으면 결과에 추가
-        if sleep or cognitive_score is not None:
-            results.append(
-                {
-                    "date": str(single_date),  # 날짜 (문자열)
-                    "sleep_hour": (
-                        round(sleep.sleep_duration / 60, 1) if sleep else 0
-                    ),  # 수면시간(시간단위)
-                    "sleep_score": sleep.score if sleep else 0,  # 수면점수
-                    "cognitive_score": (
-                        cognitive_score if cognitive_score else 0
-                    ),  # 인지점수
-                }
-            )
+    start_date, end_date = get_record_period_range(user, "day")
+
+    results = [
+        {
+            "date": b["label"],  # 날짜 (문자열)
+            "sleep_hour": b["total_sleep_hours"],  # 수면시간(시간단위)
+            "sleep_score": b["average_sleep_score"],  # 수면점수
+            "cognitive_score": b["average_cognitive_score"],  # 인지점수
+        }
+        for b in get_record_buckets(user, start_date, end_date, "day")
+    ]
 
     # 데이터 없으면 에러 반환
     if not results:
@@ -318,59 +383,21 @@ def get_record_day_list(user):
 
 # 최근 4주간 주별 수면/인지 기록 리스트 조회
 def get_record_week_list(user):
-    today = timezone.now().date()
-    start_date, end_date = today - timedelta(weeks=3), today  # 최근 4주 범위
-
-    sleep_records = get_sleep_records(user, start_date, end_date)  # 날짜별 수면기록
-
-    results = []
-    week_number = 1  # 주차 번호 (1부터)
-    # 주별 구간 루프
-    for week_start, week_end in weekrange(start_date, end_date):
-        # 각 주에 해당하는 날짜별 수면 기록 모음
-        weekly_sleeps = [
-            sleep_records.get(d)
-            for d in daterange(week_start, week_end)
-            if sleep_records.get(d)
-        ]
-        # 각 주의 날짜별 인지점수 리스트 추출
-        weekly_cognitive_scores = get_daily_cognitive_scores(
-            user, week_start, week_end
-        ).values()
-
-        # 수면/인지 기록 모두 없으면 skip
-        if not weekly_sleeps and not weekly_cognitive_scores:
-            continue
-
-        # 주간 총 수면시간(분 → 시간), 주간 평균 수면점수/인지점수
-        total_sleep_minutes = sum(
-            r.sleep_duration for r in weekly_sleeps if r.sleep_duration
-        )
-        avg_sleep_score = (
-            round(
-                sum(r.score for r in weekly_sleeps if r.score) / len(weekly_sleeps), 1
-            )
-            if weekly_sleeps
-            else 0
-        )
-        avg_cognitive_score = (
-            round(sum(weekly_cognitive_scores) / len(weekly_cognitive_scores), 1)
-            if weekly_cognitive_scores
-            else 0
-        )
-
-        # 결과 추가
-        results.append(
-            {
-                "week": week_number,
-                "start_date": week_start,
-                "end_date": week_end,
-                "total_sleep_hours": round(total_sleep_minutes / 60, 1),
-                "average_sleep_score": avg_sleep_score,
-                "average_cognitive_score": avg_cognitive_score,
-            }
+    start_date, end_date = get_record_period_range(user, "week")
+
+    results = [
+        {
+            "week": week_number,  # 주차 번호 (1부터)
+            "start_date": b["start_date"],
+            "end_date": b["end_date"],
+            "total_sleep_hours": b["total_sleep_hours"],
+            "average_sleep_score": b["average_sleep_score"],
+            "average_cognitive_score": b["average_cognitive_score"],
+        }
+        for week_number, b in enumerate(
+            get_prefix_buckets(user, start_date, end_date, "week"), start=1
         )
-        week_number += 1
+    ]
 
     if not results:
         raise ValidationError("해당 기간 기록이 없습니다.")
@@ -380,102 +407,47 @@ def get_record_week_list(user):
 
 # 최근 12개월간 월별 수면/인지 기록 리스트 조회
 def get_record_month_list(user):
-    today = timezone.now().date()
-    results = []
-
-    for i in range(12):
-        # 월 시작, 끝 날짜 계산
-        y, m = (today.year - (today.month - i - 1) // 12), (
-            today.month - i - 1
-        ) % 12 + 1
-        month_start = date(y, m, 1)
-        # 월 마지막날 구하기
-        month_end = (
-            date(y, m + 1, 1) - timedelta(days=1)
-            if m != 12
-            else date(y + 1, 1, 1) - timedelta(days=1)
-        )
-
-        # 해당 월 전체 수면기록/인지점수
-        sleep_records = [
-            r
-            for r in SleepRecord.objects.filter(
-                user=user, date__range=(month_start, month_end)
-            )
-        ]
-        cognitive_scores = get_daily_cognitive_scores(
-            user, month_start, month_end
-        ).values()
-
-        # 둘 다 없으면 건너뜀
-        if not sleep_records and not cognitive_scores:
-            continue
-
-        # 월별 총 수면시간(시간), 평균 수면점수/인지점수
-        sleep_hours = [r.sleep_duration / 60 for r in sleep_records if r.sleep_duration]
-        sleep_scores = [r.score for r in sleep_records if r.score]
-
-        results.append(
-            {
-                "month": f"{y}-{str(m).zfill(2)}",
-                "total_sleep_hours": round(sum(sleep_hours), 1) if sleep_hours else 0,
-                "average_sleep_score": (
-                    round(sum(sleep_scores) / len(sleep_scores), 1)
-                    if sleep_scores
-                    else 0
-                ),
-                "average_cognitive_score": (
-                    round(sum(cognitive_scores) / len(cognitive_scores), 1)
-                    if cognitive_scores
-                    else 0
-                ),
-            }
-        )
+    start_date, end_date = get_record_period_range(user, "month")
+
+    results = [
+        {
+            "month": b["label"],
+            "total_sleep_hours": b["total_sleep_hours"],
+            "average_sleep_score": b["average_sleep_score"],
+            "average_cognitive_score": b["average_cognitive_score"],
+        }
+        for b in get_prefix_buckets(user, start_date, end_date, "month")
+    ]
 
     if not results:
         raise ValidationError("해당 기간 기록이 없습니다.")
 
-    results.sort(key=lambda x: x["month"])  # 월 오름차순 정렬
-    return results
+    return results  # 월 오름차순
 
 
 # 마이페이지 선택 날짜 상세 조회
-# 월 전체 그래프 데이터
-def get_monthly_detail_date(user, year, month):
-    # 월 시작/끝 날짜
-    month_start = date(year, month, 1)
-    if month == 12:
-        month_end = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        month_end = date(year, month + 1, 1) - timedelta(days=1)
-
-    # 날짜별 데이터 집계
-    date_list = []
-    sleep_hour_list = []
-    sleep_score_list = []
-    cognitive_score_list = []
-
-    sleep_records = {
-        r.date: r
-        for r in SleepRecord.objects.filter(
-            user=user, date__range=(month_start, month_end)
-        )
+# 수면 기록 1건 → 상세 기록
+def _sleep_detail(sr):
+    return {
+        "date": str(sr.date),
+        "total_sleep_hours": (
+            round(sr.sleep_duration / 60, 1) if sr.sleep_duration else 0
+        ),
+        "sleep_score": round(sr.score, 1) if sr.score else 0,
+        # 기록에 함께 저장된 최근 7/14일 수면 빚(분)
+        "sleep_debt_7": sr.sleep_debt_7,
+        "sleep_debt_14": sr.sleep_debt_14,
     }
-    cognitive_scores = get_daily_cognitive_scores(user, month_start, month_end)
 
-    for d in daterange(month_start, month_end):
-        date_list.append(d)
-        sr = sleep_records.get(d)
-        cs = cognitive_scores.get(d)
-        sleep_hour_list.append(round((sr.sleep_duration if sr else 0) / 60, 1))
-        sleep_score_list.append(round(sr.score, 1) if sr else 0)
-        cognitive_score_list.append(round(cs, 1) if cs is not None else 0)
 
+# 수면 기록이 없는 날짜의 기본값
+def _empty_sleep_detail(date):
     return {
-        "dates": [str(d) for d in date_list],
-        "sleep_hour_list": sleep_hour_list,
-        "sleep_score_list": sleep_score_list,
-        "cognitive_score_list": cognitive_score_list,
+        "date": str(date),
+        "total_sleep_hours": 0,
+        "sleep_score": 0,
+        "sleep_debt_7": None,
+        "sleep_debt_14": None,
     }
 
 
@@ -484,86 +456,29 @@ def get_sleep_detail(user, date):
     sr = SleepRecord.objects.filter(user=user, date=date).first()
     if not sr:
         return None
-    return {
-        "date": str(date),
-        "total_sleep_hours": (
-            round(sr.sleep_duration / 60, 1) if sr.sleep_duration else 0
-        ),
-        "sleep_score": round(sr.score, 1) if sr.score else 0,
-    }
+    return _sleep_detail(sr)
 
 
-# 해당 날짜의 인지 기록 상세
-def get_cognitive_detail(user, date):
+# 날짜 x 종류 집계 결과에서 한 날짜의 인지 상세 기록 구성 (조회 없음)
+# baselines: 테스트 종류별 현재 개인 기준선 (z 점수 계산용)
+def _cognitive_detail(summaries, date, baselines):
+    srt = summaries.get((date, CognitiveTestKind.SRT), {})
+    symbol = summaries.get((date, CognitiveTestKind.SYMBOL), {})
+    pattern = summaries.get((date, CognitiveTestKind.PATTERN), {})
+
     # srt
-    srt_results = list(
-        CognitiveResultSRT.objects.filter(
-            cognitive_session__user=user, created_at__date=date
-        )
-    )
-    srt_score = (
-        round(sum(result.score for result in srt_results) / len(srt_results), 1)
-        if srt_results
-        else 0
-    )
-    srt_time_ms = (
-        int(sum(result.reaction_avg_ms for result in srt_results) / len(srt_results))
-        if srt_results
-        else 0
-    )
+    srt_score = round(srt.get("score_avg") or 0, 1)
+    srt_time_ms = int(srt.get("reaction_avg_ms") or 0)
 
     # symbol
-    symbol_results = list(
-        CognitiveResultSymbol.objects.filter(
-            cognitive_session__user=user, created_at__date=date
-        )
-    )
-    symbol_score = (
-        round(sum(result.score for result in symbol_results) / len(symbol_results), 1)
-        if symbol_results
-        else 0
-    )
-    symbol_count = (
-        sum(result.symbol_correct for result in symbol_results) if symbol_results else 0
-    )
-    symbol_accuracy = (
-        int(
-            sum(result.symbol_accuracy for result in symbol_results)
-            / len(symbol_results)
-        )
-        if symbol_results
-        else 0
-    )
+    symbol_score = round(symbol.get("score_avg") or 0, 1)
+    symbol_count = symbol.get("correct_sum") or 0
+    symbol_accuracy = int(symbol.get("accuracy_avg") or 0)
 
     # pattern
-    pattern_results = list(
-        CognitiveResultPattern.objects.filter(
-            cognitive_session__user=user, created_at__date=date
-        ).order_by("cognitive_session_id", "-created_at")
-    )
-
-    # 세션별로 최신 결과만 반영
-    session_latest = {}
-    for result in pattern_results:
-        session_id = result.cognitive_session_id
-        if session_id not in session_latest:
-            session_latest[session_id] = result
-
-    pattern_score_list = [r.score for r in session_latest.values()]
-    pattern_time_sec_list = [r.pattern_time_sec for r in session_latest.values()]
-    pattern_correct_list = [r.pattern_correct for r in session_latest.values()]
-
-    pattern_score = (
-        round(sum(pattern_score_list) / len(pattern_score_list), 1)
-        if pattern_score_list
-        else 0
-    )
-    pattern_count = sum(pattern_correct_list)
-    pattern_time_sec = (
-        sum(pattern_time_sec_list) / len(pattern_time_sec_list)
-        if pattern_time_sec_list
-        else 0
-    )
+    pattern_score = round(pattern.get("score_avg") or 0, 1)
+    pattern_count = pattern.get("correct_sum") or 0
+    pattern_time_sec = pattern.get("time_sec_avg") or 0
 
     total_score = srt_score + symbol_score + pattern_score
 
@@ -577,36 +492,60 @@ def get_cognitive_detail(user, date):
         "pattern_count": int(pattern_count),
         "pattern_time_ms": int(pattern_time_sec * 1000),
         "total_score": round(total_score, 1),
+        "srt_z_score": baseline_z_score(
+            baselines.get(CognitiveTestKind.SRT), srt.get("score_avg")
+        ),
+        "symbol_z_score": baseline_z_score(
+            baselines.get(CognitiveTestKind.SYMBOL), symbol.get("score_avg")
+        ),
+        "pattern_z_score": baseline_z_score(
+            baselines.get(CognitiveTestKind.PATTERN), pattern.get("score_avg")
+        ),
     }
 
 
+# 해당 날짜의 인지 기록 상세
+def get_cognitive_detail(user, date):
+    # 종류별 집계 (GROUP BY 1회, 패턴은 세션별 최신 결과만 반영)
+    summaries = summarize_by_date_and_kind(user, local_date=date)
+    # 현재 개인 기준선 대비 z 점수 (기준선 행 조회 1회, 과거 기록 조회 없음)
+    return _cognitive_detail(summaries, date, get_cognitive_baselines(user))
+
+
+# 여러 날짜 상세 기록 카드 (날짜 수와 무관하게 수면 1회 + 인지 집계 1회 + 기준선 1회)
+def get_date_details(user, dates):
+    dates = sorted(set(dates))
+    sleep_records = {
+        sr.date: sr for sr in SleepRecord.objects.filter(user=user, date__in=dates)
+    }
+    # 날짜 x 종류 GROUP BY (DB에서 평균/합계, 패턴은 세션별 최신 결과만 반영)
+    summaries = summarize_by_date_and_kind(user, local_date__in=dates)
+    baselines = get_cognitive_baselines(user)
+
+    results = []
+    for day in dates:
+        sr = sleep_records.get(day)
+        detail = _sleep_detail(sr) if sr else _empty_sleep_detail(day)
+        detail["cognitive_test"] = _cognitive_detail(summaries, day, baselines)
+        results.append(detail)
+    return {"results": results}
+
+
 # 전체 합친 최종 기록
-def get_selected_date_detail(user, date):
-    year, month = date.year, date.month
+# span: 그래프 기간 단위 (선택 날짜가 속한 month/quarter/year 전체)
+# windows/trend: 그래프에 추가할 이동 평균 창 크기 목록 / 추세선 방식
+def get_selected_date_detail(user, date, span="month", windows=(), trend=None):
+    span_start, span_end, _ = bucket_of(date, span)
 
-    graph = get_monthly_detail_date(user, year, month)
+    graph = build_graph_block(user, span_start, span_end, windows, trend)
     graph["selected_date"] = str(date)
 
     sleep_detail = get_sleep_detail(user, date)
     cognitive_detail = get_cognitive_detail(user, date)
 
-    sleep_detail = get_sleep_detail(user, date)
-    cognitive_detail = get_cognitive_detail(user, date)
-
-    # 수면/인지 둘 다 없을 때만 None
-    if not sleep_detail and not cognitive_detail:
-        return None
-
+    # 기록이 없는 날도 기본값 카드로 응답 (여러 날짜 상세와 동일)
     # 수면 데이터가 없으면 기본값으로 대체
-    detail = (
-        sleep_detail
-        if sleep_detail
-        else {
-            "date": str(date),
-            "total_sleep_hours": 0,
-            "sleep_score": 0,
-        }
-    )
+    detail = sleep_detail if sleep_detail else _empty_sleep_detail(date)
     detail["cognitive_test"] = cognitive_detail
 
     return {
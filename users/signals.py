@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User, UserBlacklist
+from .services import blacklist_cache, user_cache
+
+
+# 유저 변경 시 인증 유저 캐시 무효화 (모든 워커에 전파)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+# 블랙리스트 변경 시 해당 유저의 블랙리스트 캐시 무효화
+@receiver([post_save, post_delete], sender=UserBlacklist)
+def invalidate_blacklist_cache(sender, instance, **kwargs):
+    blacklist_cache.invalidate(instance.user_id)
@@ -0,0 +1,112 @@
+# 수면 빚 (최근 7/14일 Σ(목표 수면 시간 - 수면 시간), 기록 없는 날은 제외, 음수는 초과 수면)
+# 작성 시 새 날짜의 창 합계는 누적합 인덱스의 두 행 차이로 O(1) 계산 → 수면 기록에 함께 저장
+# 작성/수정으로 그날 값이 바뀌면 창 안에 그날이 포함되는 이후 기록(최대 13일)만 차이만큼 보정
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from sleep_record.models import SleepRecord
+
+from .models import User, UserLifetimeStats
+from .prefix_sums import PREFIX_SUM_COLUMNS, load_prefix_sums, range_totals
+
+# 창 크기 (일, SleepRecord.sleep_debt_<창 크기> 필드)
+SLEEP_DEBT_WINDOWS = (7, 14)
+
+# 저장된 수면 빚 전체 재계산 (목표 수면 시간 변경, 기능 도입 전 기록)
+# 날짜 RANGE 창 함수라 기록 없는 날은 자연히 제외됨
+REBUILD_SLEEP_DEBT_SQL = """
+    UPDATE sleep_record AS record
+    SET sleep_debt_7 = windowed.debt_7, sleep_debt_14 = windowed.debt_14
+    FROM (
+        SELECT night.sleep_record_id,
+            SUM(sleeper.sleep_target_minutes - night.sleep_duration) OVER (
+                PARTITION BY night.user_id ORDER BY night.date
+                RANGE BETWEEN INTERVAL '6 days' PRECEDING AND CURRENT ROW
+            ) AS debt_7,
+            SUM(sleeper.sleep_target_minutes - night.sleep_duration) OVER (
+                PARTITION BY night.user_id ORDER BY night.date
+                RANGE BETWEEN INTERVAL '13 days' PRECEDING AND CURRENT ROW
+            ) AS debt_14
+        FROM sleep_record AS night
+        JOIN {users} AS sleeper ON sleeper.user_id = night.user_id
+        {where}
+    ) AS windowed
+    WHERE record.sleep_record_id = windowed.sleep_record_id
+"""
+
+
+# 새 수면 기록의 창별 수면 빚 [7일, 14일] (그날 이전 창 합계는 누적합 인덱스에서 조회)
+def new_night_debts(user, day, minutes):
+    origin, prefix = load_prefix_sums(user)
+    totals = range_totals(
+        origin,
+        prefix,
+        [
+            (day - timedelta(days=window - 1), day - timedelta(days=1))
+            for window in SLEEP_DEBT_WINDOWS
+        ],
+    )
+    nights = totals[:, PREFIX_SUM_COLUMNS.index("sleep_days")]
+    slept = totals[:, PREFIX_SUM_COLUMNS.index("sleep_minutes")]
+    target = user.sleep_target_minutes
+    return [
+        int(target * (n + 1) - m - minutes)
+        for n, m in zip(nights.tolist(), slept.tolist())
+    ]
+
+
+# 마이페이지용 최신 수면 빚 갱신 (수면 기록 트랜잭션 안에서 호출)
+# delta: 이번 기록으로 바뀐 그날의 (목표 - 수면 시간), 이후 기록의 창 합계 보정량과 같음
+def update_latest_sleep_debt(user, record, delta):
+    UserLifetimeStats.objects.get_or_create(user=user)
+    lifetime = UserLifetimeStats.objects.select_for_update().get(pk=user.pk)
+    latest = lifetime.sleep_debt_date
+    if latest is None or record.date >= latest:
+        lifetime.sleep_debt_date = record.date
+        lifetime.sleep_debt_7 = record.sleep_debt_7
+        lifetime.sleep_debt_14 = record.sleep_debt_14
+    else:
+        gap = (latest - record.date).days
+        if gap < 7:
+            lifetime.sleep_debt_7 += delta
+        if gap < 14:
+            lifetime.sleep_debt_14 += delta
+    lifetime.save(
+        update_fields=[
+            "sleep_debt_date",
+            "sleep_debt_7",
+            "sleep_debt_14",
+            "updated_at",
+        ]
+    )
+
+
+# 저장된 수면 빚 + 누적 통계의 최신 수면 빚 재계산 (관리 명령어, 목표 수면 시간 변경 시)
+def rebuild_sleep_debts(user_ids=None):
+    where, params = "", []
+    if user_ids:
+        where, params = "WHERE night.user_id = ANY(%s)", [list(user_ids)]
+    sql = REBUILD_SLEEP_DEBT_SQL.format(users=User._meta.db_table, where=where)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            count = cursor.rowcount
+
+        # 유저별 마지막 수면 기록 (DISTINCT ON)
+        latest = SleepRecord.objects.order_by("user_id", "-date").distinct("user_id")
+        if user_ids:
+            latest = latest.filter(user_id__in=user_ids)
+        for user_id, day, debt_7, debt_14 in latest.values_list(
+            "user_id", "date", "sleep_debt_7", "sleep_debt_14"
+        ):
+            UserLifetimeStats.objects.update_or_create(
+                user_id=user_id,
+                defaults={
+                    "sleep_debt_date": day,
+                    "sleep_debt_7": debt_7,
+                    "sleep_debt_14": debt_14,
+                },
+            )
+    return count
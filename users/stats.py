@@ -0,0 +1,232 @@
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from cognitive_statistics.models import CognitiveResult
+from config.cache import bump_data_version
+from sleep_record.models import SleepRecord
+
+from .anomaly import detect_cognitive_anomalies
+from .baseline import update_cognitive_baseline
+from .correlation import update_correlation_stats
+from .heatmap import patch_heatmap
+from .highlights import update_highlights
+from .models import (
+    UserCorrelationStats,
+    UserDailyStats,
+    UserHighlights,
+    UserLifetimeStats,
+    UserPrefixSums,
+    UserYearHeatmap,
+)
+from .prefix_sums import update_prefix_sums
+from .reaction_sketch import add_reaction_times
+from .sleep_debt import update_latest_sleep_debt
+
+# 누적 통계 초기값 (기록이 하나도 없는 유저)
+EMPTY_LIFETIME_TOTALS = {
+    "total_sleep_minutes": 0,
+    "sleep_score_sum": 0,
+    "sleep_count": 0,
+    "cognitive_score_sum": 0,
+    "cognitive_count": 0,
+}
+
+
+# 누적 통계 행을 F 표현식으로 증감 (행이 없으면 먼저 생성)
+def _increment_lifetime_stats(user, **deltas):
+    UserLifetimeStats.objects.get_or_create(user=user)
+    UserLifetimeStats.objects.filter(pk=user.pk).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+# 커밋 이후 유저 데이터 버전 증가 (커밋 전 조회가 새 버전으로 캐시되는 것 방지)
+def _bump_after_commit(user):
+    transaction.on_commit(partial(bump_data_version, user.pk))
+
+
+# 수면 기록 작성/수정 시 해당 날짜 집계 행 및 누적 통계 갱신
+# previous: 수정 전 (sleep_duration, score), 신규 작성이면 None
+def apply_sleep_record(user, record, previous=None):
+    UserDailyStats.objects.update_or_create(
+        user=user,
+        date=record.date,
+        defaults={
+            "sleep_minutes": record.sleep_duration,
+            "sleep_score": record.score,
+        },
+    )
+    update_prefix_sums(user, record.date)
+    update_correlation_stats(user, record.date, sleep=previous)
+    update_highlights(user, record.date, "sleep", record.score, new_day=not previous)
+    patch_heatmap(user, record.date, "sleep_score", record.score)
+
+    old_minutes, old_score = previous or (0, 0)
+    _increment_lifetime_stats(
+        user,
+        total_sleep_minutes=record.sleep_duration - old_minutes,
+        sleep_score_sum=record.score - old_score,
+        sleep_count=0 if previous else 1,
+    )
+    # 그날 (목표 - 수면 시간) 변화량 = 이후 기록 수면 빚 보정량
+    debt_delta = (old_minutes if previous else user.sleep_target_minutes) - (
+        record.sleep_duration
+    )
+    update_latest_sleep_debt(user, record, debt_delta)
+    _bump_after_commit(user)
+
+
+# 인지 테스트 결과 저장 시 해당 날짜 집계 행에 점수/횟수 누적 (결과 POST 트랜잭션 안에서 호출)
+# reaction_times: 시행별 반응 시간(ms) 목록 (srt/symbol, 반응 시간 스케치에 추가)
+# 반환값: 결과 POST 응답용 {"baseline": 반영 전 개인 기준선 대비 요약, "anomalies": 이상 판정 지표}
+def apply_cognitive_result(user, kind, result, reaction_times=None):
+    UserDailyStats.objects.get_or_create(user=user, date=result.local_date)
+    # 같은 날짜 결과가 동시에 저장돼도 증가 전 값을 각각 정확히 읽도록 행 잠금
+    # (잠금 없이 읽으면 두 요청이 같은 이전 점수로 상관 통계를 보정해 변화량 하나가 누락됨)
+    stats = UserDailyStats.objects.select_for_update().get(
+        user=user, date=result.local_date
+    )
+    previous_score, new_day = stats.cognitive_score, stats.cognitive_count == 0
+    UserDailyStats.objects.filter(pk=stats.pk).update(
+        **{
+            f"{kind}_score_sum": F(f"{kind}_score_sum") + int(result.score or 0),
+            f"{kind}_count": F(f"{kind}_count") + 1,
+        }
+    )
+    update_prefix_sums(user, result.local_date)
+    update_correlation_stats(user, result.local_date, cognitive=previous_score)
+    stats.refresh_from_db()
+    update_highlights(
+        user, result.local_date, "cognitive", stats.cognitive_score, new_day=new_day
+    )
+    patch_heatmap(user, result.local_date, "cognitive_score", stats.cognitive_score)
+    _increment_lifetime_stats(
+        user, cognitive_score_sum=int(result.score or 0), cognitive_count=1
+    )
+    baseline = update_cognitive_baseline(user, kind, result)
+    anomalies = detect_cognitive_anomalies(user, kind, result)
+    if anomalies:
+        CognitiveResult.objects.filter(test_kind=kind, source_id=result.id).update(
+            anomalies=anomalies
+        )
+    if reaction_times:
+        add_reaction_times(user, kind, result.local_date, reaction_times)
+    _bump_after_commit(user)
+    return {"baseline": baseline, "anomalies": anomalies}
+
+
+# 원본 테이블에서 일별 집계 재계산 (관리 명령어에서 사용)
+def rebuild_daily_stats(user_ids=None, batch_size=1000):
+    rows = defaultdict(dict)
+
+    # 수면 기록: 유저+날짜당 1건
+    sleep_qs = SleepRecord.objects.all()
+    if user_ids:
+        sleep_qs = sleep_qs.filter(user_id__in=user_ids)
+    for r in sleep_qs.values("user_id", "date", "sleep_duration", "score").iterator(
+        chunk_size=batch_size
+    ):
+        rows[(r["user_id"], r["date"])].update(
+            sleep_minutes=r["sleep_duration"], sleep_score=r["score"]
+        )
+
+    # 인지 테스트: 통합 테이블에서 유저+날짜+종류 단위 합계/횟수 (GROUP BY 1회)
+    # test_kind 값이 집계 컬럼 접두어와 동일
+    result_qs = CognitiveResult.objects.all()
+    if user_ids:
+        result_qs = result_qs.filter(user_id__in=user_ids)
+    grouped = (
+        result_qs.values("user_id", "local_date", "test_kind")
+        .annotate(score_sum=Sum("score"), count=Count("id"))
+        .order_by()
+    )
+    for r in grouped.iterator(chunk_size=batch_size):
+        kind = r["test_kind"]
+        rows[(r["user_id"], r["local_date"])].update(
+            **{f"{kind}_score_sum": r["score_sum"], f"{kind}_count": r["count"]}
+        )
+
+    objs = [
+        UserDailyStats(user_id=user_id, date=day, **values)
+        for (user_id, day), values in rows.items()
+    ]
+
+    # 기존 집계를 지우고 한 트랜잭션 안에서 일괄 삽입
+    with transaction.atomic():
+        stale = UserDailyStats.objects.all()
+        if user_ids:
+            stale = stale.filter(user_id__in=user_ids)
+        stale.delete()
+        UserDailyStats.objects.bulk_create(objs, batch_size=batch_size)
+        # 누적합 인덱스/상관 통계/하이라이트/히트맵은 삭제 → 다음 조회/기록 시 새 일별 집계로 재생성
+        for model in (
+            UserPrefixSums,
+            UserCorrelationStats,
+            UserHighlights,
+            UserYearHeatmap,
+        ):
+            derived = model.objects.all()
+            if user_ids:
+                derived = derived.filter(user_id__in=user_ids)
+            derived.delete()
+
+    return len(objs)
+
+
+# 원본 테이블 기준 유저별 누적 통계 계산
+def _expected_lifetime_stats(user_ids=None):
+    expected = defaultdict(lambda: dict(EMPTY_LIFETIME_TOTALS))
+
+    sleep_qs = SleepRecord.objects.all()
+    if user_ids:
+        sleep_qs = sleep_qs.filter(user_id__in=user_ids)
+    for r in sleep_qs.values("user_id").annotate(
+        minutes=Sum("sleep_duration"), score_sum=Sum("score"), count=Count("id")
+    ):
+        expected[r["user_id"]].update(
+            total_sleep_minutes=r["minutes"] or 0,
+            sleep_score_sum=r["score_sum"] or 0,
+            sleep_count=r["count"],
+        )
+
+    result_qs = CognitiveResult.objects.all()
+    if user_ids:
+        result_qs = result_qs.filter(user_id__in=user_ids)
+    for r in result_qs.values("user_id").annotate(
+        score_sum=Sum("score"), count=Count("id")
+    ):
+        expected[r["user_id"]].update(
+            cognitive_score_sum=r["score_sum"] or 0, cognitive_count=r["count"]
+        )
+
+    return expected
+
+
+# 누적 통계와 원본 테이블의 차이(drift)를 찾아 복구
+# 반환값: 차이가 있었던 유저 id 목록
+def reconcile_lifetime_stats(user_ids=None, dry_run=False):
+    expected = _expected_lifetime_stats(user_ids)
+
+    stored_qs = UserLifetimeStats.objects.all()
+    if user_ids:
+        stored_qs = stored_qs.filter(user_id__in=user_ids)
+    stored = {s.user_id: s for s in stored_qs}
+
+    drifted = []
+    for user_id in sorted(set(expected) | set(stored)):
+        totals = expected.get(user_id) or dict(EMPTY_LIFETIME_TOTALS)
+        current = stored.get(user_id)
+        if current and all(
+            getattr(current, field) == value for field, value in totals.items()
+        ):
+            continue
+
+        drifted.append(user_id)
+        if not dry_run:
+            UserLifetimeStats.objects.update_or_create(user_id=user_id, defaults=totals)
+            bump_data_version(user_id)
+
+    return drifted
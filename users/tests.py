@@ -0,0 +1,859 @@
+import base64
+from datetime import date, datetime, timedelta, timezone
+from importlib import import_module
+
+import numpy as np
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cognitive_statistics.models import (
+    CognitiveResult,
+    CognitiveSession,
+    CognitiveTestFormat,
+    CognitiveTestType,
+)
+from config.tiered_cache import clear_local_caches
+from sleep_record.models import SleepRecord
+from users.baseline import BASELINE_ALPHA
+from users.correlation import build_correlation_stats, get_lag_correlations
+from users.highlights import build_highlights
+from users.models import (
+    User,
+    UserDailyStats,
+    UserLifetimeStats,
+    UserPrefixSums,
+    UserYearHeatmap,
+)
+from users.prefix_sums import build_prefix_sums
+from users.services import get_cognitive_detail
+from users.stats import apply_cognitive_result, reconcile_lifetime_stats
+from users.utils import bucket_of, local_today, to_local_date
+
+
+# 유저/기록 작성 API 테스트 공통 준비 (다른 앱 테스트에서도 사용)
+class UserAPITestCase(APITestCase):
+    def setUp(self):
+        # 테스트 간 롤백은 무효화 신호를 보내지 않으므로 캐시를 직접 비움
+        cache.delete_pattern("*")
+        clear_local_caches()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            social_type="KAKAO",
+            social_id="user_kakao_1",
+            nickname="tester",
+        )
+        self.test_format = CognitiveTestFormat.objects.create(
+            test_type=CognitiveTestType.objects.create(name="basic"),
+            name="basic",
+            order=1,
+        )
+        self.today = local_today(self.user)
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access_token)
+
+    def post_sleep_record(self, day, sleep_duration=480):
+        return self.client.post(
+            "/api/sleepRecord/",
+            {
+                "date": str(day),
+                "sleep_duration": sleep_duration,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+
+    def post_cognitive_results(self, scores):
+        session = CognitiveSession.objects.create(
+            user=self.user, test_format=self.test_format
+        )
+        srt, pattern, symbol = scores
+        self.client.post(
+            "/api/cognitive-statistics/result/srt/",
+            {
+                "cognitiveSession": session.id,
+                "score": srt,
+                "reactionAvgMs": 300,
+                "reactionList": [300],
+            },
+            format="json",
+        )
+        self.client.post(
+            "/api/cognitive-statistics/result/pattern/",
+            {"cognitiveSession": session.id, "score": pattern},
+            format="json",
+        )
+        self.client.post(
+            "/api/cognitive-statistics/result/symbol/",
+            {"cognitiveSession": session.id, "score": symbol},
+            format="json",
+        )
+
+
+class TestUserDailyStats(UserAPITestCase):
+    def test_writes_keep_daily_stats_current(self):
+        self.post_sleep_record(self.today)
+        self.post_cognitive_results((90, 60, 30))
+
+        stats = UserDailyStats.objects.get(user=self.user, date=self.today)
+        self.assertEqual(stats.sleep_minutes, 480)
+        self.assertEqual(stats.srt_count, 1)
+        self.assertEqual(stats.cognitive_score, 60.0)
+
+        response = self.client.get("/api/users/mypage/records/list/?period=day")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["cognitive_score"], 60.0)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.post_sleep_record(self.today)
+        self.post_cognitive_results((80, 70, 60))
+        before = UserDailyStats.objects.values().get(user=self.user)
+
+        call_command("rebuild_daily_stats", user_ids=[self.user.user_id])
+
+        after = UserDailyStats.objects.values().get(user=self.user)
+        for key in ("sleep_minutes", "sleep_score", "srt_score_sum", "symbol_count"):
+            self.assertEqual(before[key], after[key])
+
+    def test_month_list_query_count_is_constant(self):
+        self.post_sleep_record(self.today)
+        with self.assertNumQueries(2):
+            # 유저 필드 1회 + 집계 범위 조회 1회 (인증 필드는 캐시에서 조회)
+            response = self.client.get("/api/users/mypage/records/list/?period=month")
+        self.assertEqual(response.status_code, 200)
+
+    def test_record_buckets_by_granularity(self):
+        for day in ("2025-01-10", "2025-02-10", "2025-05-01"):
+            self.post_sleep_record(day, sleep_duration=420)
+
+        for granularity, expected in (("day", 3), ("month", 3), ("quarter", 2)):
+            with self.assertNumQueries(1):
+                response = self.client.get(
+                    "/api/users/mypage/records/list/",
+                    {
+                        "granularity": granularity,
+                        "start": "2025-01-01",
+                        "end": "2025-12-31",
+                    },
+                )
+            self.assertEqual(len(response.data["results"]), expected)
+
+        quarter = response.data["results"][0]
+        self.assertEqual(quarter["label"], "2025-Q1")
+        self.assertEqual(quarter["total_sleep_hours"], 14.0)
+
+    def test_week_list_covers_monday_to_sunday_weeks(self):
+        first_monday = bucket_of(self.today - timedelta(weeks=3), "week")[0]
+        self.post_sleep_record(first_monday, sleep_duration=420)
+        self.post_sleep_record(self.today, sleep_duration=480)
+
+        response = self.client.get("/api/users/mypage/records/list/?period=week")
+        first, last = response.data["results"]
+        # 첫 주는 3주 전 날짜 이전의 월요일 기록까지 포함
+        self.assertEqual(first["week"], 1)
+        self.assertEqual(first["start_date"], str(first_monday))
+        self.assertEqual(first["total_sleep_hours"], 7.0)
+        self.assertEqual(last["end_date"], str(bucket_of(self.today, "week")[1]))
+
+    def test_record_buckets_reject_unbounded_ranges(self):
+        for params in (
+            {"granularity": "day", "start": "2024-01-01", "end": "2025-12-31"},
+            {"granularity": "month", "start": "0001-01-01", "end": "2025-12-31"},
+            # 기본 시작일 계산이 date 범위를 넘는 종료일
+            {"granularity": "year", "end": "0001-01-02"},
+            {"granularity": "day", "start": "9999-12-30", "end": "9999-12-31"},
+        ):
+            response = self.client.get("/api/users/mypage/records/list/", params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_local_date_uses_user_timezone_and_cutover(self):
+        # 2025-03-01 17:30 UTC == 2025-03-02 02:30 KST
+        created_at = datetime(2025, 3, 1, 17, 30, tzinfo=timezone.utc)
+        self.assertEqual(to_local_date(self.user, created_at), date(2025, 3, 2))
+
+        # 야간 근무자는 정오 이전 기록을 전날로 집계
+        self.client.post(
+            "/api/users/onboarding/job/",
+            {"cognitive_type": "physical", "work_time_pattern": "shift_night"},
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.day_cutover_hour, 12)
+        self.assertEqual(to_local_date(self.user, created_at), date(2025, 3, 1))
+
+
+class TestUserLifetimeStats(UserAPITestCase):
+    def test_lifetime_stats_follow_edits_and_reconcile(self):
+        self.post_sleep_record(self.today, sleep_duration=480)
+        self.client.patch(
+            f"/api/sleepRecord/?date={self.today}",
+            {
+                "date": str(self.today),
+                "sleep_duration": 420,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        self.post_cognitive_results((90, 60, 30))
+
+        lifetime = UserLifetimeStats.objects.get(pk=self.user.pk)
+        self.assertEqual(lifetime.total_sleep_minutes, 420)
+        self.assertEqual(lifetime.sleep_count, 1)
+        self.assertEqual(lifetime.average_cognitive_score, 60.0)
+
+        # 유저 필드 1회 + 누적 통계 행 1회
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/users/mypage/main/")
+        self.assertEqual(response.data["total_sleep_hours"], 7.0)
+
+        UserLifetimeStats.objects.filter(pk=self.user.pk).update(sleep_count=5)
+        self.assertEqual(reconcile_lifetime_stats(), [self.user.user_id])
+        self.assertEqual(reconcile_lifetime_stats(), [])
+
+
+class TestRecordGraph(UserAPITestCase):
+    def test_graph_series_for_month_and_year_spans(self):
+        self.post_sleep_record("2025-03-02", sleep_duration=450)
+        self.post_sleep_record("2025-11-30", sleep_duration=390)
+
+        response = self.client.get("/api/users/mypage/records/2025-03-02/detail/")
+        graph = response.data["graph"]
+        self.assertEqual(len(graph["dates"]), 31)
+        self.assertEqual(graph["dates"][1], "2025-03-02")
+        self.assertEqual(graph["sleep_hour_list"][:3], [0.0, 7.5, 0.0])
+
+        with self.assertNumQueries(4):
+            # 그래프 1회 (기간과 무관) + 수면 상세 1회 + 인지 상세(집계+기준선) 2회
+            response = self.client.get(
+                "/api/users/mypage/records/2025-03-02/detail/?span=year"
+            )
+        graph = response.data["graph"]
+        self.assertEqual(len(graph["dates"]), 365)
+        self.assertEqual(graph["sleep_hour_list"][333], 6.5)
+        self.assertEqual(graph["selected_date"], "2025-03-02")
+
+    def test_moving_average_and_trend_overlays(self):
+        for day, minutes in (
+            ("2025-02-28", 360),
+            ("2025-03-01", 420),
+            ("2025-03-02", 480),
+            ("2025-03-03", 540),
+        ):
+            self.post_sleep_record(day, sleep_duration=minutes)
+
+        with self.assertNumQueries(4):
+            # 오버레이를 포함해도 그래프 조회는 1회
+            response = self.client.get(
+                "/api/users/mypage/records/2025-03-01/detail/?ma=7&trend=linear"
+            )
+        graph = response.data["graph"]
+        # 기간 밖(2/28) 기록도 첫날 이동 평균에 반영
+        ma = graph["moving_average"]["7"]["sleep_hours"]
+        self.assertEqual(ma[:4], [6.5, 7.0, 7.5, 7.5])
+        self.assertEqual(ma[8], 9.0)
+        self.assertIsNone(ma[9])
+        trend = graph["trend"]["sleep_hours"]
+        self.assertEqual((trend["slope"], trend["intercept"]), (1.0, 7.0))
+        self.assertIsNone(graph["trend"]["cognitive_score"])
+
+        response = self.client.get(
+            "/api/users/mypage/records/list/",
+            {"granularity": "week", "start": "2025-02-24", "end": "2025-03-09"},
+        )
+        self.assertNotIn("overlays", response.data)
+        response = self.client.get(
+            "/api/users/mypage/records/list/",
+            {
+                "granularity": "week",
+                "start": "2025-02-24",
+                "end": "2025-03-09",
+                "ma": "28",
+            },
+        )
+        overlays = response.data["overlays"]
+        self.assertEqual(len(overlays["moving_average"]["28"]["sleep_score"]), 14)
+
+        response = self.client.get("/api/users/mypage/records/list/?period=day&ma=1")
+        self.assertEqual(response.status_code, 400)
+
+    def test_graph_and_range_queries_reject_unbounded_dates(self):
+        for url in (
+            # 이동 평균 앞당김 계산이 date 범위를 넘는 날짜
+            "/api/users/mypage/records/0001-01-05/detail/?ma=365",
+            "/api/users/mypage/records/9999-12-31/detail/",
+        ):
+            self.assertEqual(self.client.get(url).status_code, 400)
+
+        for params in (
+            {"start": "2024-01-01", "end": "2025-12-31"},
+            {"start": "0001-01-01", "end": "0001-01-02"},
+        ):
+            response = self.client.get("/api/users/mypage/reaction-times/", params)
+            self.assertEqual(response.status_code, 400)
+
+        # 누적합 기간 통계는 날짜 범위만 검증 (기간 길이 제한 없음)
+        response = self.client.get(
+            "/api/users/mypage/records/range/",
+            {"start": "2000-01-01", "end": "2025-12-31"},
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            "/api/users/mypage/records/range/",
+            {"start": "0001-01-01", "end": "2025-12-31"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestPrefixSumRangeStats(UserAPITestCase):
+    def test_range_stats_follow_prefix_sum_updates(self):
+        for day in ("2025-01-10", "2025-02-10", "2025-05-01"):
+            self.post_sleep_record(day, sleep_duration=420)
+
+        params = {"start": "2025-02-01", "end": "2025-05-31"}
+        with self.assertNumQueries(1):
+            # 누적합 인덱스 조회 1회 (인증 유저는 캐시에서 조회)
+            response = self.client.get("/api/users/mypage/records/range/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["days"], 120)
+        self.assertEqual(response.data["sleep_days"], 2)
+        self.assertEqual(response.data["total_sleep_hours"], 14.0)
+
+        # 중간 날짜 수정 → 이후 누적합만 보정
+        self.client.patch(
+            "/api/sleepRecord/?date=2025-02-10",
+            {
+                "date": "2025-02-10",
+                "sleep_duration": 480,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        response = self.client.get("/api/users/mypage/records/range/", params)
+        self.assertEqual(response.data["total_sleep_hours"], 15.0)
+
+        # 증분 갱신 결과 = 전체 재생성 결과
+        incremental = bytes(UserPrefixSums.objects.get(user=self.user).sums)
+        build_prefix_sums(self.user)
+        rebuilt = bytes(UserPrefixSums.objects.get(user=self.user).sums)
+        self.assertEqual(incremental, rebuilt)
+
+        response = self.client.get(
+            "/api/users/mypage/records/range/",
+            {"start": "2025-05-31", "end": "2025-02-01"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestSleepCognitionCorrelation(UserAPITestCase):
+    def test_correlation_stats_follow_incremental_updates(self):
+        days = [date(2025, 3, d) for d in range(1, 7)]
+        minutes = [300, 360, 420, 480, 540, 390]
+        scores = [50, 55, 70, 65, 90, 60]
+        for day, duration in zip(days, minutes):
+            self.post_sleep_record(day, sleep_duration=duration)
+        for day, score in zip(days, scores):
+            apply_cognitive_result(
+                self.user, "srt", CognitiveResult(local_date=day, score=score)
+            )
+
+        with self.assertNumQueries(1):
+            # 상관 통계 행 조회 1회 (인증 유저는 캐시에서 조회)
+            response = self.client.get("/api/users/mypage/insights/correlation/")
+        same_day = response.data["same_day"]
+        self.assertEqual(same_day["n"], 6)
+        self.assertAlmostEqual(
+            same_day["sleep_duration"]["r"], np.corrcoef(minutes, scores)[0, 1], 3
+        )
+        self.assertAlmostEqual(
+            same_day["sleep_duration"]["slope"], np.polyfit(minutes, scores, 1)[0], 3
+        )
+        next_day = response.data["next_day"]
+        self.assertEqual(next_day["n"], 5)
+        self.assertAlmostEqual(
+            next_day["sleep_duration"]["r"],
+            np.corrcoef(minutes[:-1], scores[1:])[0, 1],
+            3,
+        )
+
+        # 수정(표본 제거 + 추가) 후에도 전체 재계산 결과와 동일
+        self.client.patch(
+            "/api/sleepRecord/?date=2025-03-03",
+            {
+                "date": "2025-03-03",
+                "sleep_duration": 600,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        incremental = self.client.get("/api/users/mypage/insights/correlation/").data
+        build_correlation_stats(self.user)
+        rebuilt = self.client.get("/api/users/mypage/insights/correlation/").data
+        self.assertEqual(incremental, rebuilt)
+        minutes[2] = 600
+        self.assertAlmostEqual(
+            rebuilt["same_day"]["sleep_duration"]["r"],
+            np.corrcoef(minutes, scores)[0, 1],
+            3,
+        )
+
+    def test_same_day_results_lock_the_daily_row(self):
+        self.post_sleep_record(date(2025, 3, 1), sleep_duration=420)
+        for score in (60, 80):
+            with CaptureQueriesContext(connection) as context:
+                apply_cognitive_result(
+                    self.user,
+                    "srt",
+                    CognitiveResult(local_date=date(2025, 3, 1), score=score),
+                )
+            # 이전 점수는 잠근 행에서 읽음 (동시 결과가 같은 이전 점수로 보정하지 않음)
+            self.assertTrue(
+                any(
+                    "users_userdailystats" in q["sql"] and "FOR UPDATE" in q["sql"]
+                    for q in context.captured_queries
+                )
+            )
+        incremental = self.client.get("/api/users/mypage/insights/correlation/").data
+        build_correlation_stats(self.user)
+        rebuilt = self.client.get("/api/users/mypage/insights/correlation/").data
+        self.assertEqual(incremental, rebuilt)
+
+    def test_lag_correlation_is_cached_until_data_changes(self):
+        days = [date(2025, 3, d) for d in range(1, 9)]
+        minutes = [300, 360, 420, 480, 540, 390, 450, 510]
+        scores = [50, 55, 70, 65, 90, 60, 75, 80]
+        for day, duration in zip(days, minutes):
+            self.post_sleep_record(day, sleep_duration=duration)
+        for day, score in zip(days, scores):
+            apply_cognitive_result(
+                self.user, "srt", CognitiveResult(local_date=day, score=score)
+            )
+
+        url = "/api/users/mypage/insights/lag-correlation/"
+        response = self.client.get(url)
+        lags = response.data["lags"]
+        self.assertEqual(len(lags), 8)
+        self.assertAlmostEqual(
+            lags[0]["sleep_duration_r"], np.corrcoef(minutes, scores)[0, 1], 3
+        )
+        self.assertAlmostEqual(
+            lags[2]["sleep_duration_r"],
+            np.corrcoef(minutes[:-2], scores[2:])[0, 1],
+            3,
+        )
+        self.assertEqual([lag["n"] for lag in lags], [8, 7, 6, 5, 4, 3, 2, 1])
+        self.assertIsNone(lags[6]["sleep_duration_r"])
+
+        # 긴 기록은 프로세스 풀에서 계산 (결과 동일)
+        with self.settings(LAG_CORRELATION_POOL_MIN_DAYS=1):
+            self.assertEqual(get_lag_correlations(self.user)["lags"], lags)
+
+        with self.assertNumQueries(0):
+            # 데이터 버전이 같으면 캐시 응답
+            self.assertEqual(self.client.get(url).data, response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_sleep_record(date(2025, 3, 9))
+        self.assertEqual(self.client.get(url).data["end_date"], "2025-03-09")
+
+
+class TestCohortPercentiles(UserAPITestCase):
+    def test_cohort_percentiles_from_nightly_histograms(self):
+        User.objects.filter(pk=self.user.pk).update(gender="남")
+        for i, duration in enumerate((300, 330, 360, 390, 420, 450, 510, 540, 570)):
+            other = User.objects.create_user(
+                email=f"other{i}@example.com",
+                social_type="KAKAO",
+                social_id=f"other_{i}",
+                nickname=f"other{i}",
+                gender="남" if i % 2 else "여",
+            )
+            SleepRecord.objects.create(
+                user=other,
+                date=self.today,
+                sleep_duration=duration,
+                subjective_quality=3,
+                sleep_latency=0,
+                wake_count=0,
+                disturb_factors=[],
+                score=70,
+            )
+        self.post_sleep_record(self.today, sleep_duration=480)
+
+        # 워커 없이 유저 4명 단위 범위로 나눠 생성 → 범위별 부분 히스토그램 병합
+        call_command("build_cohort_histograms", workers=0, batch_size=4)
+
+        with self.assertNumQueries(4):
+            # 유저 필드/누적 통계/직업 설문/히스토그램 각 1회 (원본 기록 조회 없음)
+            response = self.client.get("/api/users/mypage/insights/percentiles/")
+        metrics = {m["metric"]: m for m in response.data["metrics"]}
+        sleep_duration = metrics["sleep_duration"]
+        self.assertEqual(sleep_duration["value"], 480.0)
+        cohorts = {c["dimension"]: c for c in sleep_duration["cohorts"]}
+        self.assertEqual(cohorts["all"]["user_count"], 10)
+        self.assertEqual(cohorts["all"]["percentile"], 60.0)
+        # 남성 코호트: 330, 390, 450, 540 + 본인
+        self.assertEqual(cohorts["gender"]["user_count"], 5)
+        self.assertEqual(cohorts["gender"]["percentile"], 60.0)
+        self.assertEqual(metrics["cognitive_score"]["cohorts"], [])
+
+
+class TestCognitiveBaseline(UserAPITestCase):
+    def test_result_post_reports_z_score_against_ewma_baseline(self):
+        session = CognitiveSession.objects.create(
+            user=self.user, test_format=self.test_format
+        )
+        scores = [60, 62, 58, 61, 90]
+        for score in scores:
+            response = self.client.post(
+                "/api/cognitive-statistics/result/srt/",
+                {
+                    "cognitiveSession": session.id,
+                    "score": score,
+                    "reactionAvgMs": 300,
+                    "reactionList": [300],
+                },
+                format="json",
+            )
+
+        # 마지막 결과 이전 4개로 계산한 지수 가중 평균/분산
+        mean, var = 60.0, 0.0
+        for score in scores[1:-1]:
+            diff = score - mean
+            mean += BASELINE_ALPHA * diff
+            var = (1 - BASELINE_ALPHA) * (var + diff * BASELINE_ALPHA * diff)
+        baseline = response.data["baseline"]
+        self.assertEqual(baseline["count"], 4)
+        self.assertEqual(baseline["mean"], round(mean, 1))
+        self.assertEqual(baseline["z_score"], round((90 - mean) / var**0.5, 2))
+        self.assertGreater(baseline["z_score"], 3)
+
+        detail = get_cognitive_detail(self.user, self.today)
+        self.assertIsNotNone(detail["srt_z_score"])
+        self.assertIsNone(detail["pattern_z_score"])
+
+
+class TestReactionTimeSketches(UserAPITestCase):
+    def test_reaction_time_sketches_merge_over_period(self):
+        session = CognitiveSession.objects.create(
+            user=self.user, test_format=self.test_format
+        )
+        srt_times = [200, 250, 300, 350, 600, 700, 280, 320, 260, 240]
+        for times in (srt_times[:5], srt_times[5:]):
+            self.client.post(
+                "/api/cognitive-statistics/result/srt/",
+                {
+                    "cognitiveSession": session.id,
+                    "score": 80,
+                    "reactionAvgMs": 300,
+                    "reactionList": times,
+                },
+                format="json",
+            )
+        self.client.post(
+            "/api/cognitive-statistics/result/symbol/",
+            {"cognitiveSession": session.id, "score": 70, "reactionTimes": [400, 520]},
+            format="json",
+        )
+
+        params = {"start": str(self.today), "end": str(self.today)}
+        with self.assertNumQueries(1):
+            # 스케치 조회 1회 (reaction_list 파싱 없음)
+            response = self.client.get("/api/users/mypage/reaction-times/", params)
+        srt, symbol = response.data["results"]
+        self.assertEqual(srt["trial_count"], 10)
+        # 순위 기준 분위수 (5번째 280ms, 9번째 600ms), 로그 구간 상대 오차 (약 1%) 이내
+        self.assertAlmostEqual(srt["median_ms"], 280, delta=6)
+        self.assertAlmostEqual(srt["p90_ms"], 600, delta=12)
+        self.assertEqual(srt["lapse_rate"], 0.2)
+        self.assertEqual(symbol["trial_count"], 2)
+        self.assertEqual(symbol["lapse_rate"], 0.5)
+
+        # 기존 reaction_list로 재생성해도 같은 분포
+        call_command("rebuild_reaction_sketches", user_ids=[self.user.user_id])
+        rebuilt = self.client.get("/api/users/mypage/reaction-times/", params).data
+        self.assertEqual(rebuilt, response.data)
+
+
+class TestAnomalyDetection(UserAPITestCase):
+    def test_sleep_anomaly_is_flagged_on_write_and_surfaced(self):
+        for offset, minutes in enumerate([480, 470, 490, 480, 475]):
+            self.post_sleep_record(
+                self.today - timedelta(days=6 - offset), sleep_duration=minutes
+            )
+        response = self.post_sleep_record(
+            self.today - timedelta(days=1), sleep_duration=240
+        )
+        self.assertEqual(response.status_code, 201)
+
+        record = SleepRecord.objects.get(
+            user=self.user, date=self.today - timedelta(days=1)
+        )
+        self.assertEqual(list(record.anomalies), ["sleep_duration"])
+        self.assertLess(record.anomalies["sleep_duration"], -3)
+
+        # 유저 필드 1회 + 누적 통계 행 1회
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/users/mypage/main/")
+        alerts = response.data["alerts"]
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]["metric"], "sleep_duration")
+        self.assertEqual(alerts[0]["value"], 240)
+
+        # 수정 시 판정만 다시 하고 탐지 상태에는 중복 반영하지 않음
+        state = UserLifetimeStats.objects.get(pk=self.user.pk).anomaly_state
+        self.client.patch(
+            f"/api/sleepRecord/?date={self.today - timedelta(days=1)}",
+            {
+                "date": str(self.today - timedelta(days=1)),
+                "sleep_duration": 480,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        lifetime = UserLifetimeStats.objects.get(pk=self.user.pk)
+        self.assertEqual(lifetime.anomaly_state, state)
+        self.assertEqual(lifetime.recent_alerts, [])
+        record.refresh_from_db()
+        self.assertEqual(record.anomalies, {})
+
+
+class TestHighlights(UserAPITestCase):
+    def test_highlights_follow_writes_and_out_of_order_dates(self):
+        # 점수: 480분 95 / 400분 90 / 370분 85 / 340분 80 / 310분 75 / 280분 70
+        nights = {9: 480, 8: 400, 7: 370, 1: 340, 0: 310}
+        for offset, minutes in nights.items():
+            self.post_sleep_record(self.today - timedelta(days=offset), minutes)
+        self.post_cognitive_results((90, 60, 30))
+
+        # 유저 필드 1회 + 인덱스 행 1회
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/users/mypage/highlights/")
+        self.assertEqual(response.data["sleep_streak"]["current"], 2)
+        self.assertEqual(response.data["sleep_streak"]["longest"], 3)
+        self.assertEqual(response.data["cognitive_streak"]["current"], 1)
+        self.assertEqual(
+            [day["score"] for day in response.data["best_sleep_days"]],
+            [95, 90, 85, 80, 75],
+        )
+        self.assertEqual(response.data["best_cognitive_days"][0]["score"], 60.0)
+
+        # 마지막 연속 구간 이전 날짜 추가 → 연속 기록 재계산
+        self.post_sleep_record(self.today - timedelta(days=6), 280)
+        # 상위 목록에 있던 날짜 점수 하락 → 상위 목록 재계산
+        self.client.patch(
+            f"/api/sleepRecord/?date={self.today - timedelta(days=9)}",
+            {
+                "date": str(self.today - timedelta(days=9)),
+                "sleep_duration": 280,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        response = self.client.get("/api/users/mypage/highlights/")
+        self.assertEqual(response.data["sleep_streak"]["longest"], 4)
+        self.assertEqual(
+            [day["score"] for day in response.data["best_sleep_days"]],
+            [90, 85, 80, 75, 70],
+        )
+
+        # 증분 갱신 결과 = 전체 재생성 결과
+        build_highlights(self.user)
+        self.assertEqual(
+            self.client.get("/api/users/mypage/highlights/").data, response.data
+        )
+
+
+class TestSleepDebt(UserAPITestCase):
+    def test_sleep_debt_follows_inserts_and_edits_within_window(self):
+        nights = {9: 420, 8: 480, 3: 400, 1: 450}
+        for offset, minutes in nights.items():
+            self.post_sleep_record(self.today - timedelta(days=offset), minutes)
+        # 중간 날짜 추가/수정 → 창 안의 이후 기록만 보정
+        self.post_sleep_record(self.today - timedelta(days=5), 360)
+        self.client.patch(
+            f"/api/sleepRecord/?date={self.today - timedelta(days=8)}",
+            {
+                "date": str(self.today - timedelta(days=8)),
+                "sleep_duration": 300,
+                "subjective_quality": 3,
+                "sleep_latency": 0,
+                "wake_count": 0,
+                "disturb_factors": [],
+                "memo": "",
+            },
+            format="json",
+        )
+        nights.update({5: 360, 8: 300})
+
+        def expected(offset, window):
+            return sum(
+                480 - minutes
+                for other, minutes in nights.items()
+                if offset <= other < offset + window
+            )
+
+        records = SleepRecord.objects.filter(user=self.user)
+        for record in records:
+            offset = (self.today - record.date).days
+            self.assertEqual(record.sleep_debt_7, expected(offset, 7))
+            self.assertEqual(record.sleep_debt_14, expected(offset, 14))
+
+        # 유저 필드 1회 + 누적 통계 행 1회
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/users/mypage/main/")
+        debt = response.data["sleep_debt"]
+        self.assertEqual(debt["debt_7"], expected(1, 7))
+        self.assertEqual(debt["debt_14"], expected(1, 14))
+
+        # 창 함수 재계산 결과 = 증분 결과
+        incremental = list(records.values_list("sleep_debt_7", "sleep_debt_14"))
+        call_command("rebuild_sleep_debts", user_ids=[self.user.user_id])
+        self.assertEqual(
+            list(records.values_list("sleep_debt_7", "sleep_debt_14")), incremental
+        )
+
+        # 목표 수면 시간 변경 → 저장된 수면 빚 재계산
+        self.client.patch(
+            "/api/users/mypage/profile/", {"sleep_target_minutes": 420}, format="json"
+        )
+        record = records.get(date=self.today - timedelta(days=1))
+        self.assertEqual(record.sleep_debt_7, expected(1, 7) - 60 * 3)
+
+    def test_migration_backfills_debts_of_existing_records(self):
+        for offset, minutes in {3: 400, 2: 420, 1: 450}.items():
+            self.post_sleep_record(self.today - timedelta(days=offset), minutes)
+        records = SleepRecord.objects.filter(user=self.user).order_by("date")
+        debts = list(records.values_list("sleep_debt_7", "sleep_debt_14"))
+
+        # 기능 도입 전 기록 (컬럼 기본값 0)
+        records.update(sleep_debt_7=0, sleep_debt_14=0)
+        UserLifetimeStats.objects.filter(pk=self.user.pk).update(
+            sleep_debt_date=None, sleep_debt_7=0, sleep_debt_14=0
+        )
+        migration = import_module("users.migrations.0014_backfill_sleep_debt")
+        with connection.schema_editor() as schema_editor:
+            migration.backfill_sleep_debt(apps, schema_editor)
+
+        self.assertEqual(
+            list(records.values_list("sleep_debt_7", "sleep_debt_14")), debts
+        )
+        lifetime = UserLifetimeStats.objects.get(pk=self.user.pk)
+        self.assertEqual(lifetime.sleep_debt_date, self.today - timedelta(days=1))
+        self.assertEqual((lifetime.sleep_debt_7, lifetime.sleep_debt_14), debts[-1])
+
+
+class TestYearHeatmap(UserAPITestCase):
+    def test_year_heatmap_is_patched_in_place(self):
+        self.post_sleep_record("2025-03-01", 480)
+        self.post_sleep_record("2025-12-31", 340)
+        self.post_cognitive_results((90, 60, 30))
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/users/mypage/heatmap/2025/")
+        self.assertEqual(response.data["days"], 365)
+        sleep = base64.b64decode(response.data["sleep_score"])
+        self.assertEqual(len(sleep), 366)
+        self.assertEqual(sleep[59], 95)
+        self.assertEqual(sleep[364], 80)
+        self.assertEqual(sum(byte != 255 for byte in sleep), 2)
+
+        today = self.client.get(
+            f"/api/users/mypage/heatmap/{self.today.year}/", {"encoding": "binary"}
+        )
+        self.assertEqual(today["Content-Type"], "application/octet-stream")
+        self.assertEqual(len(today.content), 732)
+        self.assertEqual(today.content[366 + self.today.timetuple().tm_yday - 1], 60)
+
+        # 증분 패치 결과 = 일별 집계로 재생성한 결과
+        UserYearHeatmap.objects.filter(user=self.user, year=2025).delete()
+        rebuilt = self.client.get("/api/users/mypage/heatmap/2025/")
+        self.assertEqual(rebuilt.data, response.data)
+
+        response = self.client.get(
+            "/api/users/mypage/heatmap/2025/", {"encoding": "hex"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_write_without_heatmap_row_rebuilds_the_year(self):
+        self.post_sleep_record("2025-03-01", 480)
+        self.post_sleep_record("2025-03-02", 400)
+
+        # 기능 도입 전 기록/재집계 이후처럼 행이 없는 상태에서 새 기록 작성
+        UserYearHeatmap.objects.filter(user=self.user, year=2025).delete()
+        self.post_sleep_record("2025-12-31", 340)
+
+        heatmap = UserYearHeatmap.objects.get(user=self.user, year=2025)
+        sleep = bytes(heatmap.sleep_score)
+        self.assertEqual((sleep[59], sleep[60], sleep[364]), (95, 90, 80))
+        self.assertEqual(sum(byte != 255 for byte in sleep), 3)
+
+
+class TestRecordDetails(UserAPITestCase):
+    def test_multi_date_details_use_grouped_queries(self):
+        yesterday = self.today - timedelta(days=1)
+        self.post_sleep_record(yesterday, sleep_duration=450)
+        self.post_sleep_record(self.today, sleep_duration=480)
+        self.post_cognitive_results((90, 60, 30))
+        # 같은 세션 패턴 재시도 → 세션별 최신 결과만 반영
+        session = CognitiveSession.objects.latest("id")
+        self.client.post(
+            "/api/cognitive-statistics/result/pattern/",
+            {"cognitiveSession": session.id, "score": 80},
+            format="json",
+        )
+
+        dates = [self.today, yesterday, self.today - timedelta(days=2)]
+        with self.assertNumQueries(3):
+            # 수면 1회 + 인지 GROUP BY 1회 + 기준선 1회 (날짜 수와 무관)
+            response = self.client.get(
+                "/api/users/mypage/records/details/",
+                {"dates": ",".join(str(day) for day in dates)},
+            )
+        self.assertEqual(response.status_code, 200)
+        empty, before, selected = response.data["results"]
+        self.assertEqual(empty["total_sleep_hours"], 0)
+        self.assertIsNone(empty["sleep_debt_7"])
+        self.assertEqual(before["total_sleep_hours"], 7.5)
+        self.assertEqual(before["cognitive_test"]["srt_score"], 0)
+        self.assertEqual(selected["cognitive_test"]["pattern_score"], 80.0)
+        self.assertEqual(selected["cognitive_test"]["srt_score"], 90.0)
+
+        # 단일 날짜 상세와 같은 카드
+        single = self.client.get(f"/api/users/mypage/records/{self.today}/detail/")
+        self.assertEqual(single.data["detail"], selected)
+        # 기록이 없는 날도 404가 아닌 기본값 카드
+        single = self.client.get(f"/api/users/mypage/records/{dates[2]}/detail/")
+        self.assertEqual(single.status_code, 200)
+        self.assertEqual(single.data["detail"], empty)
+
+        response = self.client.get(
+            "/api/users/mypage/records/details/", {"dates": "2025-13-01"}
+        )
+        self.assertEqual(response.status_code, 400)
@@ -5,10 +5,18 @@ from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     LogoutView,
+    MypageCorrelationView,
+    MypageHeatmapView,
+    MypageHighlightsView,
+    MypageLagCorrelationView,
     MypageMainView,
+    MypagePercentileView,
     MypageProfileView,
+    MypageReactionTimeView,
     MypageRecordDateDetailView,
+    MypageRecordDetailsView,
     MypageRecordListView,
+    MypageRecordRangeView,
     OnboardingBasicView,
     OnboardingJobView,
     SocialLoginView,
@@ -29,9 +37,49 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
         MypageRecordListView.as_view(),
         name="mypage-record-list",
     ),
+    path(
+        "mypage/records/range/",
+        MypageRecordRangeView.as_view(),
+        name="mypage-record-range",
+    ),
+    path(
+        "mypage/reaction-times/",
+        MypageReactionTimeView.as_view(),
+        name="mypage-reaction-times",
+    ),
+    path(
+        "mypage/highlights/",
+        MypageHighlightsView.as_view(),
+        name="mypage-highlights",
+    ),
+    path(
+        "mypage/heatmap/<int:year>/",
+        MypageHeatmapView.as_view(),
+        name="mypage-heatmap",
+    ),
+    path(
+        "mypage/records/details/",
+        MypageRecordDetailsView.as_view(),
+        name="mypage-record-details",
+    ),
     path(
         "mypage/records/<str:date>/detail/",
         MypageRecordDateDetailView.as_view(),
         name="mypage-record-date-detail",
     ),
+    path(
+        "mypage/insights/correlation/",
+        MypageCorrelationView.as_view(),
+        name="mypage-insights-correlation",
+    ),
+    path(
+        "mypage/insights/lag-correlation/",
+        MypageLagCorrelationView.as_view(),
+        name="mypage-insights-lag-correlation",
+    ),
+    path(
+        "mypage/insights/percentiles/",
+        MypagePercentileView.as_view(),
+        name="mypage-insights-percentiles",
+    ),
 ]
@@ -1,11 +1,13 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from urllib.request import urlopen
+from zoneinfo import ZoneInfo
 
 import redis
 import requests
 from django.conf import settings
 from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -219,17 +221,50 @@ def download_and_save_profile_image(user, url):
         print(f"[ERROR] 프로필 이미지 다운로드 실패: {e}")
 
 
-# 공통 날짜 매핑
-def daterange(start_date: date, end_date: date):
-    for n in range((end_date - start_date).days + 1):
-        yield start_date + timedelta(n)
+# 해당 날짜의 월 마지막 날
+def month_end_of(day: date) -> date:
+    if day.month == 12:
+        return date(day.year + 1, 1, 1) - timedelta(days=1)
+    return date(day.year, day.month + 1, 1) - timedelta(days=1)
 
 
-# 주 단위로 날짜 범위를 반환
-def weekrange(start_date: date, end_date: date):
-    current = start_date - timedelta(days=start_date.weekday())  # 그 주의 월요일
-    while current <= end_date:
-        week_start = current
-        week_end = current + timedelta(days=6)
-        yield (week_start, week_end)
-        current += timedelta(weeks=1)
+# 기록 조회 집계 단위
+BUCKET_GRANULARITIES = ("day", "week", "month", "quarter", "year")
+
+
+# 날짜가 속한 집계 구간의 (시작일, 종료일, 라벨) 반환
+def bucket_of(day: date, granularity: str) -> tuple[date, date, str]:
+    if granularity == "day":
+        return day, day, str(day)
+    if granularity == "week":
+        week_start = day - timedelta(days=day.weekday())  # 그 주의 월요일
+        iso_year, iso_week, _ = week_start.isocalendar()
+        return week_start, week_start + timedelta(days=6), f"{iso_year}-W{iso_week:02d}"
+    if granularity == "month":
+        month_start = day.replace(day=1)
+        return month_start, month_end_of(month_start), f"{day.year}-{day.month:02d}"
+    if granularity == "quarter":
+        quarter = (day.month - 1) // 3
+        quarter_start = date(day.year, quarter * 3 + 1, 1)
+        quarter_end = month_end_of(date(day.year, quarter * 3 + 3, 1))
+        return quarter_start, quarter_end, f"{day.year}-Q{quarter + 1}"
+    if granularity == "year":
+        return date(day.year, 1, 1), date(day.year, 12, 31), str(day.year)
+    raise ValueError(f"지원하지 않는 집계 단위: {granularity}")
+
+
+# 유저 기준 날짜 계산 (유저 타임존으로 변환 후 하루 기준 시각만큼 당김)
+def to_local_date(user, dt: datetime) -> date:
+    local_dt = dt.astimezone(ZoneInfo(user.time_zone))
+    return (local_dt - timedelta(hours=user.day_cutover_hour)).date()
+
+
+# 유저 기준 오늘 날짜
+def local_today(user) -> date:
+    return to_local_date(user, timezone.now())
+
+
+# 유저 타임존 기준 달력상 오늘 날짜 (하루 기준 시각 미적용)
+# 야간 근무자가 정오 이전에 오늘 아침 수면을 기록할 수 있도록 미래 날짜 판단에 사용
+def local_calendar_today(user) -> date:
+    return timezone.now().astimezone(ZoneInfo(user.time_zone)).date()
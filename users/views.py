@@ -1,35 +1,63 @@
-from datetime import datetime
+import base64
+from datetime import MAXYEAR, MINYEAR, date, datetime, timedelta
 
 import sentry_sdk
+from django.http import HttpResponse
 from rest_framework import permissions, status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.cache import bump_data_version, get_or_compute, register_cache
 from users.models import JobSurvey, UserStatus
 
+from .cohorts import get_cohort_percentiles
+from .correlation import get_correlation_insights, get_lag_correlations
+from .heatmap import HEATMAP_METRICS, get_year_heatmap
+from .highlights import get_highlights
+from .prefix_sums import get_range_stats
+from .reaction_sketch import get_reaction_time_summary
 from .serializers import (
     LogoutSerializer,
+    MypageCorrelationSerializer,
+    MypageHeatmapSerializer,
+    MypageHighlightsSerializer,
+    MypageLagCorrelationSerializer,
     MypageMainSerializer,
+    MypagePercentileSerializer,
     MypageProfileSerializer,
+    MypageReactionTimeSerializer,
+    MypageRecordBucketSerializer,
     MypageRecordDaySerializer,
     MypageRecordDetailResponseSerializer,
+    MypageRecordDetailsSerializer,
     MypageRecordMonthSerializer,
+    MypageRecordRangeSerializer,
     MypageRecordWeekSerializer,
     OnboardingBasicSerializer,
     OnboardingJobSerializer,
     SocialLoginSerializer,
 )
+from .series import MAX_MOVING_AVERAGE_WINDOW, TREND_METHODS, build_overlays
 from .services import (
     SocialLoginService,
+    get_date_details,
     get_mypage_main_data,
+    get_record_buckets,
     get_record_day_list,
     get_record_month_list,
+    get_record_period_range,
     get_record_week_list,
     get_selected_date_detail,
 )
-from .utils import add_token_to_blacklist, handle_social_login_error
+from .utils import (
+    BUCKET_GRANULARITIES,
+    add_token_to_blacklist,
+    bucket_of,
+    handle_social_login_error,
+    local_today,
+)
 
 
 # 소셜 로그인/자동 로그인
@@ -162,16 +190,32 @@ class OnboardingJobView(APIView):
 
 
 # 마이페이지 메인
+# 마이페이지 조회 응답 캐시 이름 (hit/miss 지표 단위)
+MYPAGE_MAIN_CACHE = register_cache("mypage_main")
+MYPAGE_RECORD_LIST_CACHE = register_cache("mypage_record_list")
+MYPAGE_RECORD_DETAIL_CACHE = register_cache("mypage_record_date_detail")
+MYPAGE_RECORD_DETAILS_CACHE = register_cache("mypage_record_date_details")
+MYPAGE_LAG_CORRELATION_CACHE = register_cache("mypage_lag_correlation")
+
+
 class MypageMainView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
-        try:
+
+        def compute():
             data = get_mypage_main_data(user, request)
             serializer = MypageMainSerializer(data=data)
             serializer.is_valid(raise_exception=True)
-            return Response(serializer.data)
+            return serializer.data
+
+        try:
+            # 오늘 날짜가 바뀌면 기록 일수 등이 달라지므로 키에 포함
+            payload = get_or_compute(
+                MYPAGE_MAIN_CACHE, user.pk, [local_today(user)], compute
+            )
+            return Response(payload)
         except ValidationError as ve:
             # 유효성 검사 실패 → 400 응답
             return Response({"detail": str(ve)}, status=status.HTTP_400_BAD_REQUEST)
@@ -208,6 +252,8 @@ class MypageProfileView(APIView):
         )
         if serializer.is_valid():
             serializer.save()
+            # 닉네임/프로필 이미지/타임존 변경이 마이페이지 응답에 반영되도록 버전 증가
+            bump_data_version(user.pk)
             # 저장 후 최신 직업 설문 데이터 다시 조회
             latest_survey = (
                 JobSurvey.objects.filter(user=user).order_by("-created_at").first()
@@ -221,6 +267,57 @@ class MypageProfileView(APIView):
         return Response(serializer.errors, status=400)
 
 
+# 그래프 오버레이 파라미터 파싱 (ma=7,28 → 이동 평균 창 크기, trend=linear → 추세선)
+def parse_overlay_params(request):
+    windows = ()
+    if request.GET.get("ma"):
+        try:
+            windows = tuple(sorted({int(w) for w in request.GET["ma"].split(",")}))
+        except ValueError:
+            raise ParseError("ma는 쉼표로 구분한 일수입니다. (예: 7,28)")
+        if windows[0] < 2 or windows[-1] > MAX_MOVING_AVERAGE_WINDOW:
+            raise ParseError(
+                f"ma는 2 ~ {MAX_MOVING_AVERAGE_WINDOW} 사이의 일수여야 합니다."
+            )
+
+    trend = request.GET.get("trend") or None
+    if trend and trend not in TREND_METHODS:
+        raise ParseError("trend는 " + ", ".join(TREND_METHODS) + " 중 하나입니다.")
+    return windows, trend
+
+
+# 조회 날짜 허용 범위 (기본 기간/이동 평균 앞당김 계산이 date 범위를 넘지 않도록 여유를 둠)
+MIN_QUERY_DATE = date(MINYEAR + 10, 1, 1)
+MAX_QUERY_DATE = date(MAXYEAR - 10, 12, 31)
+# start ~ end 기간 조회의 최대 일수 (일별 배열/스케치 병합 크기 제한)
+MAX_QUERY_RANGE_DAYS = 366
+
+
+# 조회 날짜 파싱 (YYYY-MM-DD, 허용 범위 밖이면 400)
+def parse_query_date(value):
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ParseError("날짜 형식이 올바르지 않습니다.")
+    if not MIN_QUERY_DATE <= day <= MAX_QUERY_DATE:
+        raise ParseError("조회할 수 없는 날짜입니다.")
+    return day
+
+
+# 기간 파라미터 파싱 (start, end: YYYY-MM-DD, start <= end, 최대 max_days일)
+def parse_date_range(request, max_days=MAX_QUERY_RANGE_DAYS):
+    try:
+        start_date = parse_query_date(request.GET["start"])
+        end_date = parse_query_date(request.GET["end"])
+    except KeyError:
+        raise ParseError("start, end를 YYYY-MM-DD 형식으로 입력해주세요.")
+    if start_date > end_date:
+        raise ParseError("start는 end보다 이전이어야 합니다.")
+    if max_days is not None and (end_date - start_date).days >= max_days:
+        raise ParseError(f"조회 기간은 최대 {max_days}일입니다.")
+    return start_date, end_date
+
+
 # 마이페이지 기록 조회 (리스트뷰-일,주,월)
 class MypageRecordListView(APIView):
     permission_classes = [IsAuthenticated]
@@ -232,7 +329,29 @@ class MypageRecordListView(APIView):
         "month": (get_record_month_list, MypageRecordMonthSerializer),
     }
 
+    # granularity만 지정된 경우 기본 조회 기간 (종료일 기준 과거 일수)
+    DEFAULT_SPAN_DAYS = {
+        "day": 89,
+        "week": 7 * 3,
+        "month": 366,
+        "quarter": 366 * 2,
+        "year": 366 * 5,
+    }
+
+    # 집계 단위별 최대 조회 기간 (일수, 구간 수/오버레이 배열 크기 제한)
+    MAX_SPAN_DAYS = {
+        "day": 366,
+        "week": 366,
+        "month": 366 * 2,
+        "quarter": 366 * 5,
+        "year": 366 * 10,
+    }
+
     def get(self, request):
+        # 임의 기간/집계 단위 조회 (start, end, granularity)
+        if "granularity" in request.GET:
+            return self.get_buckets(request)
+
         # 조회 기간 파라미터
         period = request.GET.get("period")
         if period not in self.PERIOD_MAP:
@@ -242,31 +361,259 @@ class MypageRecordListView(APIView):
 
         # 각 기간에 맞는 함수 및 시리얼라이저를 선택
         get_func, serializer_class = self.PERIOD_MAP[period]
+        windows, trend = parse_overlay_params(request)
+
+        def compute():
+            # 기간별 기록 데이터 조회
+            results = get_func(request.user)
+            if not results:
+                raise ValidationError("해당 기간 기록이 없습니다.")
+
+            serializer = serializer_class(results, many=True)
+            payload = {"results": serializer.data}
+            if windows or trend:
+                start_date, end_date = get_record_period_range(request.user, period)
+                payload["overlays"] = build_overlays(
+                    request.user, start_date, end_date, windows, trend
+                )
+            return payload
+
+        payload = get_or_compute(
+            MYPAGE_RECORD_LIST_CACHE,
+            request.user.pk,
+            ["period", period, local_today(request.user), windows, trend],
+            compute,
+        )
+        return Response(payload)
 
-        # 기간별 기록 데이터 조회
-        results = get_func(request.user)
-        if not results:
-            raise ValidationError("해당 기간 기록이 없습니다.")
+    def get_buckets(self, request):
+        granularity = request.GET.get("granularity")
+        if granularity not in BUCKET_GRANULARITIES:
+            return Response(
+                {
+                    "detail": "granularity는 "
+                    + ", ".join(BUCKET_GRANULARITIES)
+                    + " 중 하나입니다."
+                },
+                status=400,
+            )
+
+        # 날짜 포맷/범위 검증 (end 기본값: 오늘, start 기본값: 단위별 기본 기간)
+        end_date = (
+            parse_query_date(request.GET["end"])
+            if request.GET.get("end")
+            else local_today(request.user)
+        )
+        start_date = (
+            parse_query_date(request.GET["start"])
+            if request.GET.get("start")
+            else bucket_of(
+                end_date - timedelta(days=self.DEFAULT_SPAN_DAYS[granularity]),
+                granularity,
+            )[0]
+        )
+
+        if start_date > end_date:
+            return Response(
+                {"detail": "start는 end보다 이전이어야 합니다."}, status=400
+            )
+        max_days = self.MAX_SPAN_DAYS[granularity]
+        if (end_date - start_date).days >= max_days:
+            return Response(
+                {"detail": f"{granularity} 단위 조회 기간은 최대 {max_days}일입니다."},
+                status=400,
+            )
 
-        serializer = serializer_class(results, many=True)
-        return Response({"results": serializer.data})
+        windows, trend = parse_overlay_params(request)
+
+        def compute():
+            results = get_record_buckets(
+                request.user, start_date, end_date, granularity
+            )
+            if not results:
+                raise ValidationError("해당 기간 기록이 없습니다.")
+
+            serializer = MypageRecordBucketSerializer(results, many=True)
+            payload = {"granularity": granularity, "results": serializer.data}
+            if windows or trend:
+                payload["overlays"] = build_overlays(
+                    request.user, start_date, end_date, windows, trend
+                )
+            return payload
+
+        payload = get_or_compute(
+            MYPAGE_RECORD_LIST_CACHE,
+            request.user.pk,
+            ["granularity", granularity, start_date, end_date, windows, trend],
+            compute,
+        )
+        return Response(payload)
+
+
+# 마이페이지 임의 기간 통계 조회 (start ~ end, 누적합 인덱스로 조회 1회)
+class MypageRecordRangeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # 누적합 조회는 기간 길이와 무관하게 O(1) → 기간 제한 없음 (날짜 범위만 검증)
+        start_date, end_date = parse_date_range(request, max_days=None)
+        data = get_range_stats(request.user, start_date, end_date)
+        return Response(MypageRecordRangeSerializer(data).data)
+
+
+# 마이페이지 하이라이트 (연속 기록/최고·최저 기록일, 인덱스 행 조회 1회)
+class MypageHighlightsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        data = get_highlights(request.user, local_today(request.user))
+        return Response(MypageHighlightsSerializer(data).data)
+
+
+# 마이페이지 연도 히트맵 (행 조회 1회, 요청 시 집계 없음)
+# encoding=base64(기본): JSON, binary: sleep_score 366바이트 + cognitive_score 366바이트
+class MypageHeatmapView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    ENCODINGS = ("base64", "binary")
+
+    def get(self, request, year):
+        encoding = request.GET.get("encoding", "base64")
+        if encoding not in self.ENCODINGS:
+            raise ParseError(
+                "encoding은 " + ", ".join(self.ENCODINGS) + " 중 하나입니다."
+            )
+        if not MINYEAR <= year <= MAXYEAR:
+            raise ParseError("연도가 올바르지 않습니다.")
+
+        data = get_year_heatmap(request.user, year)
+        if encoding == "binary":
+            return HttpResponse(
+                b"".join(data[metric] for metric in HEATMAP_METRICS),
+                content_type="application/octet-stream",
+                headers={
+                    "X-Heatmap-Metrics": ",".join(HEATMAP_METRICS),
+                    "X-Heatmap-Days": str(data["days"]),
+                },
+            )
+
+        for metric in HEATMAP_METRICS:
+            data[metric] = base64.b64encode(data[metric]).decode()
+        return Response(MypageHeatmapSerializer(data).data)
+
+
+# 마이페이지 여러 날짜 상세 기록 조회 (?dates=YYYY-MM-DD,YYYY-MM-DD,...)
+# 날짜 수와 무관하게 수면/인지 집계/기준선 각 1회 조회
+class MypageRecordDetailsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # 한 번에 조회할 수 있는 최대 날짜 수
+    MAX_DATES = 31
+
+    def get(self, request):
+        raw = [
+            value
+            for param in request.GET.getlist("dates")
+            for value in param.split(",")
+            if value
+        ]
+        if not raw:
+            raise ParseError("dates를 YYYY-MM-DD 형식으로 입력해주세요.")
+        if len(raw) > self.MAX_DATES:
+            raise ParseError(f"dates는 최대 {self.MAX_DATES}개까지 조회할 수 있습니다.")
+        try:
+            dates = sorted(
+                {datetime.strptime(value, "%Y-%m-%d").date() for value in raw}
+            )
+        except ValueError:
+            raise ParseError("dates를 YYYY-MM-DD 형식으로 입력해주세요.")
+
+        payload = get_or_compute(
+            MYPAGE_RECORD_DETAILS_CACHE,
+            request.user.pk,
+            dates,
+            lambda: MypageRecordDetailsSerializer(
+                get_date_details(request.user, dates)
+            ).data,
+        )
+        return Response(payload)
 
 
 # 마이페이지 날짜별 상세 기록 조회
 class MypageRecordDateDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
+    GRAPH_SPANS = ("month", "quarter", "year")
+
     def get(self, request, date):
         print("date:", repr(date))
-        # 날짜 포맷 검증
-        try:
-            date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        except ValueError:
-            return Response({"detail": "날짜 형식이 올바르지 않습니다."}, status=400)
+        # 날짜 포맷/범위 검증 (그래프 기간/이동 평균 앞당김 계산 전)
+        date_obj = parse_query_date(date)
 
-        data = get_selected_date_detail(request.user, date_obj)
-        if not data:
-            return Response({"detail": "해당 기간 기록이 없습니다."}, status=404)
+        # 그래프 기간 (선택 날짜가 속한 월/분기/연도, 기본값: 월)
+        span = request.GET.get("span", "month")
+        if span not in self.GRAPH_SPANS:
+            return Response(
+                {"detail": "span은 " + ", ".join(self.GRAPH_SPANS) + " 중 하나입니다."},
+                status=400,
+            )
 
-        serializer = MypageRecordDetailResponseSerializer(data)
-        return Response(serializer.data, status=200)
+        windows, trend = parse_overlay_params(request)
+
+        def compute():
+            data = get_selected_date_detail(
+                request.user, date_obj, span, windows, trend
+            )
+            return MypageRecordDetailResponseSerializer(data).data
+
+        payload = get_or_compute(
+            MYPAGE_RECORD_DETAIL_CACHE,
+            request.user.pk,
+            [date_obj, span, windows, trend],
+            compute,
+        )
+        return Response(payload, status=200)
+
+
+# 마이페이지 수면-인지 상관 분석 (누적 통계 행 조회 1회)
+class MypageCorrelationView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        data = get_correlation_insights(request.user)
+        return Response(MypageCorrelationSerializer(data).data)
+
+
+# 마이페이지 수면 → 0~7일 뒤 인지 점수 시차 교차 상관 (데이터 버전이 바뀔 때까지 캐시)
+class MypageLagCorrelationView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        payload = get_or_compute(
+            MYPAGE_LAG_CORRELATION_CACHE,
+            request.user.pk,
+            [],
+            lambda: MypageLagCorrelationSerializer(
+                get_lag_correlations(request.user)
+            ).data,
+        )
+        return Response(payload)
+
+
+# 마이페이지 코호트(연령대/성별/MBTI/직업 유형) 내 백분위 (야간 생성 히스토그램 기준)
+class MypagePercentileView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        data = get_cohort_percentiles(request.user)
+        return Response(MypagePercentileSerializer(data).data)
+
+
+# 마이페이지 기간별 반응 시간 분포 (중앙값/p90/lapse 비율, 일별 스케치 병합)
+class MypageReactionTimeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start_date, end_date = parse_date_range(request)
+        data = get_reaction_time_summary(request.user, start_date, end_date)
+        return Response(MypageReactionTimeSerializer(data).data)